@@ -0,0 +1,12 @@
+"""
+Benchmarks for yamlize.
+
+Run from the root of the repository::
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --baseline results.json
+
+``benchmarks.generate`` creates random, valid documents for any yamlize class, and
+``benchmarks.suite`` times load, dump and round trip, measures memory and import time, and compares
+results against a stored baseline.
+"""
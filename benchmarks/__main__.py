@@ -0,0 +1,41 @@
+import argparse
+import sys
+
+from . import suite
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='yamlize benchmarks')
+    parser.add_argument('--shapes', nargs='+', choices=sorted(suite.SHAPES),
+                        help='document shapes to benchmark, default is all of them')
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(suite.SIZES),
+                        help='document sizes, default: %(default)s')
+    parser.add_argument('--measurements', nargs='+', choices=suite.MEASUREMENTS,
+                        default=list(suite.MEASUREMENTS))
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='times are the best of this many runs, default: %(default)s')
+    parser.add_argument('--no-import', action='store_true', help='skip the import time benchmark')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='save results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against results saved with --output')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='fractional slow down reported as a regression, default: %(default)s')
+    args = parser.parse_args(argv)
+
+    results = suite.run(args.shapes, args.sizes, args.measurements, args.repeat,
+                        not args.no_import, args.seed)
+
+    if args.output:
+        suite.save(results, args.output)
+
+    if args.baseline is None:
+        print(suite.format_results(results))
+        return 0
+
+    rows = suite.compare(suite.read(args.baseline), results, args.tolerance)
+    print(suite.format_comparison(rows))
+    return 1 if any(row[-1] for row in rows) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
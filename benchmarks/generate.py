@@ -0,0 +1,157 @@
+import random
+import string
+
+from yamlize import Object, Map, KeyedList, Sequence, YamlizingError
+from yamlize.yamlizable import Strong
+
+
+class DocumentGenerator(object):
+    """
+    Creates random instances of yamlize classes, using the ``AttributeCollection`` of each class.
+
+    Values are assigned through the attribute descriptors, so type checks and validators apply. A
+    value that is rejected is regenerated, up to ``max_attempts`` times.
+
+    Attributes
+    ----------
+    rng : random.Random
+        source of randomness, seeded so documents are reproducible.
+    collection_size : int
+        number of items in the ``Sequence``, ``Map`` or ``KeyedList`` at the root of the document.
+    nested_size : int
+        number of items in collections below the root, defaults to ``collection_size``.
+    max_depth : int
+        optional attributes are not generated beyond this depth, which bounds recursive classes.
+    optional_probability : float
+        probability that an optional attribute is generated.
+    max_attempts : int
+        number of values tried for an attribute before giving up.
+    """
+
+    def __init__(self, seed=0, collection_size=5, nested_size=None, max_depth=4,
+                 optional_probability=0.5, max_attempts=100):
+        self.rng = random.Random(seed)
+        self.collection_size = collection_size
+        self.nested_size = collection_size if nested_size is None else nested_size
+        self.max_depth = max_depth
+        self.optional_probability = optional_probability
+        self.max_attempts = max_attempts
+
+    def generate(self, cls):
+        """
+        returns: a random instance of ``cls``.
+
+        >>> from yamlize import Object, Attribute
+        >>> class Point(Object):
+        ...     x = Attribute(type=float)
+        ...     y = Attribute(type=float, default=0.0)
+        >>> point = DocumentGenerator(seed=1).generate(Point)
+        >>> isinstance(point.x, float)
+        True
+        """
+        return self.__value(cls, 0)
+
+    def document(self, cls):
+        """
+        returns: str YAML document that ``cls.load`` accepts.
+
+        >>> from yamlize import IntList
+        >>> IntList.load(DocumentGenerator(seed=1, collection_size=3).document(IntList)).__len__()
+        3
+        """
+        return cls.dump(self.generate(cls))
+
+    def __value(self, cls, depth):
+        if issubclass(cls, Strong):
+            return self.__scalar(cls)
+
+        if issubclass(cls, KeyedList):
+            return self.__keyed_list(cls, depth)
+
+        if issubclass(cls, Map):
+            return self.__map(cls, depth)
+
+        if issubclass(cls, Object):
+            return self.__object(cls, depth)
+
+        if issubclass(cls, Sequence):
+            return cls([self.__value(cls.item_type, depth + 1)
+                        for _ in range(self.__size(depth))])
+
+        raise TypeError('Cannot generate values for `{}`'.format(cls))
+
+    def __size(self, depth):
+        return self.collection_size if depth == 0 else self.nested_size
+
+    def __scalar(self, cls, index=None):
+        """
+        returns: random value of the type wrapped by a ``Typed`` class, or a unique value derived
+        from ``index`` (used for keys).
+        """
+        type_ = cls._Strong__type
+
+        if type_ is object:
+            # keys must be unique, so they are always strings
+            type_ = str if index is not None else self.rng.choice((int, float, str, bool))
+
+        if type_ is bool:
+            return self.rng.random() < 0.5
+
+        if type_ is int:
+            return index if index is not None else self.rng.randint(-1000, 1000)
+
+        if type_ is float:
+            return float(index) if index is not None else round(self.rng.uniform(-1e3, 1e3), 6)
+
+        if type_ is str:
+            word = ''.join(self.rng.choice(string.ascii_lowercase)
+                           for _ in range(self.rng.randint(3, 10)))
+            return word if index is None else '{}{}'.format(word, index)
+
+        raise TypeError('Cannot generate values for `{}`'.format(type_))
+
+    def __object(self, cls, depth, key_attribute=None, index=None):
+        obj = cls.__new__(cls)
+        Object.__init__(obj)
+        self.__assign_attributes(obj, depth)
+
+        if key_attribute is not None:
+            setattr(obj, key_attribute.name, self.__scalar(key_attribute.type, index))
+
+        return obj
+
+    def __assign_attributes(self, obj, depth):
+        for attribute in type(obj).attributes:
+            if not attribute.is_required:
+                if depth >= self.max_depth or self.rng.random() >= self.optional_probability:
+                    continue
+
+            for _ in range(self.max_attempts):
+                try:
+                    setattr(obj, attribute.name, self.__value(attribute.type, depth + 1))
+                    break
+                except (ValueError, YamlizingError):
+                    continue
+            else:
+                if attribute.is_required:
+                    raise ValueError('Could not generate a valid value for `{}.{}` in {} attempts'
+                                     .format(type(obj).__name__, attribute.name,
+                                             self.max_attempts))
+
+    def __map(self, cls, depth):
+        obj = cls()
+        self.__assign_attributes(obj, depth)
+
+        for index in range(self.__size(depth)):
+            obj[self.__scalar(cls.key_type, index)] = self.__value(cls.value_type, depth + 1)
+
+        return obj
+
+    def __keyed_list(self, cls, depth):
+        obj = cls()
+        self.__assign_attributes(obj, depth)
+
+        for index in range(self.__size(depth)):
+            obj.add(self.__object(cls.item_type, depth + 1, cls.key_attr, index))
+
+        return obj
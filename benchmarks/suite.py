@@ -0,0 +1,324 @@
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+import ruamel.yaml
+from ruamel.yaml.comments import CommentedMap
+
+from yamlize import (Object, Attribute, KeyedList, Sequence, FloatList, StrList, clone, diff,
+                     query)
+from yamlize.objects import ObjectType
+
+from .generate import DocumentGenerator
+
+
+RESULTS_VERSION = 1
+
+MEASUREMENTS = ('load', 'dump', 'round_trip', 'clone', 'diff', 'query', 'memory')
+
+# nesting deeper than this would exceed the recursion limit, so deep documents are made of several
+# chains
+_MAX_CHAIN_DEPTH = 50
+
+
+class Node(Object):
+    name = Attribute(type=str)
+    value = Attribute(type=float)
+
+
+# recursive attributes can only be added once the class exists
+Node.child = Attribute(name='child', type=Node, default=None)
+
+
+class Chains(Sequence):
+    item_type = Node
+
+
+class Part(Object):
+    name = Attribute(type=str)
+    material = Attribute(type=str)
+    mass = Attribute(type=float)
+    count = Attribute(type=int, default=1)
+    tags = Attribute(type=StrList, default=None)
+
+
+class Parts(KeyedList):
+    key_attr = Part.name
+    item_type = Part
+
+
+_wide_classes = {}
+
+
+def _wide_class(size):
+    if size not in _wide_classes:
+        data = {'attr{}'.format(ii): Attribute(type=(int, float, str)[ii % 3])
+                for ii in range(size)}
+        _wide_classes[size] = ObjectType('Wide{}'.format(size), (Object,), data)
+
+    return _wide_classes[size]
+
+
+def deep(size, seed=0):
+    """returns: (cls, document) of ``size`` nested objects, in chains of up to 50"""
+    depth = min(size, _MAX_CHAIN_DEPTH)
+    generator = DocumentGenerator(seed, collection_size=max(1, size // depth), max_depth=depth,
+                                  optional_probability=1.0)
+    return Chains, generator.document(Chains)
+
+
+def wide(size, seed=0):
+    """returns: (cls, document) of a single object with ``size`` attributes"""
+    cls = _wide_class(size)
+    return cls, DocumentGenerator(seed).document(cls)
+
+
+def keyed_list(size, seed=0):
+    """returns: (cls, document) of a ``KeyedList`` with ``size`` items"""
+    return Parts, DocumentGenerator(seed, collection_size=size, nested_size=3).document(Parts)
+
+
+def numeric(size, seed=0):
+    """returns: (cls, document) of a list of ``size`` floats"""
+    return FloatList, DocumentGenerator(seed, collection_size=size).document(FloatList)
+
+
+def merges(size, seed=0):
+    """
+    returns: (cls, document) of a ``KeyedList`` with ``size`` items, where one in ten items is an
+    anchored base and the others merge (``<<: *base``) one of the bases and override one value.
+    """
+    generator = DocumentGenerator(seed, collection_size=max(1, size // 10), nested_size=3)
+    bases = ruamel.yaml.round_trip_load(generator.document(Parts))
+    root = CommentedMap()
+
+    for name, base in bases.items():
+        base.yaml_set_anchor(name, always_dump=True)
+        root[name] = base
+
+    base_names = list(bases)
+
+    for index in range(size - len(base_names)):
+        item = CommentedMap([('mass', generator.rng.uniform(1.0, 100.0))])
+        item.add_yaml_merge([(0, bases[base_names[index % len(base_names)]])])
+        root['merged{}'.format(index)] = item
+
+    return Parts, ruamel.yaml.round_trip_dump(root)
+
+
+SHAPES = {
+    'deep': deep,
+    'wide': wide,
+    'keyed_list': keyed_list,
+    'numeric': numeric,
+    'merges': merges,
+}
+
+SIZES = (10, 100, 1000)
+
+
+def _best_time(func, repeat):
+    return min(timeit.Timer(func).repeat(repeat, number=1))
+
+
+def _memory(cls, document):
+    """returns: dict of peak and retained bytes while loading ``document``"""
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        data = cls.load(document)
+        # the loader is disposed, but is in a reference cycle
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del data
+    return {'peak_bytes': peak, 'retained_bytes': retained}
+
+
+# a module defining 50 classes with 10 attributes each, and a KeyedList of each
+_SCHEMA = '''
+from yamlize import Object, Attribute, KeyedList
+for index in range(50):
+    item = type(Object)('Item{}'.format(index), (Object,), {
+        'attr{}'.format(ii): Attribute(type=(int, float, str)[ii % 3], default=ii)
+        for ii in range(10)})
+    type(KeyedList)('Items{}'.format(index), (KeyedList,), {
+        'key_attr': item.attr2, 'item_type': item})
+'''
+
+# {benchmark: code}, each timed in a new interpreter
+IMPORTS = {
+    'import': 'import yamlize',
+    'import_schema': _SCHEMA,
+    'import_load': 'import yamlize; yamlize.IntList.load("[1, 2]")',
+}
+
+
+def import_time(code='import yamlize', repeat=5):
+    """
+    returns: best time, in seconds, to run ``code`` in a new interpreter. Compiled bytecode is
+    cached (in a temporary directory), as it would be for an installed package.
+    """
+    code = '\n'.join(['import time', 'start = time.perf_counter()', code,
+                      'print(time.perf_counter() - start)'])
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+
+    with tempfile.TemporaryDirectory() as cache:
+        env['PYTHONPYCACHEPREFIX'] = cache
+        # the first run only writes the cache
+        times = [float(subprocess.check_output([sys.executable, '-c', code], cwd=root, env=env))
+                 for _ in range(repeat + 1)]
+
+    return min(times[1:])
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'ruamel.yaml': ruamel.yaml.__version__,
+    }
+
+
+def run(shapes=None, sizes=SIZES, measurements=MEASUREMENTS, repeat=5, include_import=True,
+        seed=0):
+    """
+    Run the benchmarks.
+
+    returns: dict of results, which can be saved with ``save`` and compared with ``compare``.
+    Results are keyed by ``'measurement/shape/size'``, and times are the best of ``repeat`` runs.
+
+    >>> results = run(['numeric'], sizes=[10], repeat=1, include_import=False)
+    >>> sorted(results['benchmarks'])  # doctest: +NORMALIZE_WHITESPACE
+    ['clone/numeric/10', 'diff/numeric/10', 'dump/numeric/10', 'load/numeric/10',
+     'memory/numeric/10', 'query/numeric/10', 'round_trip/numeric/10']
+    """
+    benchmarks = {}
+
+    for shape in (shapes or sorted(SHAPES)):
+        for size in sizes:
+            cls, document = SHAPES[shape](size, seed)
+            data = cls.load(document)
+            name = '{}/' + '{}/{}'.format(shape, size)
+
+            if 'load' in measurements:
+                benchmarks[name.format('load')] = {
+                    'seconds': _best_time(lambda: cls.load(document), repeat)}
+
+            if 'dump' in measurements:
+                benchmarks[name.format('dump')] = {
+                    'seconds': _best_time(lambda: cls.dump(data), repeat)}
+
+            if 'round_trip' in measurements:
+                benchmarks[name.format('round_trip')] = {
+                    'seconds': _best_time(lambda: cls.dump(cls.load(document)), repeat)}
+
+            if 'clone' in measurements:
+                benchmarks[name.format('clone')] = {
+                    'seconds': _best_time(lambda: clone(data), repeat)}
+
+            if 'diff' in measurements:
+                # the worst case, every object is compared
+                copied = clone(data)
+                benchmarks[name.format('diff')] = {
+                    'seconds': _best_time(lambda: diff(data, copied), repeat)}
+
+            if 'query' in measurements:
+                # every value of the document, without an index
+                benchmarks[name.format('query')] = {
+                    'seconds': _best_time(lambda: query(data, '..*'), repeat)}
+
+            if 'memory' in measurements:
+                benchmarks[name.format('memory')] = _memory(cls, document)
+
+    if include_import:
+        for name, code in IMPORTS.items():
+            benchmarks[name] = {'seconds': import_time(code, repeat)}
+
+    return {'version': RESULTS_VERSION, 'environment': environment(), 'benchmarks': benchmarks}
+
+
+def save(results, path):
+    with open(path, 'w') as stream:
+        json.dump(results, stream, indent=2, sort_keys=True)
+
+
+def read(path):
+    with open(path) as stream:
+        results = json.load(stream)
+
+    if results.get('version') != RESULTS_VERSION:
+        raise ValueError('Unsupported benchmark results version `{}` in {}'
+                         .format(results.get('version'), path))
+
+    return results
+
+
+def compare(baseline, current, tolerance=0.1):
+    """
+    Compare two sets of results.
+
+    returns: list of ``(name, metric, baseline, current, ratio, regressed)`` tuples for every metric
+    present in both, where ``regressed`` is True when ``current`` exceeds ``baseline`` by more than
+    ``tolerance`` (a fraction).
+
+    >>> compare({'benchmarks': {'load/numeric/10': {'seconds': 1.0}}},
+    ...         {'benchmarks': {'load/numeric/10': {'seconds': 1.5}}})
+    [('load/numeric/10', 'seconds', 1.0, 1.5, 1.5, True)]
+    """
+    rows = []
+
+    for name, metrics in sorted(current['benchmarks'].items()):
+        base_metrics = baseline['benchmarks'].get(name)
+
+        if base_metrics is None:
+            continue
+
+        for metric, value in sorted(metrics.items()):
+            base = base_metrics.get(metric)
+
+            if not base:
+                continue
+
+            ratio = value / base
+            rows.append((name, metric, base, value, ratio, ratio > 1.0 + tolerance))
+
+    return rows
+
+
+def format_comparison(rows):
+    """returns: str table of ``compare`` rows"""
+    width = max([len('benchmark')] + [len(row[0]) for row in rows])
+    lines = ['{:<{w}}  {:<14}  {:>12}  {:>12}  {:>7}'.format(
+        'benchmark', 'metric', 'baseline', 'current', 'ratio', w=width)]
+
+    for name, metric, base, value, ratio, regressed in rows:
+        lines.append('{:<{w}}  {:<14}  {:>12.6g}  {:>12.6g}  {:>7.3f}{}'.format(
+            name, metric, base, value, ratio, '  REGRESSED' if regressed else '', w=width))
+
+    return '\n'.join(lines)
+
+
+def format_results(results):
+    """returns: str table of ``run`` results"""
+    benchmarks = results['benchmarks']
+    width = max([len('benchmark')] + [len(name) for name in benchmarks])
+    lines = ['{:<{w}}  {:<14}  {:>12}'.format('benchmark', 'metric', 'value', w=width)]
+
+    for name, metrics in sorted(benchmarks.items()):
+        for metric, value in sorted(metrics.items()):
+            lines.append('{:<{w}}  {:<14}  {:>12.6g}'.format(name, metric, value, w=width))
+
+    return '\n'.join(lines)
@@ -1,9 +1,42 @@
-from .attributes import Attribute, MapItem, KeyedListItem
+from . import hooks
+from .attributes import Attribute, MapItem, KeyedListItem, pure_validator
 from .attribute_collection import (AttributeCollection, MapAttributeCollection,
                                    KeyedListAttributeCollection)
 from .maps import Map, KeyedList
+from .memory_report import memory_report
 from .objects import Object
 from .sequences import Sequence, IntList, FloatList, StrList
-from .yamlizable import Dynamic, Yamlizable, Typed
-from .yamlizing_error import YamlizingError
+from .yamlizable import Dynamic, Yamlizable, Typed, INVALID
+from .yamlizing_error import YamlizingError, YamlizingErrorGroup
 
+
+# optional features, {name: submodule}, imported on first use to keep ``import yamlize`` fast
+_LAZY = {
+    'LoadStats': 'load_stats',
+    'classes_from_schema': 'schema',
+    'clone': 'cloning',
+    'diff': 'diffing',
+    'dump_sharded': 'sharding',
+    'load_sharded': 'sharding',
+    'patch': 'diffing',
+    'profile': 'profiling',
+    'query': 'querying',
+    'QueryIndex': 'querying',
+    'schema_source': 'schema',
+    'Session': 'session',
+}
+
+
+def __getattr__(name):
+    from importlib import import_module
+
+    if name not in _LAZY:
+        raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+    value = getattr(import_module('.' + _LAZY[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
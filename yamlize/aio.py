@@ -0,0 +1,130 @@
+"""
+Coroutines behind ``Yamlizable.aload``, ``Yamlizable.adump`` and ``Yamlizable.aload_all``.
+
+Streams are read and written in chunks on the event loop, while scanning, construction and emitting
+run in an executor, so the event loop is never blocked by a large document.
+"""
+
+import asyncio
+import functools
+import inspect
+
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _END:
+    """Returned by ``next`` once every document of ``load_all`` has been loaded."""
+
+    def __new__(cls):
+        raise NotImplementedError
+
+    def __init__(self):
+        raise NotImplementedError
+
+
+async def read(stream, chunk_size=None, loop_executor=None):
+    """
+    Read all of ``stream``, which may be a ``str`` or ``bytes``, an object with a ``read(size)``
+    coroutine (e.g. ``asyncio.StreamReader`` or an aiohttp response's ``content``), a file, whose
+    ``read`` is called in ``loop_executor``, or an async iterable of chunks.
+
+    returns: str or bytes, the type of the chunks read.
+    """
+    if isinstance(stream, (str, bytes)):
+        return stream
+
+    chunk_size = chunk_size or CHUNK_SIZE
+    chunks = []
+    empty = u''
+
+    if hasattr(stream, 'read'):
+        loop = asyncio.get_running_loop()
+        blocking = not inspect.iscoroutinefunction(stream.read)
+
+        while True:
+            if blocking:
+                chunk = await loop.run_in_executor(loop_executor, stream.read, chunk_size)
+            else:
+                chunk = stream.read(chunk_size)
+
+            if inspect.isawaitable(chunk):
+                chunk = await chunk
+
+            if not chunk:
+                if chunk is not None:
+                    # so an empty bytes stream reads as bytes
+                    empty = chunk
+                break
+
+            chunks.append(chunk)
+    else:
+        async for chunk in stream:
+            chunks.append(chunk)
+
+    if not chunks:
+        return empty
+
+    return chunks[0][:0].join(chunks)
+
+
+async def write(stream, text, chunk_size=None, encoding=None):
+    """
+    Write ``text`` to ``stream`` in chunks of ``chunk_size`` characters. ``stream.write`` may be a
+    coroutine, and ``stream.drain()`` is awaited after each chunk when ``stream`` has one (e.g.
+    ``asyncio.StreamWriter``). When ``encoding`` is given, chunks are encoded before being written.
+    """
+    chunk_size = chunk_size or CHUNK_SIZE
+    drain = getattr(stream, 'drain', None)
+
+    for start in range(0, len(text), chunk_size):
+        chunk = text[start:start + chunk_size]
+
+        if encoding is not None:
+            chunk = chunk.encode(encoding)
+
+        result = stream.write(chunk)
+
+        if inspect.isawaitable(result):
+            await result
+
+        if drain is not None:
+            await drain()
+
+
+async def aload(cls, stream, loop_executor=None, chunk_size=None, **kwargs):
+    document = await read(stream, chunk_size, loop_executor)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(loop_executor,
+                                      functools.partial(cls.load, document, **kwargs))
+
+
+async def adump(cls, data, stream=None, loop_executor=None, chunk_size=None,
+                encoding=None, **kwargs):
+    loop = asyncio.get_running_loop()
+    text = await loop.run_in_executor(loop_executor, functools.partial(cls.dump, data, **kwargs))
+
+    if stream is None:
+        return text
+
+    await write(stream, text, chunk_size, encoding)
+    return None
+
+
+async def aload_all(cls, stream, loop_executor=None, chunk_size=None, **kwargs):
+    document = await read(stream, chunk_size, loop_executor)
+    loop = asyncio.get_running_loop()
+    documents = cls.load_all(document, **kwargs)
+
+    try:
+        while True:
+            # one document at a time, so the caller can stop early
+            data = await loop.run_in_executor(loop_executor, next, documents, _END)
+
+            if data is _END:
+                return
+
+            yield data
+    finally:
+        # releases the loader when the caller stops early
+        await loop.run_in_executor(loop_executor, documents.close)
@@ -1,9 +1,22 @@
 
+import threading
+
 from yamlize.attributes import Attribute, MapItem, KeyedListItem
+from yamlize.round_trip_data import MAP_KEY
 from yamlize.yamlizing_error import YamlizingError
 
 
+# serializes changes to every AttributeCollection, lookups do not need it
+_lock = threading.RLock()
+
+
 class AttributeCollection(object):
+    """
+    The attributes of a yamlize class, in the order they were defined.
+
+    Adding attributes replaces ``order``, ``by_key`` and ``by_name`` with updated copies instead of
+    changing them, so a load in another thread never sees a container change while it iterates.
+    """
 
     __slots__ = ('order', 'by_key', 'by_name')
 
@@ -19,7 +32,8 @@ class AttributeCollection(object):
                 raise TypeError('Incorrect type {} while initializing '
                                 'AttributeCollection with {}'
                                 .format(type(item), item))
-            self.add(item)
+
+        self.extend(args)
 
     def __iter__(self):
         return iter(self.order)
@@ -29,32 +43,60 @@ class AttributeCollection(object):
         return {attr for attr in self if attr.is_required}
 
     def add(self, attr):
-        existing = self.by_key.get(attr.key, None)
-        if existing is not None and existing is not attr:
-            raise KeyError('AttributeCollection already contains an entry for '
-                           '{}, previously defined: {}'
-                           .format(attr.key, existing))
-        elif existing is attr:
-            return
-
-        existing = self.by_name.get(attr.name, None)
-        if existing is not None and existing is not attr:
-            raise KeyError('AttributeCollection already contains an entry for '
-                           '{}, previously defined: {}'
-                           .format(attr.name, existing))
-        elif existing is attr:
-            return
-
-        self.by_key[attr.key] = attr
-        self.by_name[attr.name] = attr
-        self.order.append(attr)
+        self.extend((attr,))
+
+    def get_by_key(self, key):
+        """
+        returns: the attribute with the YAML ``key``, or None, also for unhashable keys such as
+        ``[a, b]``.
+        """
+        try:
+            return self.by_key.get(key, None)
+        except TypeError:
+            return None
+
+    def extend(self, attrs):
+        """
+        Add each attribute of ``attrs`` that is not already in the collection, copying the
+        containers once for all of them.
+        """
+        with _lock:
+            by_key = dict(self.by_key)
+            by_name = dict(self.by_name)
+            order = list(self.order)
+
+            for attr in attrs:
+                existing = by_key.get(attr.key, None)
+                if existing is not None and existing is not attr:
+                    raise KeyError('AttributeCollection already contains an entry for '
+                                   '{}, previously defined: {}'
+                                   .format(attr.key, existing))
+                elif existing is attr:
+                    continue
+
+                existing = by_name.get(attr.name, None)
+                if existing is not None and existing is not attr:
+                    raise KeyError('AttributeCollection already contains an entry for '
+                                   '{}, previously defined: {}'
+                                   .format(attr.name, existing))
+                elif existing is attr:
+                    continue
+
+                by_key[attr.key] = attr
+                by_name[attr.name] = attr
+                order.append(attr)
+
+            if len(order) != len(self.order):
+                self.by_key = by_key
+                self.by_name = by_name
+                self.order = order
 
     def from_yaml(self, obj, loader, key_node, val_node, round_trip_data):
         """
         returns: Attribute that was applied
         """
         key = loader.construct_object(key_node)
-        attribute = self.by_key.get(key, None)
+        attribute = self.get_by_key(key)
 
         if attribute is None:
             raise YamlizingError('Error parsing {}, found key `{}` but '
@@ -66,6 +108,24 @@ class AttributeCollection(object):
 
         return attribute
 
+    def validate_yaml(self, cls, loader, key_node, val_node, errors):
+        """
+        returns: Attribute that was checked, or None.
+        """
+        key = loader.construct_object(key_node)
+        attribute = self.get_by_key(key)
+
+        if attribute is None:
+            errors.append(YamlizingError('Error parsing {}, found key `{}` but '
+                                         'expected any of {}'
+                                         .format(cls, key, self.by_key.keys()),
+                                         key_node))
+            return None
+
+        attribute.validate_yaml(loader, val_node, errors)
+
+        return attribute
+
     def yaml_attribute_order(self, obj, attr_order):
         """
         returns: Attribute that was applied
@@ -106,15 +166,21 @@ class MapAttributeCollection(AttributeCollection):
         Raises an exception if there was actually a problem.
         """
         key = loader.construct_object(key_node)
-        attribute = self.by_key.get(key, None)
+        attribute = self.get_by_key(key)
 
         if attribute is not None:
             attribute.from_yaml(obj, loader, val_node, round_trip_data)
         else:
             # the key_node will point to our object
             del loader.constructed_objects[key_node]
+            round_trip_data.position = MAP_KEY
             key = obj.key_type.from_yaml(loader, key_node, round_trip_data)
+            round_trip_data.position = key
             val = obj.value_type.from_yaml(loader, val_node, round_trip_data)
+
+            if type(key) is str and hasattr(loader, 'yamlize_intern'):
+                key = loader.yamlize_intern(key)
+
             try:
                 obj.__setitem__(key, val)
             except Exception as ee:
@@ -123,6 +189,21 @@ class MapAttributeCollection(AttributeCollection):
 
         return attribute  # could be None, and that is fine
 
+    def validate_yaml(self, cls, loader, key_node, val_node, errors):
+        """
+        returns: Attribute that was checked, or None.
+        """
+        key = loader.construct_object(key_node)
+        attribute = self.get_by_key(key)
+
+        if attribute is not None:
+            attribute.validate_yaml(loader, val_node, errors)
+        else:
+            cls.key_type.validate_node(loader, key_node, errors)
+            cls.value_type.validate_node(loader, val_node, errors)
+
+        return attribute  # could be None, and that is fine
+
     def yaml_attribute_order(self, obj, attr_order):
         """
         returns: Attribute that was applied
@@ -157,7 +238,7 @@ class KeyedListAttributeCollection(AttributeCollection):
         Raises an exception if there was actually a problem.
         """
         key = loader.construct_object(key_node)
-        attribute = self.by_key.get(key, None)
+        attribute = self.get_by_key(key)
 
         if attribute is not None:
             attribute.from_yaml(obj, loader, val_node, round_trip_data)
@@ -175,6 +256,20 @@ class KeyedListAttributeCollection(AttributeCollection):
 
         return attribute  # could be None, and that is fine
 
+    def validate_yaml(self, cls, loader, key_node, val_node, errors):
+        """
+        returns: Attribute that was checked, or None.
+        """
+        key = loader.construct_object(key_node)
+        attribute = self.get_by_key(key)
+
+        if attribute is not None:
+            attribute.validate_yaml(loader, val_node, errors)
+        else:
+            cls.item_type.validate_key_val(loader, key_node, val_node, cls.key_attr, errors)
+
+        return attribute  # could be None, and that is fine
+
     def yaml_attribute_order(self, obj, attr_order):
         """
         returns: Attribute that was applied
@@ -1,5 +1,7 @@
-import inspect
+import sys
 
+from .round_trip_data import MAP_KEY
+from .yamlizable import INVALID
 from .yamlizing_error import YamlizingError
 
 
@@ -12,6 +14,73 @@ class NODEFAULT:
         raise NotImplementedError
 
 
+def pure_validator(fvalidator):
+    """
+    Mark a validator as free of side effects, which allows a deferred validation pass to run it on
+    an executor.
+    """
+    fvalidator.yamlize_pure = True
+    return fvalidator
+
+
+def _validate(attribute, obj, value):
+    """returns: the exception raised by the validator, or None, so that only failures to run the
+    validator are raised by the executor"""
+    try:
+        attribute.validate_value(obj, value)
+    except Exception as ee:
+        return ee
+
+    return None
+
+
+def check_executor(executor):
+    """
+    raises: TypeError if ``executor`` runs its jobs in other processes, as the jobs of a load use
+    its loader and objects.
+    """
+    if executor is not None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        if isinstance(executor, ProcessPoolExecutor):
+            raise TypeError('Expected an executor that runs in this process, such as a '
+                            'ThreadPoolExecutor, got: {}'.format(executor))
+
+
+def run_deferred_validators(pending, executor=None):
+    """
+    Run validators that were skipped while loading.
+
+    returns: list of ``YamlizingError``, one for each failure.
+
+    :param pending: list of ``(attribute, obj, value, node)`` tuples.
+    :param executor: optional ``concurrent.futures.Executor`` used for validators marked with
+        ``pure_validator``. Validators are called with the loaded objects, so the executor must run
+        them in this process, e.g. a ``ThreadPoolExecutor``. Errors of the executor itself are
+        raised, rather than reported as invalid values.
+    """
+    check_executor(executor)
+    results = []
+
+    for attribute, obj, value, node in pending:
+        if executor is not None and getattr(attribute.fvalidator, 'yamlize_pure', False):
+            results.append(executor.submit(_validate, attribute, obj, value))
+        else:
+            results.append(_validate(attribute, obj, value))
+
+    errors = []
+
+    for (attribute, obj, value, node), result in zip(pending, results):
+        if result is not None and not isinstance(result, Exception):
+            result = result.result()
+
+        if result is not None:
+            errors.append(YamlizingError('Failed to assign attribute `{}` to `{}`, got: {}'
+                                         .format(attribute.name, value, result), node))
+
+    return errors
+
+
 class _Attribute(object):
 
     __slots__ = ()
@@ -21,7 +90,7 @@ class _Attribute(object):
 
         for attr_name in self.__class__.__slots__:
             attr = getattr(self, attr_name)
-            if inspect.isclass(attr):
+            if isinstance(attr, type):
                 attr = attr.__name__
             rep += ' {}:{}'.format(attr_name, attr)
 
@@ -80,12 +149,15 @@ class Attribute(_Attribute):
         the attribute must be supplied.
     storage_name : str
         ``'_yamlized_' + name``, stored as a separate attribute for speed.
+    intern : bool
+        when True, string values read from YAML are interned, so repeated values share a single
+        ``str`` object.
     """
 
-    __slots__ = ('_name', 'storage_name', 'key', 'type', 'default', 'fvalidator', 'doc')
+    __slots__ = ('_name', 'storage_name', 'key', 'type', 'default', 'fvalidator', 'doc', 'intern')
 
     def __init__(self, name=None, key=None, type=NODEFAULT, default=NODEFAULT, validator=None,
-                 doc=None):
+                 doc=None, intern=False):
         from yamlize.yamlizable import Dynamic, Typed
 
         # initialize _name for .name assignment
@@ -96,6 +168,7 @@ class Attribute(_Attribute):
         self.default = default
         self.fvalidator = validator
         self.doc = doc
+        self.intern = intern
 
         if type == NODEFAULT:
             self.type = Dynamic
@@ -123,51 +196,106 @@ class Attribute(_Attribute):
     def is_required(self):
         return self.default is NODEFAULT
 
-    def ensure_type(self, data, node=None):
+    def coerce(self, data):
+        """
+        returns: data converted to the attribute type, or ``INVALID``.
+        """
         if isinstance(data, self.type) or data == self.default:
             return data
 
         try:
             new_value = self.type(data)
-        except BaseException:
-            raise YamlizingError('Failed to coerce value `{}` to type `{}`'
-                                 .format(data, self.type), node)
+        except Exception:
+            return INVALID
 
         if new_value != data:
-            raise YamlizingError('Coerced `{}` to `{}`, but the new value `{}`'
-                                 ' is not equal to old `{}`.'
-                                 .format(type(data), type(new_value), new_value, data),
-                                 node)
+            return INVALID
 
         return new_value
 
-    def from_yaml(self, obj, loader, node, round_trip_data):
+    def coerce_error(self, data, node=None):
+        """
+        returns: the ``YamlizingError`` explaining why ``coerce`` returned ``INVALID``.
+        """
         try:
+            new_value = self.type(data)
+        except Exception:
+            return YamlizingError('Failed to coerce value `{}` to type `{}`'
+                                  .format(data, self.type), node)
+
+        return YamlizingError('Coerced `{}` to `{}`, but the new value `{}`'
+                              ' is not equal to old `{}`.'
+                              .format(type(data), type(new_value), new_value, data),
+                              node)
+
+    def ensure_type(self, data, node=None):
+        value = self.coerce(data)
+
+        if value is INVALID:
+            raise self.coerce_error(data, node)
+
+        return value
+
+    def from_yaml(self, obj, loader, node, round_trip_data):
+        round_trip_data.position = self.key
+        value = self.type.try_from_yaml(loader, node, round_trip_data)
+
+        if value is INVALID:
             # it is possible that we attempted to coerce None -> int, when None was the default
-            value = self.type.from_yaml(loader, node, round_trip_data)
-        except YamlizingError:
-            if self.is_required:
-                raise
+            if self.is_required or loader.construct_object(node, deep=True) != self.default:
+                # convert again, this time for the error explaining the failure
+                value = self.type.from_yaml(loader, node, round_trip_data)
             else:
                 value = loader.construct_object(node, deep=True)
-                if value != self.default:
-                    raise
+
+        if self.intern and type(value) is str:
+            value = getattr(loader, 'yamlize_intern', sys.intern)(value)
+
+        deferred = getattr(loader, 'yamlize_deferred_validators', None)
 
         try:
-            self.set_value(obj, value)
+            if deferred is not None and self.fvalidator is not None:
+                value = self.ensure_type(value, node)
+                setattr(obj, self.storage_name, value)
+                deferred.append((self, obj, value, node))
+            elif self.fvalidator is not None and hasattr(loader, 'yamlize_stats'):
+                # same as set_value, but the validator is timed
+                value = self.ensure_type(value, node)
+                loader.yamlize_stats.counts['validators'] += 1
+                loader.yamlize_stats.timed('validate', self.validate_value, obj, value)
+                setattr(obj, self.storage_name, value)
+            else:
+                self.set_value(obj, value)
         except Exception as ee:
             raise YamlizingError('Failed to assign attribute `{}` to `{}`, '
                                  'got: {}'
                                  .format(self.name, value, ee), node)
 
+    def validate_yaml(self, loader, node, errors):
+        type_errors = []
+        self.type.validate_node(loader, node, type_errors)
+
+        if type_errors and not self.is_required:
+            # it is possible that we attempted to coerce None -> int, when None was the default
+            if loader.construct_object(node, deep=True) == self.default:
+                return
+
+        errors.extend(type_errors)
+
     def to_yaml(self, obj, dumper, node_items, round_trip_data):
         if self.has_default(obj):
             # short circuit, don't write out default data
             return
 
+        self.value_to_yaml(obj, dumper, node_items, round_trip_data)
+
+    def value_to_yaml(self, obj, dumper, node_items, round_trip_data):
+        """
+        Same as ``to_yaml``, but the value is written even when it is not set on ``obj``.
+        """
         data = self.get_value(obj)
         try:
-            val_node = self.type.to_yaml(dumper, data, round_trip_data)
+            val_node = self.type.to_yaml(dumper, data, round_trip_data.at(self.key))
         except YamlizingError:
             if data == self.default:
                 val_node = dumper.represent_data(data)
@@ -187,7 +315,21 @@ class Attribute(_Attribute):
         if obj is None:
             return self
 
-        result = getattr(obj, self.storage_name, self.default)
+        result = getattr(obj, self.storage_name, NODEFAULT)
+
+        if result is NODEFAULT:
+            result = self.default
+
+            try:
+                links = obj._Object__round_trip_data._merge_parents
+            except AttributeError:
+                # not an Object, or its round trip data was dropped
+                links = None
+
+            # not set, it may be inherited from a prototype merge parent, which is only looked for
+            # when the object has one
+            if links and links[0].prototype:
+                result = obj._inherited_value(self)
 
         if result is NODEFAULT:
             raise YamlizingError('Attribute `{}` was not defined on `{}`'
@@ -197,19 +339,21 @@ class Attribute(_Attribute):
 
     def __set__(self, obj, value):
         value = self.ensure_type(value)
+        self.validate_value(obj, value)
+        setattr(obj, self.storage_name, value)
 
+    def validate_value(self, obj, value):
         if self.fvalidator is not None:
             if self.fvalidator(obj, value) is False:
                 raise ValueError('Cannot set `{}.{}` to invalid value `{}`'
                                  .format(obj.__class__.__name__, self.name, value))
 
-        setattr(obj, self.storage_name, value)
-
     def __delete__(self, obj):
         delattr(obj, self.storage_name)
 
     def validator(self, fvalidator):
-        return type(self)(self.name, self.key, self.type, self.default, fvalidator, self.doc)
+        return type(self)(self.name, self.key, self.type, self.default, fvalidator, self.doc,
+                          self.intern)
 
 
 class MapItem(_Attribute):
@@ -235,8 +379,8 @@ class MapItem(_Attribute):
 
     def to_yaml(self, obj, dumper, node_items, round_trip_data):
         data = self.get_value(obj)
-        val_node = self.val_type.to_yaml(dumper, data, round_trip_data)
-        key_node = self.key_type.to_yaml(dumper, self.key, round_trip_data)
+        val_node = self.val_type.to_yaml(dumper, data, round_trip_data.at(self.key))
+        key_node = self.key_type.to_yaml(dumper, self.key, round_trip_data.at(MAP_KEY))
         node_items.append((key_node, val_node))
 
     def get_value(self, obj):
@@ -0,0 +1,159 @@
+import copy
+import types
+
+from .objects import _AliasLink
+from .round_trip_data import RoundTripData
+from .yamlizable import Yamlizable
+
+
+# never modified, so a clone shares them with the original
+_IMMUTABLE_TYPES = (type(None), bool, int, float, complex, str, bytes, type, range,
+                    types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+# {class: names of its __slots__, including private names as they are stored}
+_slot_names = {}
+
+
+def _slots(cls):
+    names = _slot_names.get(cls)
+
+    if names is None:
+        names = []
+
+        for base in cls.__mro__:
+            for attr_name in base.__dict__.get('__slots__', ()):
+                if attr_name in ('__dict__', '__weakref__'):
+                    continue
+
+                if attr_name.startswith('__') and not attr_name.endswith('__'):
+                    attr_name = '_{}{}'.format(base.__name__.lstrip('_'), attr_name)
+
+                names.append(attr_name)
+
+        # computing the same names twice is harmless, so this needs no lock
+        _slot_names[cls] = names = tuple(names)
+
+    return names
+
+
+def clone(obj):
+    """
+    Copy a yamlize object graph, as if it had been dumped and loaded again, without the YAML.
+
+    Unlike ``copy.deepcopy``, which drops round trip data, the copy keeps comments, styles and
+    anchors, and merge parents (``<<: *parent``), so it is dumped just like the original. Objects
+    referenced more than once are copied once, and strings, numbers and other immutable values are
+    shared with the original.
+
+    >>> import yamlize
+    >>> numbers = yamlize.IntList.load('# numbers\\n- 1\\n- 2\\n')
+    >>> copied = yamlize.clone(numbers)
+    >>> copied.append(3)
+    >>> print(yamlize.IntList.dump(copied), end='')
+    # numbers
+    - 1
+    - 2
+    - 3
+    >>> numbers
+    [1, 2]
+    """
+    return _Cloner().copy(obj)
+
+
+class _Cloner(object):
+    """Copies a single graph, ``memo`` maps the ``id`` of each copied object to its copy."""
+
+    __slots__ = ('memo',)
+
+    def __init__(self):
+        # the same form as the memo of copy.deepcopy, so it is shared with anything copied by it
+        self.memo = {}
+
+    def copy(self, value):
+        if isinstance(value, _IMMUTABLE_TYPES):
+            return value
+
+        copied = self.memo.get(id(value), self)
+
+        if copied is not self:
+            return copied
+
+        cls = type(value)
+
+        if isinstance(value, Yamlizable):
+            return self.__copy_yamlizable(value)
+        elif cls is RoundTripData:
+            return self.__copy_round_trip_data(value)
+        elif cls is _AliasLink:
+            link = self.memo[id(value)] = _AliasLink(None, value.prototype)
+            link.parent = self.copy(value.parent)
+            # pairs of an attribute and its bound getter, which are shared
+            link.attributes = list(value.attributes)
+            return link
+        elif cls is list:
+            copied = self.memo[id(value)] = []
+            copied.extend(self.copy(item) for item in value)
+            return copied
+        elif cls is dict:
+            copied = self.memo[id(value)] = {}
+
+            for key, item in value.items():
+                copied[self.copy(key)] = self.copy(item)
+
+            return copied
+        elif cls in (tuple, frozenset, set):
+            items = [self.copy(item) for item in value]
+
+            if cls is not set and all(item is original for item, original in zip(items, value)):
+                return value
+
+            copied = self.memo[id(value)] = cls(items)
+            return copied
+
+        return copy.deepcopy(value, self.memo)
+
+    def __copy_yamlizable(self, value):
+        cls = type(value)
+        # skip __new__ and __init__, every assigned slot is copied below
+        copied = self.memo[id(value)] = object.__new__(cls)
+
+        if hasattr(value, '__dict__'):
+            copied.__dict__.update(self.copy(value.__dict__))
+
+        # the round trip data is in a slot of Object, after the values it refers to
+        for attr_name in _slots(cls):
+            item = getattr(value, attr_name, _slots)
+
+            if item is not _slots:
+                object.__setattr__(copied, attr_name, self.copy(item))
+
+        return copied
+
+    def __copy_round_trip_data(self, value):
+        rtd = self.memo[id(value)] = RoundTripData(None)
+
+        if value._rtd is not None:
+            # comment tokens are marked as they are dumped, so the copy needs its own
+            rtd._rtd = {key: copy.deepcopy(val, self.memo) if key == 'comment' else val
+                        for key, val in value._rtd.items()}
+
+        if value._kids_rtd is not None:
+            rtd._kids_rtd = {self.__child_key(key): self.copy(kid)
+                             for key, kid in value._kids_rtd.items()}
+
+        rtd._name_order = list(value._name_order)
+        rtd._merge_parents = tuple(self.copy(link) for link in value._merge_parents)
+        rtd._complete_inheritance = value._complete_inheritance
+        rtd.position = value.position
+        return rtd
+
+    def __child_key(self, key):
+        if len(key) == 3:
+            # (position, type, id) of an unhashable child, which is now a different object
+            position, key_type, key_id = key
+            copied = self.memo.get(key_id)
+
+            if copied is not None:
+                return position, key_type, id(copied)
+
+        return key
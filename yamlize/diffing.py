@@ -0,0 +1,245 @@
+from .attributes import NODEFAULT
+from .objects import Object
+from .maps import Map, KeyedList
+from .sequences import Sequence
+from .yamlizable import Yamlizable
+
+
+# kinds of step in the path of a Change
+ATTRIBUTE = 'attribute'
+ITEM = 'item'
+
+OPERATIONS = ('add', 'remove', 'replace')
+
+
+class Change(object):
+    """
+    A single difference between two yamlize objects, from ``yamlize.diff``.
+
+    Attributes
+    ----------
+    op : str
+        one of ``OPERATIONS``. Attributes are added when they are not set and have no default on
+        the old side, and removed when they are set on the old side only, so that patching leaves
+        them unset and dumps them the same way. Items are added or removed when their key or index
+        is only on one side.
+    path : tuple
+        steps from the compared object to the changed value, each either ``(ATTRIBUTE, name)`` for
+        an ``Attribute``, or ``(ITEM, key)`` for a key of a ``Map`` or ``KeyedList``, or an index
+        of a ``Sequence``.
+    old : value
+        value being replaced or removed, None when it is added.
+    new : value
+        value replacing or added, None when it is removed.
+    """
+
+    __slots__ = ('op', 'path', 'old', 'new')
+
+    def __init__(self, op, path, old=None, new=None):
+        self.op = op
+        self.path = path
+        self.old = old
+        self.new = new
+
+    def __eq__(self, other):
+        if not isinstance(other, Change):
+            return NotImplemented
+
+        return (self.op, self.path, self.old, self.new) == \
+            (other.op, other.path, other.old, other.new)
+
+    __hash__ = None
+
+    def __repr__(self):
+        if self.op == 'add':
+            values = repr(self.new)
+        elif self.op == 'remove':
+            values = repr(self.old)
+        else:
+            values = '{!r} -> {!r}'.format(self.old, self.new)
+
+        return '<Change {} {}: {}>'.format(self.op, format_path(self.path), values)
+
+
+def format_path(path):
+    """
+    returns: str of a ``Change.path``, such as ``.parts['wheel'].mass``.
+    """
+    return ''.join('.{}'.format(key) if kind == ATTRIBUTE else '[{!r}]'.format(key)
+                   for kind, key in path)
+
+
+def _equal(old, new):
+    if old is new:
+        return True
+
+    try:
+        return bool(old == new)
+    except Exception:
+        # e.g. arrays, which have no single truth value
+        return False
+
+
+def diff(old, new):
+    """
+    Compare two instances of the same yamlize class, attribute by attribute.
+
+    Nested objects are compared in turn, ``Map`` and ``KeyedList`` items are matched by key, and
+    ``Sequence`` items by index. Any other values are replaced when they are not equal. Objects that
+    are referenced more than once are compared once.
+
+    >>> import yamlize
+    >>> class Part(yamlize.Object):
+    ...     name = yamlize.Attribute(type=str)
+    ...     mass = yamlize.Attribute(type=float, default=0.0)
+    >>> class Parts(yamlize.KeyedList):
+    ...     key_attr = Part.name
+    ...     item_type = Part
+    >>> old = Parts.load(u'wheel: {mass: 2.5}\\nseat: {}')
+    >>> new = Parts.load(u'wheel: {mass: 3.0}\\nbell: {}')
+    >>> changes = yamlize.diff(old, new)
+    >>> changes  # doctest: +ELLIPSIS
+    [<Change replace ['wheel'].mass: 2.5 -> 3.0>, <Change remove ['seat']: ...>, \
+<Change add ['bell']: ...>]
+    >>> yamlize.patch(old, changes)
+    >>> yamlize.diff(old, new)
+    []
+
+    returns: list of ``Change``, which ``yamlize.patch`` applies to ``old`` to make it equal to
+    ``new``.
+    """
+    if type(old) is not type(new) or not isinstance(old, (Object, Sequence)):
+        raise TypeError('Expected two instances of the same yamlize class, got `{}` and `{}`'
+                        .format(type(old).__name__, type(new).__name__))
+
+    changes = []
+    _diff(old, new, (), changes, set())
+    return changes
+
+
+def _value(obj, attribute):
+    """returns: value of ``attribute``, inherited or default when not set, NODEFAULT if none"""
+    value = getattr(obj, attribute.storage_name, NODEFAULT)
+
+    if value is NODEFAULT:
+        value = obj._inherited_value(attribute)
+
+    return value
+
+
+def _diff(old, new, path, changes, compared):
+    """Add the changes from ``old`` to ``new`` at ``path`` to ``changes``."""
+    if old is new:
+        return
+
+    if type(old) is not type(new) or not isinstance(old, Yamlizable):
+        if not _equal(old, new):
+            changes.append(Change('replace', path, old, new))
+        return
+
+    pair = (id(old), id(new))
+
+    if pair in compared:
+        return
+
+    compared.add(pair)
+
+    if isinstance(old, Sequence):
+        _diff_sequence(old, new, path, changes, compared)
+        return
+
+    if not isinstance(old, Object):
+        if not _equal(old, new):
+            changes.append(Change('replace', path, old, new))
+        return
+
+    for attribute in type(old).attributes:
+        old_value = _value(old, attribute)
+        new_value = _value(new, attribute)
+        step = path + ((ATTRIBUTE, attribute.name),)
+
+        if old_value is NODEFAULT and new_value is NODEFAULT:
+            continue
+        elif old_value is NODEFAULT:
+            changes.append(Change('add', step, new=new_value))
+        elif new_value is NODEFAULT or (
+                attribute.has_default(new) and not attribute.has_default(old)):
+            # removed rather than replaced by the default, which would then be set and dumped
+            changes.append(Change('remove', step, old=old_value))
+        else:
+            _diff(old_value, new_value, step, changes, compared)
+
+    if isinstance(old, (Map, KeyedList)):
+        added = []
+
+        for key, old_value in old.items():
+            step = path + ((ITEM, key),)
+
+            if key in new:
+                _diff(old_value, new[key], step, changes, compared)
+            else:
+                changes.append(Change('remove', step, old=old_value))
+
+        for key, new_value in new.items():
+            if key not in old:
+                added.append(Change('add', path + ((ITEM, key),), new=new_value))
+
+        changes.extend(added)
+
+
+def _diff_sequence(old, new, path, changes, compared):
+    common = min(len(old), len(new))
+
+    for index in range(common):
+        _diff(old[index], new[index], path + ((ITEM, index),), changes, compared)
+
+    # removed from the end first, so the indexes of the other removals stay valid
+    for index in range(len(old) - 1, common - 1, -1):
+        changes.append(Change('remove', path + ((ITEM, index),), old=old[index]))
+
+    for index in range(common, len(new)):
+        changes.append(Change('add', path + ((ITEM, index),), new=new[index]))
+
+
+def _step(obj, kind, key):
+    if kind == ATTRIBUTE:
+        return type(obj).attributes.by_name[key].get_value(obj)
+
+    return obj[key]
+
+
+def patch(obj, changes):
+    """
+    Apply ``changes`` from ``yamlize.diff`` to ``obj``, in place.
+
+    Added and replacing values are used as they are, not copied, so afterwards ``obj`` shares them
+    with the object ``changes`` were made from. Use ``yamlize.clone`` on that object first to avoid
+    this.
+    """
+    for change in changes:
+        if change.op not in OPERATIONS:
+            raise ValueError('Unknown operation `{}` in {!r}'.format(change.op, change))
+
+        if not change.path:
+            raise ValueError('Cannot patch the object itself, from {!r}'.format(change))
+
+        parent = obj
+
+        for kind, key in change.path[:-1]:
+            parent = _step(parent, kind, key)
+
+        kind, key = change.path[-1]
+
+        if kind == ATTRIBUTE:
+            attribute = type(parent).attributes.by_name[key]
+
+            if change.op == 'remove':
+                attribute.__delete__(parent)
+            else:
+                attribute.set_value(parent, change.new)
+        elif change.op == 'remove':
+            del parent[key]
+        elif change.op == 'add' and isinstance(parent, Sequence):
+            parent[key:key] = [change.new]
+        else:
+            parent[key] = change.new
@@ -0,0 +1,154 @@
+"""
+Callbacks fired while loading and dumping, for counters, traces, or building indexes during a load.
+
+Hooks are global. While no hook of a kind is registered, the only cost is a check of a module
+attribute.
+
+>>> import yamlize
+>>> seen = []
+>>> callback = yamlize.hooks.on_construct(yamlize.IntList, lambda obj, node: seen.append(obj))
+>>> _ = yamlize.IntList.load('[1, 2]')
+>>> seen
+[[1, 2]]
+>>> yamlize.hooks.remove(callback)
+"""
+
+import threading
+
+
+# True while at least one hook of the kind is registered, checked before firing
+construct_active = False
+dump_active = False
+error_active = False
+
+_lock = threading.Lock()
+
+
+class _Registry(object):
+    """Callbacks registered by class, resolved through the MRO of the class that fired."""
+
+    __slots__ = ('callbacks', 'resolved')
+
+    def __init__(self):
+        self.callbacks = {}
+        self.resolved = {}
+
+    def __bool__(self):
+        return any(self.callbacks.values())
+
+    __nonzero__ = __bool__
+
+    def add(self, cls, callback):
+        self.callbacks.setdefault(cls, []).append(callback)
+        self.resolved = {}
+
+    def remove(self, callback):
+        for callbacks in self.callbacks.values():
+            while callback in callbacks:
+                callbacks.remove(callback)
+
+        self.resolved = {}
+
+    def for_class(self, cls):
+        resolved = self.resolved.get(cls)
+
+        if resolved is None:
+            resolved = tuple(callback
+                             for base in reversed(cls.__mro__)
+                             for callback in self.callbacks.get(base, ()))
+            self.resolved[cls] = resolved
+
+        return resolved
+
+
+_construct = _Registry()
+_dump = _Registry()
+_error = _Registry()
+
+
+def _update_active():
+    global construct_active, dump_active, error_active
+
+    construct_active = bool(_construct)
+    dump_active = bool(_dump)
+    error_active = bool(_error)
+
+
+def on_construct(cls, callback):
+    """
+    Call ``callback(obj, node)`` each time an instance of ``cls`` (or a subclass) is loaded, once it
+    has been fully constructed.
+
+    returns: callback, so that it can be passed to ``remove``.
+    """
+    with _lock:
+        _construct.add(cls, callback)
+        _update_active()
+
+    return callback
+
+
+def on_dump(cls, callback):
+    """
+    Call ``callback(obj, node)`` each time an instance of ``cls`` (or a subclass) is converted to a
+    YAML node.
+
+    returns: callback, so that it can be passed to ``remove``.
+    """
+    with _lock:
+        _dump.add(cls, callback)
+        _update_active()
+
+    return callback
+
+
+def on_error(callback):
+    """
+    Call ``callback(error)`` each time a ``YamlizingError`` is created, including errors that are
+    caught and handled internally.
+
+    returns: callback, so that it can be passed to ``remove``.
+    """
+    with _lock:
+        _error.add(object, callback)
+        _update_active()
+
+    return callback
+
+
+def remove(callback):
+    """
+    Unregister a callback from every hook it was registered with.
+    """
+    with _lock:
+        for registry in (_construct, _dump, _error):
+            registry.remove(callback)
+
+        _update_active()
+
+
+def clear():
+    """
+    Unregister every callback.
+    """
+    with _lock:
+        for registry in (_construct, _dump, _error):
+            registry.callbacks.clear()
+            registry.resolved = {}
+
+        _update_active()
+
+
+def constructed(obj, node):
+    for callback in _construct.for_class(type(obj)):
+        callback(obj, node)
+
+
+def dumped(obj, node):
+    for callback in _dump.for_class(type(obj)):
+        callback(obj, node)
+
+
+def error_created(error):
+    for callback in _error.for_class(object):
+        callback(error)
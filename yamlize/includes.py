@@ -0,0 +1,373 @@
+"""
+``!include path`` tags, enabled with ``Yamlizable.load(stream, includes=True)``.
+
+The included file is loaded as the type expected where the tag is found, which must be an
+``Object``, ``Map``, ``KeyedList`` or ``Sequence`` subclass. Paths are relative to the directory of
+the including file, or of the current directory for documents that are not read from a file.
+
+Loaded files are cached per process, by path, modification time, size, expected type and the load
+options that change the loaded objects, and each load gets its own copy (see ``yamlize.clone``).
+Files are only cached once the load that read them has succeeded, including its deferred
+validators, and not at all for loads that intern strings into a dict.
+
+When an ``executor`` is passed to ``load``, the included files that are not cached are read and
+parsed in it while the including document is being constructed. The parsed files are handed back as
+loaders and nodes, so the executor must run them in this process, e.g. a ``ThreadPoolExecutor``. A
+file that includes itself, directly or through other
+files, is an error.
+
+Dumping an included object writes ``!include path`` in its place, and writes the object back to its
+file if it has changed since it was loaded.
+"""
+
+import io
+import os
+import sys
+import threading
+
+
+INCLUDE_TAG = u'!include'
+
+# loader attributes copied to the loaders of included files
+_SHARED_ATTRS = ('yamlize_deferred_validators', 'yamlize_errors', 'yamlize_intern',
+                 'yamlize_prototype_merges')
+
+# {(path, mtime_ns, size): {(cls, key, options): object}}, objects in the cache are never handed out
+_cache = {}
+
+_lock = threading.Lock()
+
+
+class _Included(object):
+    """
+    Where an object was included from, kept in its round trip data.
+
+    Attributes
+    ----------
+    text : str
+        the path, as written after ``!include``.
+    path : str
+        absolute path of the file.
+    original : Yamlizable
+        copy of the object as it was loaded or last written, to find whether it has changed.
+    key_attribute : Attribute
+        for a ``KeyedList`` item, the key attribute, which is written in the including document
+        rather than the included file.
+    options : tuple or None
+        the cached load options it was loaded with, see ``_options``.
+    """
+
+    __slots__ = ('text', 'path', 'original', 'key_attribute', 'options')
+
+    def __init__(self, text, path, original, key_attribute, options):
+        self.text = text
+        self.path = path
+        self.original = original
+        self.key_attribute = key_attribute
+        self.options = options
+
+
+class _Context(object):
+    """Include state of a loader, as ``loader.yamlize_includes``."""
+
+    __slots__ = ('directory', 'executor', 'pending', 'chain', 'loaded')
+
+    def __init__(self, directory, executor, chain, loaded):
+        self.directory = directory
+        self.executor = executor
+        # {absolute path: future of (loader, node)}
+        self.pending = {}
+        # absolute paths of the files being loaded, from the outermost, to detect cycles
+        self.chain = chain
+        # {(signature, cls, key, options): object} loaded by the outermost load, shared with the
+        # contexts of the files it includes, and cached once that load has succeeded
+        self.loaded = loaded
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def _round_trip_data(obj):
+    from yamlize.sequences import Sequence
+
+    if isinstance(obj, Sequence):
+        return obj._Sequence__round_trip_data
+
+    return obj._Object__round_trip_data
+
+
+def _options(loader):
+    """
+    returns: the load options that change the loaded objects, or None when they are not cached.
+    """
+    intern = getattr(loader, 'yamlize_intern', None)
+
+    if intern not in (None, sys.intern):
+        # strings are interned into the caller's dict, which a cached copy would bypass
+        return None
+
+    return getattr(loader, 'yamlize_prototype_merges', False), intern is not None
+
+
+def _store(signature, cls, key, options, obj):
+    with _lock:
+        for old_signature in [old for old in _cache if old[0] == signature[0]]:
+            if old_signature != signature:
+                # the file has changed since
+                del _cache[old_signature]
+
+        _cache.setdefault(signature, {})[(cls, key, options)] = obj
+
+
+def enable(loader, stream, executor=None):
+    """
+    Enable ``!include`` tags for a load.
+
+    raises: TypeError if ``executor`` runs its jobs in other processes.
+    """
+    from yamlize.attributes import check_executor
+
+    check_executor(executor)
+    name = getattr(stream, 'name', None)
+
+    if isinstance(name, str) and os.path.isfile(name):
+        path = os.path.abspath(name)
+        loader.yamlize_includes = _Context(os.path.dirname(path), executor, (path,), {})
+    else:
+        loader.yamlize_includes = _Context(os.getcwd(), executor, (), {})
+
+
+def commit(loader):
+    """
+    Cache the files included by a load, once it has succeeded.
+    """
+    for (signature, cls, key, options), obj in loader.yamlize_includes.loaded.items():
+        _store(signature, cls, key, options, obj)
+
+
+def prefetch(loader, node):
+    """
+    Start reading and parsing the files included by the document ``node``, which are not cached,
+    when the load has an executor.
+    """
+    context = loader.yamlize_includes
+
+    if context.executor is None:
+        return
+
+    import ruamel.yaml
+
+    pending = [node]
+    visited = set()
+
+    while pending:
+        node = pending.pop()
+
+        if id(node) in visited:
+            continue
+
+        visited.add(id(node))
+
+        if isinstance(node, ruamel.yaml.ScalarNode):
+            if node.tag != INCLUDE_TAG:
+                continue
+
+            path = os.path.normpath(os.path.join(context.directory, node.value))
+
+            if path in context.pending or path in context.chain:
+                # a cycle is reported when the include is loaded
+                continue
+
+            try:
+                cached = _signature(path) in _cache
+            except OSError:
+                # reported when the include is loaded
+                continue
+
+            if not cached:
+                context.pending[path] = context.executor.submit(
+                    _compose, type(loader), path, context.executor, context.chain, context.loaded)
+        elif isinstance(node, ruamel.yaml.MappingNode):
+            for key_node, val_node in node.value:
+                pending.extend((key_node, val_node))
+        else:
+            pending.extend(node.value)
+
+
+def _compose(Loader, path, executor, chain, loaded):
+    """returns: (loader, node) of the file at ``path``, included by the files of ``chain``"""
+    with io.open(path, encoding='utf-8') as stream:
+        text = stream.read()
+
+    loader = Loader(text)
+    # shown in the marks of errors, rather than "<unicode string>"
+    loader.reader.name = path
+    loader.yamlize_includes = _Context(os.path.dirname(path), executor, chain + (path,), loaded)
+
+    try:
+        node = loader.get_single_node()
+        prefetch(loader, node)
+    except BaseException:
+        loader.dispose()
+        raise
+
+    return loader, node
+
+
+def load(cls, loader, node, key_node=None, key_attribute=None):
+    """
+    returns: the object of ``cls`` included by ``node``, a ``!include`` scalar. For a ``KeyedList``
+    item, the key is read from ``key_node`` of the including document.
+    """
+    from yamlize.cloning import clone
+    from yamlize.yamlizing_error import YamlizingError
+
+    context = loader.yamlize_includes
+    path = os.path.normpath(os.path.join(context.directory, node.value))
+
+    if path in context.chain:
+        chain = context.chain[context.chain.index(path):] + (path,)
+        raise YamlizingError('Include cycle: {}'.format(' -> '.join(chain)), node)
+
+    try:
+        signature = _signature(path)
+    except OSError as ee:
+        raise YamlizingError('Failed to include `{}`, got: {}'.format(node.value, ee), node)
+
+    key = None
+
+    if key_node is not None:
+        key = loader.construct_object(key_node)
+        # constructed again by from_yaml_key_val, which expects it not to be constructed yet
+        del loader.constructed_objects[key_node]
+
+    options = _options(loader)
+    loaded_key = signature, cls, key, options
+    original = context.loaded.get(loaded_key)
+
+    if original is None and options is not None:
+        original = _cache.get(signature, {}).get((cls, key, options))
+
+    if original is None:
+        original = _load(cls, loader, context, path, key_node, key_attribute)
+
+        if options is not None:
+            # cached by commit, once this load has succeeded
+            context.loaded[loaded_key] = original
+
+    obj = clone(original)
+    rtd = _round_trip_data(obj)
+
+    if rtd._rtd is None:
+        rtd._rtd = {}
+
+    rtd._rtd['include'] = _Included(node.value, path, original, key_attribute, options)
+    return obj
+
+
+def _load(cls, loader, context, path, key_node, key_attribute):
+    """returns: object loaded from ``path``"""
+    from yamlize.yamlizing_error import YamlizingError
+
+    future = context.pending.pop(path, None)
+
+    try:
+        if future is None:
+            sub_loader, root = _compose(type(loader), path, context.executor, context.chain,
+                                        context.loaded)
+        else:
+            sub_loader, root = future.result()
+    except (OSError, UnicodeDecodeError) as ee:
+        raise YamlizingError('Failed to include `{}`, got: {}'.format(path, ee))
+
+    for attr_name in _SHARED_ATTRS:
+        if hasattr(loader, attr_name):
+            setattr(sub_loader, attr_name, getattr(loader, attr_name))
+
+    try:
+        if key_node is None:
+            obj = cls.from_yaml(sub_loader, root, None)
+        else:
+            obj = cls.from_yaml_key_val(sub_loader, key_node, root, key_attribute, None)
+    finally:
+        sub_loader.dispose()
+
+        for future in sub_loader.yamlize_includes.pending.values():
+            # included by parts of the file that failed, or were not used
+            future.cancel()
+
+    return obj
+
+
+def included(obj):
+    """
+    returns: the ``_Included`` record of ``obj``, or None if it was not included.
+    """
+    rtd = _round_trip_data(obj)._rtd
+    return None if rtd is None else rtd.get('include')
+
+
+def _write(path, text):
+    """Replace the file at ``path`` with ``text``, atomically."""
+    import shutil
+    import tempfile
+
+    directory, name = os.path.split(path)
+    descriptor, temporary = tempfile.mkstemp(prefix='.{}.'.format(name), suffix='.tmp',
+                                             dir=directory)
+
+    try:
+        with io.open(descriptor, 'w', encoding='utf-8') as stream:
+            stream.write(text)
+
+        shutil.copymode(path, temporary)
+        # readers see either the previous contents or these, never a partly written file
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def dump(dumper, obj):
+    """
+    Write the included ``obj`` back to its file if it has changed since it was loaded or last
+    written.
+
+    returns: the ``!include`` node to write in its place.
+    """
+    import ruamel.yaml
+    from yamlize.cloning import clone
+    from yamlize.diffing import diff
+
+    record = included(obj)
+
+    if diff(record.original, obj):
+        stream = io.StringIO()
+        sub_dumper = type(dumper)(stream)
+        # the object itself is written this time, rather than another !include
+        sub_dumper.yamlize_include_root = obj
+
+        try:
+            sub_dumper._serializer.open()
+
+            if record.key_attribute is None:
+                node = type(obj).to_yaml(sub_dumper, obj)
+            else:
+                node = type(obj).to_yaml_key_val(sub_dumper, obj, record.key_attribute)[1]
+
+            sub_dumper.serialize(node)
+            sub_dumper._serializer.close()
+        finally:
+            sub_dumper._emitter.dispose()
+
+        _write(record.path, stream.getvalue())
+
+        record.original = clone(obj)
+        key = None if record.key_attribute is None else record.key_attribute.get_value(obj)
+
+        if record.options is not None:
+            _store(_signature(record.path), type(obj), key, record.options, record.original)
+
+    return ruamel.yaml.ScalarNode(INCLUDE_TAG, record.text)
@@ -0,0 +1,199 @@
+import time
+
+
+# phases of Yamlizable.load, in the order they first happen
+PHASES = ('scan', 'parse', 'compose', 'construct', 'merge', 'defaults', 'validate')
+
+_SCANNER_METHODS = ('check_token', 'peek_token', 'get_token')
+
+_PARSER_METHODS = ('check_event', 'peek_event', 'get_event')
+
+_MERGE_TAG = u'tag:yaml.org,2002:merge'
+
+
+class LoadStats(object):
+    """
+    Timing and count breakdown of a single ``Yamlizable.load``.
+
+    Times are exclusive, e.g. ``parse`` does not include the time the parser spent waiting for the
+    scanner, so the phases add up to the total.
+
+    Attributes
+    ----------
+    seconds : dict
+        ``{phase: float}`` for each of ``PHASES``. ``scan`` includes reading the stream,
+        ``construct`` is everything yamlize does that is not one of the other phases, ``merge`` is
+        the resolution of attributes inherited through merge keys (``<<``), ``defaults`` is the
+        application of defaults and the check for missing attributes, and ``validate`` is the time
+        spent in attribute validators (including deferred validators).
+    counts : dict
+        ``{'tokens', 'events', 'objects', 'merges', 'validators'}`` counts.
+    nodes : dict
+        ``{'scalar', 'sequence', 'mapping', 'alias'}`` counts of the composed document, where
+        ``alias`` is the number of references to an anchored node.
+    merge_depth : int
+        length of the longest chain of merge keys, 0 when there are none.
+    bytes : int
+        size of the document; for a text stream this is the number of characters.
+    """
+
+    __slots__ = ('seconds', 'counts', 'nodes', 'merge_depth', 'bytes', '_phase', '_start')
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(('tokens', 'events', 'objects', 'merges', 'validators'), 0)
+        self.nodes = dict.fromkeys(('scalar', 'sequence', 'mapping', 'alias'), 0)
+        self.merge_depth = 0
+        self.bytes = 0
+        self._phase = None
+        self._start = None
+
+    def __repr__(self):
+        return '<LoadStats {:.6f}s, {} bytes, {} nodes>'.format(
+            self.total_seconds, self.bytes, sum(self.nodes.values()))
+
+    @property
+    def total_seconds(self):
+        return sum(self.seconds.values())
+
+    def as_dict(self):
+        return {
+            'seconds': dict(self.seconds),
+            'counts': dict(self.counts),
+            'nodes': dict(self.nodes),
+            'merge_depth': self.merge_depth,
+            'bytes': self.bytes,
+        }
+
+    def timed(self, phase, func, *args):
+        """
+        Call ``func(*args)``, and attribute the time to ``phase`` (excluding any nested phases).
+        """
+        outer = self._phase
+
+        if outer == phase:
+            return func(*args)
+
+        now = time.perf_counter()
+
+        if outer is not None:
+            self.seconds[outer] += now - self._start
+
+        self._phase, self._start = phase, now
+
+        try:
+            return func(*args)
+        finally:
+            now = time.perf_counter()
+            self.seconds[phase] += now - self._start
+            self._phase, self._start = outer, now
+
+    def attach(self, loader, stream):
+        """
+        Record the scan, parse and compose phases of ``loader``, by wrapping its methods.
+
+        Only the given loader instance is affected.
+        """
+        loader.yamlize_stats = self
+
+        if isinstance(stream, str):
+            self.bytes = len(stream.encode('utf-8'))
+        elif isinstance(stream, bytes):
+            self.bytes = len(stream)
+
+        # tokens and events are each taken once with get_*, but may be checked or peeked many times
+        for method_name in _SCANNER_METHODS:
+            self.__wrap(loader, method_name, 'scan',
+                        'tokens' if method_name == 'get_token' else None)
+
+        for method_name in _PARSER_METHODS:
+            self.__wrap(loader, method_name, 'parse',
+                        'events' if method_name == 'get_event' else None)
+
+        self.__wrap(loader, 'get_single_node', 'compose', None)
+
+    def __wrap(self, loader, method_name, phase, count):
+        method = getattr(loader, method_name)
+        counts = self.counts
+        timed = self.timed
+
+        if count is None:
+            def wrapper(*args):
+                return timed(phase, method, *args)
+        else:
+            def wrapper(*args):
+                counts[count] += 1
+                return timed(phase, method, *args)
+
+        setattr(loader, method_name, wrapper)
+
+    def finish(self, loader, root):
+        """
+        Record the size and shape of the document, once ``root`` has been composed.
+        """
+        import ruamel.yaml
+
+        if not self.bytes:
+            self.bytes = getattr(loader, 'stream_pointer', 0)
+
+        if root is None:
+            return
+
+        nodes = self.nodes
+        seen = set()
+        pending = [root]
+        merge_roots = []
+
+        while pending:
+            node = pending.pop()
+
+            if id(node) in seen:
+                nodes['alias'] += 1
+                continue
+
+            seen.add(id(node))
+
+            if isinstance(node, ruamel.yaml.MappingNode):
+                nodes['mapping'] += 1
+
+                for key_node, val_node in node.value:
+                    if key_node.tag == _MERGE_TAG:
+                        merge_roots.append(node)
+
+                    pending.append(key_node)
+                    pending.append(val_node)
+            elif isinstance(node, ruamel.yaml.SequenceNode):
+                nodes['sequence'] += 1
+                pending.extend(node.value)
+            else:
+                nodes['scalar'] += 1
+
+        depths = {}
+        self.merge_depth = max([_merge_depth(node, depths) for node in merge_roots] or [0])
+
+
+def _merge_depth(node, depths):
+    """returns: length of the longest chain of merge keys starting at ``node``"""
+    import ruamel.yaml
+
+    if id(node) in depths:
+        return depths[id(node)]
+
+    depths[id(node)] = 0  # guards against recursive documents
+    depth = 0
+
+    if isinstance(node, ruamel.yaml.MappingNode):
+        for key_node, val_node in node.value:
+            if key_node.tag != _MERGE_TAG:
+                continue
+
+            if isinstance(val_node, ruamel.yaml.SequenceNode):
+                parents = val_node.value
+            else:
+                parents = [val_node]
+
+            for parent in parents:
+                depth = max(depth, 1 + _merge_depth(parent, depths))
+
+    depths[id(node)] = depth
+    return depth
@@ -1,5 +1,3 @@
-import ruamel.yaml
-
 from collections import OrderedDict
 
 from .objects import Object, ObjectType
@@ -7,20 +5,9 @@ from .yamlizable import Dynamic
 from .yamlizing_error import YamlizingError
 
 
-def _all_bases(bases):
-    """returns a set of subclasses from bases tuple that would be passed in type.__init__"""
-    subclasses = set()
-
-    for base in bases:
-        subclasses.add(base)
-        subclasses.update(_all_bases(base.__subclasses__()))
-
-    return subclasses
-
-
 class MapType(ObjectType):
 
-    def __init__(cls, name, bases, data):
+    def __init__(cls, name, bases, data, slots=False):
         from yamlize.attribute_collection import (MapAttributeCollection,
                                                   KeyedListAttributeCollection)
         attributes = data.get('attributes', None)
@@ -28,23 +15,22 @@ class MapType(ObjectType):
         # the KeyedList in gloabls() hack short circuuits the below logic until Map and KeyedList
         # have been defined
         if attributes is None and 'KeyedList' in globals():
-            all_bases = _all_bases(bases)
-            if any(base is Map for base in all_bases):
+            if issubclass(cls, Map):
                 data['attributes'] = MapAttributeCollection()
-            elif any(base is KeyedList for base in all_bases):
+            elif issubclass(cls, KeyedList):
                 data['attributes'] = KeyedListAttributeCollection()
             else:
                 raise TypeError('Expected `{}` to be a yamlize.maps.Map subclass'
                                 .format(name))
-        return ObjectType.__init__(cls, name, bases, data)
+        return ObjectType.__init__(cls, name, bases, data, slots)
 
 
 class __MapBase(Object, metaclass=MapType):
     """
-    __MapBase is a wrapper around and OrderedDict.
+    __MapBase is a wrapper around a dict.
 
-    Base class for other maps, provides wrapper methods to the underlying
-    OrderedDict.
+    Base class for other maps, provides the mapping methods of the underlying
+    dict directly, so that no lookup falls through to ``__getattr__``.
     """
 
     __slots__ = ('__data',)
@@ -54,10 +40,10 @@ class __MapBase(Object, metaclass=MapType):
         Explicit implementation of __new__ to assign __data as an attribute.
 
         :param ``*args``: sequence of key/value pairs.
-        :param ``**kwargs``: kwargs for input to OrderedDict.
+        :param ``**kwargs``: kwargs for input to dict.
         """
         self = Object.__new__(cls)
-        self.__data = OrderedDict()
+        self.__data = {}
         return self
 
     def __init__(self, *args, **kwargs):
@@ -65,23 +51,10 @@ class __MapBase(Object, metaclass=MapType):
         Initialize a Map.
 
         :param ``*args``: sequence of key/value pairs.
-        :param ``**kwargs``: kwargs for input to OrderedDict.
+        :param ``**kwargs``: kwargs for input to dict.
         """
         Object.__init__(self)
-        self.__data = OrderedDict(*args, **kwargs)
-
-    def __getattr__(self, attr_name):
-        """
-        Get attribute if it does not exist on the class already, by assuming it
-        is implemented in the underlying OrderedDict.
-
-        :param attr_name: attribute name to retrieve
-        """
-        try:
-            return getattr(self.__data, attr_name)
-        except AttributeError:
-            raise AttributeError("'{}' object has no attribute '{}'"
-                                 .format(self.__class__.__name__, attr_name))
+        self.__data = dict(*args, **kwargs)
 
     def __iter__(self):
         """Iterate over the items in the collection."""
@@ -89,15 +62,15 @@ class __MapBase(Object, metaclass=MapType):
 
     def __repr__(self):
         """
-        String representation of the collection - behaves like an OrderedDict.
+        String representation of the collection - behaves like a dict.
         """
-        return repr(self.__data).replace('OrderedDict', type(self).__name__)
+        return '{}({!r})'.format(type(self).__name__, self.__data)
 
     def __str__(self):
         """
-        String representation of the collection - behaves like an OrderedDict.
+        String representation of the collection - behaves like a dict.
         """
-        return str(self.__data).replace('OrderedDict', type(self).__name__)
+        return '{}({!s})'.format(type(self).__name__, self.__data)
 
     def __len__(self):
         """Returns the number of items in the collection."""
@@ -137,6 +110,95 @@ class __MapBase(Object, metaclass=MapType):
         """
         del self.__data[key]
 
+    def keys(self):
+        """Returns a view of the keys in the collection."""
+        return self.__data.keys()
+
+    def values(self):
+        """Returns a view of the values in the collection."""
+        return self.__data.values()
+
+    def items(self):
+        """Returns a view of the key/value pairs in the collection."""
+        return self.__data.items()
+
+    def get(self, key, default=None):
+        """
+        Get an item from the collection, or ``default`` if it is not in the collection.
+
+        :param key: key of the item entry
+        :param default: value returned when the key is missing
+        """
+        return self.__data.get(key, default)
+
+    def pop(self, key, *default):
+        """
+        Remove an item from the collection and return it.
+
+        :param key: key of the item entry
+        :param default: optional value returned when the key is missing
+        """
+        return self.__data.pop(key, *default)
+
+    def popitem(self, last=True):
+        """
+        Remove and return the last key/value pair added to the collection, or the first if ``last``
+        is False.
+        """
+        if not last and self.__data:
+            key = next(iter(self.__data))
+            return key, self.__data.pop(key)
+
+        return self.__data.popitem()
+
+    def move_to_end(self, key, last=True):
+        """
+        Move an item to the end of the collection, or to the start if ``last`` is False.
+
+        :param key: key of the item entry
+        """
+        value = self.__data.pop(key)
+
+        if last:
+            self.__data[key] = value
+        else:
+            data = {key: value}
+            data.update(self.__data)
+            self.__data = data
+
+    def copy(self):
+        """Returns a shallow copy of the items, as an ``OrderedDict``."""
+        return OrderedDict(self.__data)
+
+    def fromkeys(self, keys, value=None):
+        """Returns an ``OrderedDict`` of ``keys``, each with ``value``."""
+        return OrderedDict.fromkeys(keys, value)
+
+    def clear(self):
+        """Remove all items from the collection."""
+        self.__data.clear()
+
+    def setdefault(self, key, default=None):
+        """
+        Get an item from the collection, setting it to ``default`` if it is missing.
+
+        :param key: key of the item entry
+        :param default: value assigned when the key is missing
+        """
+        if key not in self.__data:
+            self[key] = default
+        return self.__data[key]
+
+    def update(self, *args, **kwargs):
+        """
+        Set items in the collection through ``__setitem__``, so subclass checks apply.
+
+        :param ``*args``: mapping or sequence of key/value pairs.
+        :param ``**kwargs``: key/value pairs.
+        """
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
 
 class Map(__MapBase):
     """
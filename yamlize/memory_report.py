@@ -0,0 +1,173 @@
+import sys
+import types
+
+from .attributes import _Attribute
+from .objects import _AliasLink
+from .round_trip_data import RoundTripData
+from .yamlizable import Yamlizable
+
+
+CATEGORIES = ('containers', 'values', 'round_trip_data', 'kids_rtd', 'merge_links')
+
+# shared by every instance, and not retained by the object graph
+_SKIPPED_TYPES = (type, types.FunctionType, types.BuiltinFunctionType, types.ModuleType,
+                  _Attribute, type(None), bool)
+
+
+class MemoryReport(object):
+    """
+    Bytes retained by an object graph, from ``yamlize.memory_report``.
+
+    Attributes
+    ----------
+    total : int
+        bytes retained by the graph, objects that are referenced more than once are counted once.
+    by_category : dict
+        ``{category: bytes}`` for each of ``CATEGORIES``: ``containers`` is the yamlize instances
+        themselves (and the dict or list of a ``Map``, ``KeyedList`` or ``Sequence``),
+        ``values`` is the attribute and item values that are not yamlize instances,
+        ``round_trip_data`` is the ``RoundTripData`` of each instance, ``kids_rtd`` is the round
+        trip data stored for scalar children, and ``merge_links`` is the links to merge parents.
+    by_class : dict
+        ``{class name: {'count': int, 'bytes': int}}``, where bytes excludes nested yamlize
+        instances, which are reported under their own class.
+    """
+
+    __slots__ = ('total', 'by_category', 'by_class')
+
+    def __init__(self):
+        self.total = 0
+        self.by_category = dict.fromkeys(CATEGORIES, 0)
+        self.by_class = {}
+
+    def __repr__(self):
+        return '<MemoryReport {} bytes>'.format(self.total)
+
+    def table(self):
+        """
+        returns: str table of bytes by class, largest first, followed by bytes by category.
+        """
+        width = max(len(name) for name in ['class'] + list(self.by_class) + list(CATEGORIES))
+        lines = ['{:<{w}}  {:>9}  {:>12}'.format('class', 'count', 'bytes', w=width)]
+
+        for name, stat in sorted(self.by_class.items(), key=lambda item: -item[1]['bytes']):
+            lines.append('{:<{w}}  {:>9}  {:>12}'.format(name, stat['count'], stat['bytes'],
+                                                         w=width))
+
+        lines.append('')
+
+        for category in CATEGORIES:
+            lines.append('{:<{w}}  {:>9}  {:>12}'.format(category, '', self.by_category[category],
+                                                         w=width))
+
+        lines.append('{:<{w}}  {:>9}  {:>12}'.format('total', '', self.total, w=width))
+        return '\n'.join(lines)
+
+    def _add(self, category, owner, size):
+        self.total += size
+        self.by_category[category] += size
+
+        if owner is not None:
+            self.by_class[owner]['bytes'] += size
+
+
+def _slot_values(obj):
+    """returns: values of the assigned ``__slots__`` of obj"""
+    values = []
+
+    for cls in type(obj).__mro__:
+        for attr_name in cls.__dict__.get('__slots__', ()):
+            if attr_name.startswith('__') and not attr_name.endswith('__'):
+                attr_name = '_{}{}'.format(cls.__name__.lstrip('_'), attr_name)
+
+            value = getattr(obj, attr_name, _slot_values)
+
+            if value is not _slot_values:
+                values.append(value)
+
+    return values
+
+
+def memory_report(obj):
+    """
+    Walk the graph of a loaded object, and report the bytes it retains by class and by category.
+
+    Sizes come from ``sys.getsizeof``, so they are the sizes of the Python objects, not including
+    allocator overhead.
+
+    >>> import yamlize
+    >>> report = yamlize.memory_report(yamlize.IntList.load('[1, 2, 3]'))
+    >>> report.by_class['IntList']['count']
+    1
+    >>> report.total == sum(report.by_category.values())
+    True
+    """
+    report = MemoryReport()
+    seen = set()
+    pending = [(obj, 'values', None)]
+
+    while pending:
+        value, category, owner = pending.pop()
+
+        if id(value) in seen or isinstance(value, _SKIPPED_TYPES):
+            continue
+
+        seen.add(id(value))
+        size = sys.getsizeof(value)
+        children = ()
+
+        if isinstance(value, Yamlizable):
+            owner = type(value).__name__
+            category = 'containers'
+            stat = report.by_class.setdefault(owner, {'count': 0, 'bytes': 0})
+            stat['count'] += 1
+            children = []
+
+            if hasattr(value, '__dict__'):
+                seen.add(id(value.__dict__))
+                size += sys.getsizeof(value.__dict__)
+                children.extend(value.__dict__.values())
+
+            # the dict of a Map or KeyedList, or the list of a Sequence
+            storage = getattr(value, '_MapBase__data', getattr(value, '_Sequence__items', None))
+
+            for child in _slot_values(value):
+                if isinstance(child, RoundTripData):
+                    pending.append((child, 'round_trip_data', owner))
+                elif child is storage:
+                    # storage of the items is part of the container
+                    seen.add(id(child))
+                    size += sys.getsizeof(child)
+                    children.extend(child.keys() if isinstance(child, dict) else child)
+                    children.extend(child.values() if isinstance(child, dict) else ())
+                else:
+                    children.append(child)
+
+            children = [(child, 'values') for child in children]
+        elif isinstance(value, RoundTripData):
+            if category == 'round_trip_data':
+                children = [(value._rtd, category), (value._name_order, category),
+                            (value._kids_rtd, 'kids_rtd')]
+
+                if value._merge_parents:
+                    # otherwise it is the shared, empty tuple
+                    children.append((value._merge_parents, 'merge_links'))
+            else:
+                children = [(child, category) for child in _slot_values(value)]
+        elif isinstance(value, _AliasLink):
+            # the parent is reported on its own, the link only holds on to it
+            children = [(value.attributes, category), (value.parent, 'values')]
+        elif isinstance(value, dict):
+            children = [(child, category) for item in value.items() for child in item]
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            children = [(child, category) for child in value]
+        elif isinstance(value, types.MethodType):
+            # the function and instance are reported elsewhere, only the bound method is owned
+            pass
+        elif hasattr(value, '__dict__'):
+            children = [(value.__dict__, category)]
+
+        report._add(category, owner, size)
+        pending.extend((child, child_category, owner) for child, child_category in children)
+
+    return report
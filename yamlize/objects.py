@@ -1,8 +1,6 @@
-import inspect
-
-import ruamel.yaml
-
-from .yamlizable import Yamlizable
+from . import hooks
+from . import includes
+from .yamlizable import Yamlizable, INVALID, first_visit, _yaml
 from .yamlizing_error import YamlizingError
 from .round_trip_data import RoundTripData
 
@@ -11,16 +9,49 @@ MERGE_TAG = u'tag:yaml.org,2002:merge'
 
 
 def _create_merge_node():
-    return ruamel.yaml.ScalarNode(MERGE_TAG, '<<')
+    return _yaml().ScalarNode(MERGE_TAG, '<<')
 
 
-class _AliasLink(object):
+def _merged_keys(loader, node):
+    """returns the keys a mapping node inherits through merge tags"""
+    yaml = _yaml()
+
+    keys = set()
+
+    for parent_node in node.value if isinstance(node, yaml.SequenceNode) else [node]:
+        if not isinstance(parent_node, yaml.MappingNode):
+            continue
+
+        for key_node, val_node in parent_node.value:
+            if key_node.tag == MERGE_TAG:
+                keys |= _merged_keys(loader, val_node)
+            else:
+                keys.add(loader.construct_object(key_node))
 
-    __slots__ = ('parent', 'attributes')
+    return keys
 
-    def __init__(self, parent):
+
+class _AliasLink(object):
+    """
+    Link from an object to a merge parent (``<<: *parent``).
+
+    Attributes
+    ----------
+    parent : Object
+        the merge parent.
+    attributes : list
+        ``(attribute, get_value)`` of each attribute copied from the parent.
+    prototype : bool
+        when True, nothing is copied, and values that are not set on the object are read from the
+        parent instead (see ``Yamlizable.load(prototype_merges=True)``).
+    """
+
+    __slots__ = ('parent', 'attributes', 'prototype')
+
+    def __init__(self, parent, prototype=False):
         self.parent = parent
         self.attributes = []
+        self.prototype = prototype
 
     def __getstate__(self):
         return None
@@ -53,6 +84,10 @@ class _AliasLink(object):
         if parent not in representer.represented_objects:
             return False
 
+        if self.prototype:
+            # inherited values are never stored on the object, so there is nothing to compare
+            return True
+
         am_parent = False
 
         for attr, get_method in self.attributes:
@@ -68,7 +103,34 @@ class _AliasLink(object):
 
 class ObjectType(type):
 
-    def __init__(cls, name, bases, data):
+    def __new__(mcls, name, bases, data, slots=False):
+        """
+        Create the class, generating ``__slots__`` storage for the declared attributes when
+        ``slots=True``.
+        """
+        from yamlize.attributes import Attribute
+
+        if slots and '__slots__' not in data:
+            declared = [attr_val.name or attr_name
+                        for attr_name, attr_val in data.items()
+                        if isinstance(attr_val, Attribute)]
+            declared.extend(attr.name for attr in data.get('attributes') or ())
+            storage_names = []
+
+            for attr_name in declared:
+                storage_name = '_yamlized_' + attr_name
+                if storage_name in storage_names:
+                    continue
+                if any(hasattr(base, storage_name) for base in bases):
+                    # a slotted parent already provides storage
+                    continue
+                storage_names.append(storage_name)
+
+            data['__slots__'] = tuple(storage_names)
+
+        return type.__new__(mcls, name, bases, data)
+
+    def __init__(cls, name, bases, data, slots=False):
         from yamlize.attribute_collection import AttributeCollection
         from yamlize.attributes import Attribute
 
@@ -84,22 +146,38 @@ class ObjectType(type):
         # not sure why I couldn't just overwrite data['attributes'], but it did not work
         cls.attributes = attributes
 
+        declared = []
+
         for attr_name, attr_val in data.items():
             if isinstance(attr_val, Attribute) and attr_val.name is None:
                 attr_val.name = attr_name
-                attributes.add(attr_val)
+                declared.append(attr_val)
+
+        attributes.extend(declared)
 
         for attribute in attributes:
             if not hasattr(cls, attribute.name):
                 setattr(cls, attribute.name, attribute)
 
-        for parent_cls in cls.__mro__[1:]:
-            if hasattr(parent_cls, 'attributes'):
-                for attribute in parent_cls.attributes:
-                    setattr(cls, attribute.name, attribute)
+        # the attributes of each base already include everything it inherited, so only the direct
+        # bases are needed, and inherited attributes are found through the MRO
+        for base in bases:
+            inherited = getattr(base, 'attributes', ())
+            attributes.extend(inherited)
+
+            for attribute in inherited:
+                if attribute.name in data:
+                    # an inherited attribute takes precedence over a plain class attribute
+                    type.__setattr__(cls, attribute.name, attribute)
 
     def __setattr__(cls, attr_name, value):
         from yamlize.attributes import Attribute
+
+        if isinstance(value, Attribute) and cls.__dictoffset__ == 0:
+            if value.storage_name is not None and not hasattr(cls, value.storage_name):
+                raise TypeError('Cannot add attribute `{}` to `{}` after class creation, it '
+                                'uses __slots__ storage'.format(attr_name, cls.__name__))
+
         type.__setattr__(cls, attr_name, value)
 
         if isinstance(value, Attribute):
@@ -128,7 +206,10 @@ class Object(Yamlizable, metaclass=ObjectType):
 
     @classmethod
     def from_yaml(cls, loader, node, _rtd=None):
-        if not isinstance(node, ruamel.yaml.MappingNode):
+        if not isinstance(node, _yaml().MappingNode):
+            if node.tag == includes.INCLUDE_TAG and hasattr(loader, 'yamlize_includes'):
+                return includes.load(cls, loader, node)
+
             raise YamlizingError('Expected a mapping node', node)
 
         if node in loader.constructed_objects:
@@ -139,10 +220,28 @@ class Object(Yamlizable, metaclass=ObjectType):
         loader.constructed_objects[node] = self
         self.__from_node(loader, node)
 
+        if hooks.construct_active:
+            hooks.constructed(self, node)
+
         return self
 
+    @classmethod
+    def try_from_yaml(cls, loader, node, _rtd=None):
+        if cls.from_yaml.__func__ is not Object.from_yaml.__func__:
+            # a custom from_yaml may accept other nodes
+            return Yamlizable.try_from_yaml.__func__(cls, loader, node, _rtd)
+
+        if not isinstance(node, _yaml().MappingNode) and not (
+                node.tag == includes.INCLUDE_TAG and hasattr(loader, 'yamlize_includes')):
+            return INVALID
+
+        return cls.from_yaml(loader, node, _rtd)
+
     @classmethod
     def from_yaml_key_val(cls, loader, key_node, val_node, key_attribute, _rtd=None):
+        if val_node.tag == includes.INCLUDE_TAG and hasattr(loader, 'yamlize_includes'):
+            return includes.load(cls, loader, val_node, key_node, key_attribute)
+
         complete_inheritance = False
 
         if val_node in loader.constructed_objects:
@@ -168,18 +267,91 @@ class Object(Yamlizable, metaclass=ObjectType):
             self.__add_parent(loader, val_node)
 
         key_attribute.from_yaml(self, loader, key_node, self.__round_trip_data)
+
+        if hasattr(loader, 'yamlize_intern'):
+            key = key_attribute.get_value(self)
+            if type(key) is str:
+                # same value, already validated
+                setattr(self, key_attribute.storage_name, loader.yamlize_intern(key))
         # loader.constructed_objects[key_node] = self
         self.__round_trip_data._name_order.append(key_attribute.name)
 
         if not complete_inheritance:
             self.__from_node(loader, val_node)
         else:
-            self.__apply_defaults(key_node)
+            self.__apply_defaults(key_node, None, getattr(loader, 'yamlize_stats', None))
+
+        if hooks.construct_active:
+            hooks.constructed(self, val_node)
 
         return self
 
+    @classmethod
+    def validate_node(cls, loader, node, errors):
+        if cls.from_yaml.__func__ is not Object.from_yaml.__func__:
+            # a custom from_yaml may do anything, so the data must be constructed
+            return Yamlizable.validate_node.__func__(cls, loader, node, errors)
+
+        if not isinstance(node, _yaml().MappingNode):
+            errors.append(YamlizingError('Expected a mapping node', node))
+            return
+
+        if first_visit(loader, node):
+            cls.__validate_mapping(loader, node, errors, set())
+
+    @classmethod
+    def validate_key_val(cls, loader, key_node, val_node, key_attribute, errors):
+        key_attribute.validate_yaml(loader, key_node, errors)
+
+        if not isinstance(val_node, _yaml().MappingNode):
+            errors.append(YamlizingError('Expected a mapping node', val_node))
+            return
+
+        if first_visit(loader, val_node):
+            cls.__validate_mapping(loader, val_node, errors, {key_attribute})
+
+    @classmethod
+    def __validate_mapping(cls, loader, node, errors, previous_attrs):
+        attrs = cls.attributes
+        inherited_keys = set()
+
+        for key_node, val_node in node.value:
+            if key_node.tag == MERGE_TAG:
+                inherited_keys |= _merged_keys(loader, val_node)
+                continue
+
+            attribute = attrs.validate_yaml(cls, loader, key_node, val_node, errors)
+
+            if attribute is None:
+                continue
+
+            if attribute in previous_attrs:
+                errors.append(YamlizingError('Error parsing {}, found duplicate entry '
+                                             'for key `{}`'
+                                             .format(cls, attribute.key),
+                                             key_node))
+
+            previous_attrs.add(attribute)
+
+        missing_required_attrs = list()
+
+        for attribute in attrs:
+            if attribute in previous_attrs or attribute.key in inherited_keys:
+                continue
+
+            if attribute.is_required:
+                missing_required_attrs.append(attribute.name)
+
+        if any(missing_required_attrs):
+            errors.append(YamlizingError('Missing {} attributes without default: {}'
+                                         .format(cls, missing_required_attrs),
+                                         node))
+
     def __from_node(self, loader, node):
         attrs = self.attributes
+        # when collecting errors, recoverable errors are recorded and the next key is read
+        errors = getattr(loader, 'yamlize_errors', None)
+        stats = getattr(loader, 'yamlize_stats', None)
         # node.value is a ordered list of keys and values
         previous_attrs = set(self.__attribute_order)
         for key_node, val_node in node.value:
@@ -187,58 +359,142 @@ class Object(Yamlizable, metaclass=ObjectType):
                 self.__add_parent(loader, val_node)
                 continue
 
-            attribute = attrs.from_yaml(self, loader, key_node, val_node, self.__round_trip_data)
+            try:
+                attribute = attrs.from_yaml(self, loader, key_node, val_node,
+                                            self.__round_trip_data)
+            except YamlizingError as ee:
+                if errors is None:
+                    raise
+                errors.append(ee)
+
+                # don't also report a failed attribute as missing, Map and KeyedList items are not
+                # attributes
+                attribute = attrs.get_by_key(loader.construct_object(key_node))
+
+                if attribute is not None:
+                    previous_attrs.add(attribute)
+
+                continue
 
             if attribute is None:
                 continue
 
             if attribute in previous_attrs:
-                raise YamlizingError('Error parsing {}, found duplicate entry '
-                                     'for key `{}`'
-                                     .format(type(self), attribute.key),
-                                     key_node)
+                ee = YamlizingError('Error parsing {}, found duplicate entry '
+                                    'for key `{}`'
+                                    .format(type(self), attribute.key),
+                                    key_node)
+                if errors is None:
+                    raise ee
+                errors.append(ee)
+                continue
 
             previous_attrs.add(attribute)
             self.__round_trip_data._name_order.append(attribute.name)
 
-        self.__apply_defaults(node)
+        try:
+            if stats is None:
+                self.__apply_defaults(node, previous_attrs)
+            else:
+                stats.counts['objects'] += 1
+                stats.timed('defaults', self.__apply_defaults, node, previous_attrs, stats)
+        except YamlizingError as ee:
+            if errors is None:
+                raise
+            errors.append(ee)
 
     def __add_parent(self, loader, parent_node):
-        self.__round_trip_data._merge_parents.append(
-            _AliasLink(loader.constructed_objects[parent_node]))
+        self.__round_trip_data.add_merge_parent(
+            _AliasLink(loader.constructed_objects[parent_node],
+                       getattr(loader, 'yamlize_prototype_merges', False)))
+
+    def __prototype_link(self, attribute):
+        """
+        returns: the prototype merge link that ``attribute`` is inherited through, or None.
+        """
+        return self.__prototype_source(attribute)[0]
+
+    def __prototype_source(self, attribute):
+        """
+        returns: ``(link, ancestor)``, the prototype merge link of this object that ``attribute`` is
+        inherited through and the ancestor it is set on, or ``(None, None)``.
+        """
+        storage_name = attribute.storage_name
+        # depth first without recursion, since chains of merges can be thousands long
+        pending = [(None, self)]
+        visited = set()
+
+        while pending:
+            link, obj = pending.pop()
+
+            if obj is not self:
+                if id(obj) in visited:
+                    continue
 
-    def __apply_defaults(self, node):
-        applied_attrs = set(self.__attribute_order)
-        missing_required_attrs = self.attributes.required - applied_attrs
-        links = self.__round_trip_data._merge_parents or []
+                visited.add(id(obj))
 
-        # using a separate set allows us to inherit the last value from
-        # multiple parents
-        inherited_attrs = set()
+                if hasattr(obj, storage_name):
+                    return link, obj
 
-        for link in links:
-            # TODO: why does this happen? inherit from Dynamic?
-            lp = link.parent
-            if not hasattr(lp, 'attributes'):
+            links = obj.__round_trip_data._merge_parents
+
+            if not links or not links[0].prototype:
                 continue
 
-            for attribute in link.parent.attributes.yaml_attribute_order(
-                    link.parent, []):
-                if attribute in applied_attrs:
-                    continue
+            # pushed in order, so the last merge parent is looked at first and takes precedence,
+            # as when values are copied
+            for parent_link in links:
+                if isinstance(parent_link.parent, Object):
+                    pending.append((link or parent_link, parent_link.parent))
 
-                if link.try_set_attr(self, attribute, node):
-                    inherited_attrs.add(attribute)
+        return None, None
+
+    def _inherited_value(self, attribute):
+        """
+        returns: value of ``attribute``, which is not set on this object, from its prototype merge
+        parents, or the attribute's default.
+        """
+        ancestor = self.__prototype_source(attribute)[1]
+
+        if ancestor is None:
+            return attribute.default
+
+        return getattr(ancestor, attribute.storage_name)
+
+    def __apply_defaults(self, node, applied_attrs=None, stats=None):
+        """
+        Inherit attributes from merge parents, and check for missing required attributes.
+
+        :param stats: ``LoadStats`` of the current load, if it is being recorded.
+        """
+        if applied_attrs is None:
+            applied_attrs = set(self.__attribute_order)
+        else:
+            applied_attrs = set(applied_attrs)
+
+        links = self.__round_trip_data._merge_parents
+        prototype = bool(links) and links[0].prototype
+
+        if links and stats is not None:
+            stats.counts['merges'] += len(links)
+
+        if prototype:
+            # nothing is copied, inherited values are read through the links
+            pass
+        elif links and stats is not None:
+            applied_attrs |= stats.timed('merge', self.__inherit, links, node, applied_attrs)
+        elif links:
+            applied_attrs |= self.__inherit(links, node, applied_attrs)
 
         # now apply defaults, where available
-        applied_attrs |= inherited_attrs
         missing_required_attrs = list()
 
         for attribute in self.attributes:
             if attribute in applied_attrs:
                 continue
 
-            if attribute.is_required:
+            if attribute.is_required and not (
+                    prototype and self.__prototype_link(attribute) is not None):
                 # hold on to a running list so user doesn't need to rerun
                 # to find //each// error, but can find all of then at once
                 missing_required_attrs.append(attribute.name)
@@ -248,6 +504,30 @@ class Object(Yamlizable, metaclass=ObjectType):
                                  .format(type(self), missing_required_attrs),
                                  node)
 
+    def __inherit(self, links, node, applied_attrs):
+        """
+        returns: set of attributes set from merge parents.
+        """
+        # using a separate set allows us to inherit the last value from
+        # multiple parents
+        inherited_attrs = set()
+
+        for link in links:
+            # TODO: why does this happen? inherit from Dynamic?
+            lp = link.parent
+            if not hasattr(lp, 'attributes'):
+                continue
+
+            for attribute in link.parent.attributes.yaml_attribute_order(
+                    link.parent, []):
+                if attribute in applied_attrs:
+                    continue
+
+                if link.try_set_attr(self, attribute, node):
+                    inherited_attrs.add(attribute)
+
+        return inherited_attrs
+
     @classmethod
     def to_yaml(cls, dumper, self, _rtd=None):
         if not isinstance(self, cls):
@@ -257,8 +537,15 @@ class Object(Yamlizable, metaclass=ObjectType):
         if self in dumper.represented_objects:
             return dumper.represented_objects[self]
 
+        if self.__is_included(dumper):
+            node = dumper.represented_objects[self] = includes.dump(dumper, self)
+            return node
+
         node = self.__to_yaml(dumper)
 
+        if hooks.dump_active:
+            hooks.dumped(self, node)
+
         return node
 
     @classmethod
@@ -273,17 +560,31 @@ class Object(Yamlizable, metaclass=ObjectType):
         if self in dumper.represented_objects:
             return items[0][1], dumper.represented_objects[self]
 
+        if self.__is_included(dumper):
+            node = dumper.represented_objects[self] = includes.dump(dumper, self)
+            return items[0][1], node
+
         node = self.__to_yaml(dumper, key_attribute)
 
+        if hooks.dump_active:
+            hooks.dumped(self, node)
+
         return items[0][1], node
 
+    def __is_included(self, dumper):
+        rtd = self.__round_trip_data._rtd
+        # the file of an included object is written with its contents, not another !include
+        return rtd is not None and 'include' in rtd and \
+            getattr(dumper, 'yamlize_include_root', None) is not self
+
     def __to_yaml(self, dumper, skip_attr=None):
         represented_attrs = set([skip_attr] * (skip_attr is not None))
         parents = []
 
         node_items = []
-        node = ruamel.yaml.MappingNode(
-            ruamel.yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, node_items)
+        yaml = _yaml()
+        node = yaml.MappingNode(
+            yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG, node_items)
         self.__round_trip_data.apply(node)
         dumper.represented_objects[self] = node
 
@@ -292,6 +593,9 @@ class Object(Yamlizable, metaclass=ObjectType):
             self.__attribute_order
         )
 
+        # inherited from a prototype merge parent that is not in the document, so written here
+        unlinked_attrs = []
+
         if self.__round_trip_data._merge_parents is not None:
             actual_parents = []
 
@@ -299,8 +603,18 @@ class Object(Yamlizable, metaclass=ObjectType):
                 if merge_parent.is_parent(self, dumper, represented_attrs):
                     actual_parents.append(merge_parent)
 
+            if len(actual_parents) < len(self.__round_trip_data._merge_parents):
+                for attribute in self.attributes:
+                    if not attribute.has_default(self):
+                        continue
+
+                    link = self.__prototype_link(attribute)
+
+                    if link is not None and link not in actual_parents:
+                        unlinked_attrs.append(attribute)
+
             # this is now *an_alias_to_another_node
-            if len(actual_parents) == 1 and not any(
+            if len(actual_parents) == 1 and not unlinked_attrs and not any(
                     set(attr_order) - represented_attrs):
                 del dumper.represented_objects[self]
                 return dumper.represented_objects[merge_parent.parent]
@@ -311,6 +625,9 @@ class Object(Yamlizable, metaclass=ObjectType):
                 vn = dumper.represented_objects[merge_parent.parent]
                 node_items.append((kn, vn))
 
+        for attribute in unlinked_attrs:
+            attribute.value_to_yaml(self, dumper, node_items, self.__round_trip_data)
+
         for attribute in attr_order:
             if attribute in represented_attrs:
                 continue
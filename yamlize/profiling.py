@@ -0,0 +1,222 @@
+import functools
+import threading
+import time
+
+from .attributes import Attribute
+from .objects import Object
+from .sequences import Sequence
+from .yamlizable import Strong
+
+
+# (owner, method name, event), the methods are only replaced while a Profile is active so there is
+# no cost when not profiling
+_PROFILED_METHODS = (
+    (Object, 'from_yaml', 'construct'),
+    (Object, 'from_yaml_key_val', 'construct'),
+    (Object, 'to_yaml', 'dump'),
+    (Object, 'to_yaml_key_val', 'dump'),
+    (Sequence, 'from_yaml', 'construct'),
+    (Sequence, 'to_yaml', 'dump'),
+    (Strong, 'from_yaml', 'coerce'),
+    (Strong, 'try_from_yaml', 'coerce'),
+    (Strong, 'to_yaml', 'dump'),
+    (Attribute, 'from_yaml', 'construct'),
+    (Attribute, 'to_yaml', 'dump'),
+    (Attribute, 'ensure_type', 'coerce'),
+    (Attribute, 'validate_value', 'validate'),
+)
+
+_lock = threading.Lock()
+
+# the Profile currently recording, if any
+_active = None
+
+
+class Profile(object):
+    """
+    Call counts and cumulative time per yamlize class and per ``Attribute``.
+
+    Use through ``yamlize.profile()``. Recording is process wide: everything loaded or dumped by any
+    thread while the profile is active is included. Overrides of the profiled methods are recorded
+    too, except in classes that are defined while the profile is active.
+
+    Attributes
+    ----------
+    stats : dict
+        ``{(id(subject), event): [subject, calls, seconds]}``, where subject is a class or an
+        ``Attribute`` and event is one of ``construct``, ``coerce``, ``validate`` or ``dump``.
+    """
+
+    __slots__ = ('stats', '_depth', '_stats_lock', '_originals')
+
+    def __init__(self):
+        self.stats = {}
+        # {(id(subject), event): depth} of each thread, so concurrent loads are not mistaken for
+        # recursion
+        self._depth = threading.local()
+        self._stats_lock = threading.Lock()
+        self._originals = []
+
+    def __enter__(self):
+        global _active
+
+        with _lock:
+            if _active is not None:
+                raise RuntimeError('Another yamlize.profile() is already active')
+
+            _active = self
+
+            for base, method_name, event in _PROFILED_METHODS:
+                # overrides do not necessarily call the base method, so they are wrapped as well
+                for owner in _with_subclasses(base):
+                    original = owner.__dict__.get(method_name)
+
+                    if original is not None:
+                        self._originals.append((owner, method_name, original))
+                        type.__setattr__(owner, method_name,
+                                         self.__wrap(owner, original, event))
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _active
+
+        with _lock:
+            for owner, method_name, original in reversed(self._originals):
+                type.__setattr__(owner, method_name, original)
+
+            del self._originals[:]
+            _active = None
+
+    def __wrap(self, owner, original, event):
+        is_classmethod = isinstance(original, classmethod)
+        func = original.__func__ if is_classmethod else original
+        stats = self.stats
+        local = self._depth
+        stats_lock = self._stats_lock
+
+        @functools.wraps(func)
+        def _profiled(subject, *args, **kwargs):
+            try:
+                depth = local.depth
+            except AttributeError:
+                depth = local.depth = {}
+                local.innermost = None
+
+            # Attributes compare by value, so they are told apart by id
+            key = id(subject), event
+            innermost = local.innermost
+
+            if innermost is not None and innermost[0] == key and innermost[1] is not owner:
+                # an override calling the base method, the call is already being recorded
+                return func(subject, *args, **kwargs)
+
+            local.innermost = key, owner
+            outermost = depth.get(key, 0) == 0
+            depth[key] = depth.get(key, 0) + 1
+            start = time.perf_counter()
+
+            try:
+                return func(subject, *args, **kwargs)
+            finally:
+                local.innermost = innermost
+                depth[key] -= 1
+                elapsed = time.perf_counter() - start
+
+                with stats_lock:
+                    entry = stats.get(key)
+
+                    if entry is None:
+                        entry = stats[key] = [subject, 0, 0.0]
+
+                    entry[1] += 1
+
+                    # recursive calls (nested objects of the same class) are already in the total
+                    if outermost:
+                        entry[2] += elapsed
+
+        return classmethod(_profiled) if is_classmethod else _profiled
+
+    def as_dict(self):
+        """
+        returns: ``{name: {event: {'calls': int, 'seconds': float}}}``, where name is a class name
+        or ``'Class.attribute'``.
+        """
+        owners = _attribute_owners()
+        result = {}
+
+        for (_, event), (subject, calls, seconds) in self.stats.items():
+            if isinstance(subject, Attribute):
+                owner = owners.get(id(subject))
+                name = subject.name if owner is None else '{}.{}'.format(owner, subject.name)
+            else:
+                name = subject.__name__
+
+            events = result.setdefault(name, {})
+            previous = events.get(event, {'calls': 0, 'seconds': 0.0})
+            events[event] = {'calls': previous['calls'] + calls,
+                             'seconds': previous['seconds'] + seconds}
+
+        return result
+
+    def table(self):
+        """
+        returns: str table of the statistics, sorted by cumulative time.
+        """
+        rows = [(name, event, stat['calls'], stat['seconds'])
+                for name, events in self.as_dict().items()
+                for event, stat in events.items()]
+        rows.sort(key=lambda row: row[3], reverse=True)
+
+        width = max([len('name')] + [len(row[0]) for row in rows])
+        lines = ['{:<{w}}  {:<9}  {:>9}  {:>10}'.format('name', 'event', 'calls', 'seconds',
+                                                        w=width)]
+
+        for name, event, calls, seconds in rows:
+            lines.append('{:<{w}}  {:<9}  {:>9}  {:>10.6f}'.format(name, event, calls, seconds,
+                                                                   w=width))
+
+        return '\n'.join(lines)
+
+
+def _with_subclasses(cls):
+    """returns: list of ``cls`` and all of its subclasses, each once."""
+    result = [cls]
+    seen = {cls}
+
+    for klass in result:
+        for subclass in klass.__subclasses__():
+            if subclass not in seen:
+                seen.add(subclass)
+                result.append(subclass)
+
+    return result
+
+
+def _attribute_owners():
+    """returns: {id(Attribute): name of the class that declared it}"""
+    owners = {}
+    pending = [Object]
+
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+
+        for attribute in cls.attributes:
+            if cls.__dict__.get(attribute.name) is attribute:
+                owners.setdefault(id(attribute), cls.__name__)
+
+    return owners
+
+
+def profile():
+    """
+    Record call counts and cumulative time of yamlize construction, coercion, validation and dump.
+
+    >>> import yamlize
+    >>> with yamlize.profile() as p:
+    ...     _ = yamlize.IntList.load('[1, 2, 3]')
+    >>> p.as_dict()['IntList']['construct']['calls']
+    1
+    """
+    return Profile()
@@ -0,0 +1,502 @@
+"""
+JSONPath-like queries over yamlize objects, see ``query``.
+"""
+
+import ast
+import functools
+import re
+
+from .attributes import NODEFAULT
+from .maps import Map, KeyedList
+from .objects import Object
+from .sequences import Sequence
+from .yamlizing_error import YamlizingError
+
+
+# kinds of steps in a compiled query
+NAME = 'name'
+KEY = 'key'
+ALL = 'all'
+FILTER = 'filter'
+DESCEND = 'descend'
+
+_COMPARISONS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+_LITERAL_NAMES = {'true': True, 'false': False, 'null': None}
+
+_TOKENS = re.compile(r'''\s*(?:
+      (?P<dots>\.\.?)
+    | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    | (?P<name>[A-Za-z_][\w-]*)
+    | (?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+    | (?P<op>==|!=|<=|>=|<|>)
+    | (?P<symbol>[\[\]*?@$])
+    )''', re.VERBOSE)
+
+# a value that is not there, e.g. a missing key
+_MISSING = NODEFAULT
+
+# values that may have children
+_CONTAINERS = (Object, Sequence, list, tuple, dict)
+
+
+class _Parser(object):
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        position = 0
+
+        while position < len(text.rstrip()):
+            match = _TOKENS.match(text, position)
+
+            if match is None or match.end() == position:
+                self.error(position, 'unexpected `{}`'.format(text[position:].strip()[:1]))
+
+            kind = match.lastgroup
+            self.tokens.append((kind, match.group(kind), match.start(kind)))
+            position = match.end()
+
+        self.tokens.append((None, None, len(text)))
+        self.index = 0
+
+    def error(self, position, message):
+        raise ValueError('Invalid query `{}` at {}: {}'.format(self.text, position, message))
+
+    def peek(self, *values):
+        kind, value, _ = self.tokens[self.index]
+        return kind is not None and (kind in values or kind == 'symbol' and value in values)
+
+    def take(self, *values):
+        kind, value, position = self.tokens[self.index]
+
+        if values and not self.peek(*values):
+            expected = ' or '.join('`{}`'.format(value) for value in values)
+            self.error(position, 'expected {}, got `{}`'.format(expected, value or 'the end'))
+
+        self.index += 1
+        return value
+
+    def steps(self):
+        steps = []
+
+        if self.peek('$'):
+            self.take()
+
+        if self.peek('name', 'number', '*'):
+            steps.append(self.dotted())
+
+        while self.tokens[self.index][0] is not None:
+            if self.peek('['):
+                steps.append(self.bracket())
+            elif self.take('dots') == '..':
+                step = self.bracket() if self.peek('[') else self.dotted()
+                steps.append((DESCEND, step))
+            else:
+                steps.append(self.dotted())
+
+        return tuple(steps)
+
+    def dotted(self):
+        if self.peek('*'):
+            self.take()
+            return ALL, None
+
+        if self.peek('number'):
+            return KEY, self.literal()
+
+        return NAME, self.take('name')
+
+    def bracket(self):
+        self.take('[')
+
+        if self.peek('*'):
+            self.take()
+            step = ALL, None
+        elif self.peek('?'):
+            self.take()
+            step = FILTER, self.condition()
+        else:
+            step = KEY, self.literal()
+
+        self.take(']')
+        return step
+
+    def condition(self):
+        """returns: (names and keys of the compared value within the item, operator, literal)"""
+        names = []
+
+        if self.peek('@'):
+            self.take()
+        else:
+            names.append(self.take('name'))
+
+        while self.peek('dots', '['):
+            kind, value, position = self.tokens[self.index]
+            self.take()
+
+            if value == '[':
+                names.append(self.literal())
+                self.take(']')
+            elif value == '.':
+                names.append(self.take('name'))
+            else:
+                self.error(position, 'filters cannot search descendants')
+
+        if not self.peek('op'):
+            return tuple(names), None, None
+
+        return tuple(names), self.take('op'), self.literal()
+
+    def literal(self):
+        kind, value, position = self.tokens[self.index]
+
+        if kind == 'string' or kind == 'number':
+            self.take()
+            return ast.literal_eval(value)
+
+        if kind == 'name' and value in _LITERAL_NAMES:
+            self.take()
+            return _LITERAL_NAMES[value]
+
+        self.error(position, 'expected a string, number, true, false or null, got `{}`'
+                   .format(value or 'the end'))
+
+
+@functools.lru_cache(maxsize=256)
+def compile_query(text):
+    """
+    returns: tuple of the steps of the query ``text``, which ``query`` accepts instead of ``text``.
+
+    raises: ValueError if ``text`` is not a valid query.
+    """
+    return _Parser(text).steps()
+
+
+def _attribute_value(obj, attribute):
+    try:
+        return attribute.get_value(obj)
+    except YamlizingError:
+        # not set, and no default
+        return _MISSING
+
+
+def _named_children(value):
+    """returns: list of (name or key, child) of ``value``, in document order"""
+    if isinstance(value, Object):
+        children = []
+
+        for attribute in value.attributes:
+            child = _attribute_value(value, attribute)
+
+            if child is not _MISSING:
+                children.append((attribute.name, child))
+
+        if isinstance(value, (Map, KeyedList)):
+            children.extend(value.items())
+
+        return children
+
+    if isinstance(value, (Sequence, list, tuple)):
+        return list(enumerate(value))
+
+    if isinstance(value, dict):
+        return list(value.items())
+
+    return []
+
+
+def _names(value):
+    """returns: list of the str names and keys that ``_child`` finds children of ``value`` by"""
+    if isinstance(value, Object):
+        names = []
+
+        for attribute in value.attributes:
+            names.append(attribute.name)
+
+            if isinstance(attribute.key, str):
+                names.append(attribute.key)
+
+        if isinstance(value, (Map, KeyedList)):
+            names.extend(key for key in value.keys() if isinstance(key, str))
+
+        return list(dict.fromkeys(names))
+
+    if isinstance(value, dict):
+        return [key for key in value if isinstance(key, str)]
+
+    return []
+
+
+def _child(value, key):
+    """returns: the attribute or item ``key`` of ``value``, or _MISSING"""
+    if isinstance(value, Object):
+        attributes = value.attributes
+        attribute = attributes.by_name.get(key) or attributes.by_key.get(key)
+
+        if attribute is not None:
+            return _attribute_value(value, attribute)
+
+        if isinstance(value, (Map, KeyedList)):
+            return value.get(key, _MISSING)
+
+        return _MISSING
+
+    if isinstance(value, (Sequence, list, tuple)):
+        if isinstance(key, int) and -len(value) <= key < len(value):
+            return value[key]
+
+        return _MISSING
+
+    if isinstance(value, dict):
+        try:
+            return value.get(key, _MISSING)
+        except TypeError:
+            # unhashable key
+            return _MISSING
+
+    return _MISSING
+
+
+def _walk(value, children):
+    """
+    returns: list of ``value`` and its descendants, found with ``children``, each once (aliases and
+    recursion are not followed again), in document order.
+    """
+    walked = []
+    visited = set()
+    pending = [value]
+
+    while pending:
+        value = pending.pop()
+
+        if isinstance(value, _CONTAINERS):
+            if id(value) in visited:
+                continue
+
+            visited.add(id(value))
+
+        walked.append(value)
+        pending.extend(reversed([child for _, child in children(value)]))
+
+    return walked
+
+
+def _matches(value, condition):
+    names, op, literal = condition
+
+    for name in names:
+        value = _child(value, name)
+
+        if value is _MISSING:
+            return False
+
+    if op is None:
+        return True
+
+    try:
+        return bool(_COMPARISONS[op](value, literal))
+    except Exception:
+        # e.g. comparing a str to an int
+        return False
+
+
+class QueryIndex(object):
+    """
+    The children of every object of a graph, walked once, so that repeated queries of the graph do
+    not walk it again. Descendant (``..name``) queries of the root are looked up by attribute name,
+    YAML key or item key, and items that match an ``==`` filter are looked up by value.
+
+    The index is a snapshot, so create a new one after changing the objects.
+
+    >>> import yamlize
+    >>> class Numbers(yamlize.Map):
+    ...     pass
+    >>> numbers = Numbers.load(u'odd: [1, 3]\\neven: {two: 2, four: [4]}')
+    >>> index = yamlize.QueryIndex(numbers)
+    >>> index.query('..four[0]')
+    [4]
+    >>> index.query('*[?@ > 1]')
+    [3, 2]
+
+    Attributes
+    ----------
+    root : Yamlizable
+        the object that was indexed.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        # {id(value): (value, [(name or key, child)])}, the value is kept so its id is not reused
+        self.__children = {}
+        # {name or YAML key: [children found by it]} of the root and its descendants
+        self.__named = {}
+        # {(id(value), names): ({compared value: [positions]}, [(position, unhashable value)])}
+        self.__filters = {}
+
+        for value in _walk(root, self.children):
+            for name in _names(value):
+                child = _child(value, name)
+
+                if child is not _MISSING:
+                    self.__named.setdefault(name, []).append(child)
+
+    def children(self, value):
+        """returns: list of (name or key, child) of ``value``, in document order"""
+        if not isinstance(value, _CONTAINERS):
+            return []
+
+        entry = self.__children.get(id(value))
+
+        if entry is None:
+            # computing the same children twice is harmless, so this needs no lock
+            entry = self.__children[id(value)] = value, _named_children(value)
+
+        return entry[1]
+
+    def query(self, path):
+        """returns: list of the values of the root that match ``path``, see ``yamlize.query``"""
+        return query(self.root, path, self)
+
+    def _descend(self, value, step):
+        kind, arg = step
+
+        if kind == NAME and value is self.root:
+            return self.__named.get(arg, [])
+
+        return _apply(step, _walk(value, self.children), self)
+
+    def _filter(self, value, condition):
+        names, op, literal = condition
+
+        if op != '==':
+            return [child for _, child in self.children(value) if _matches(child, condition)]
+
+        children = self.children(value)
+        table = self.__filters.get((id(value), names))
+
+        if table is None:
+            by_value = {}
+            unhashable = []
+
+            for position, (_, child) in enumerate(children):
+                compared = child
+
+                for name in names:
+                    compared = _child(compared, name)
+
+                    if compared is _MISSING:
+                        break
+
+                if compared is _MISSING:
+                    continue
+
+                try:
+                    by_value.setdefault(compared, []).append(position)
+                except TypeError:
+                    unhashable.append((position, compared))
+
+            table = self.__filters[(id(value), names)] = by_value, unhashable
+
+        by_value, unhashable = table
+
+        try:
+            positions = list(by_value.get(literal, ()))
+        except TypeError:
+            positions = []
+
+        if unhashable:
+            positions.extend(position for position, compared in unhashable
+                             if _matches(compared, ((), '==', literal)))
+            positions.sort()
+
+        return [children[position][1] for position in positions]
+
+
+def _apply(step, values, index):
+    kind, arg = step
+    result = []
+
+    for value in values:
+        if kind == NAME or kind == KEY:
+            child = _child(value, arg)
+
+            if child is not _MISSING:
+                result.append(child)
+        elif kind == ALL:
+            result.extend(child for _, child in index.children(value))
+        elif kind == FILTER:
+            result.extend(index._filter(value, arg))
+        else:
+            result.extend(index._descend(value, arg))
+
+    return result
+
+
+def query(obj, path, index=None):
+    """
+    Select values from a yamlize object graph with a JSONPath-like ``path``:
+
+    - ``name`` or ``.name``: the attribute with that name or YAML key, or the ``Map`` or
+      ``KeyedList`` item with that key.
+    - ``['key']`` or ``[3]``: the item with that key, or the ``Sequence`` item at that index.
+    - ``*`` or ``[*]``: every attribute value and item.
+    - ``[?name.other == 'value']``: the items whose ``name.other`` compares to the value (a quoted
+      string, a number, ``true``, ``false`` or ``null``) with ``==``, ``!=``, ``<``, ``<=``, ``>``
+      or ``>=``. ``@`` is the item itself, and without a comparison items that have ``name.other``
+      match.
+    - ``..name``: ``name`` of the object and each of its descendants.
+
+    Attributes that are not set and have no default, and missing keys, are skipped. Pass a
+    ``QueryIndex`` of ``obj`` to reuse the children it found for repeated queries.
+
+    >>> import yamlize
+    >>> class Services(yamlize.Map):
+    ...     pass
+    >>> services = Services.load(u'''
+    ... web:
+    ...   ports: [{port: 80, protocol: tcp}, {port: 53, protocol: udp}]
+    ... db:
+    ...   ports: [{port: 5432, protocol: tcp}]
+    ... ''')
+    >>> yamlize.query(services, '*.ports[?protocol == "tcp"].port')
+    [80, 5432]
+
+    returns: list of the matching values, in document order.
+    """
+    if index is None:
+        index = _NO_INDEX
+
+    values = [obj]
+    steps = compile_query(path) if isinstance(path, str) else path
+
+    for step in steps:
+        values = _apply(step, values, index)
+
+    return values
+
+
+class _NoIndex(object):
+    """Finds children and matches on demand, for queries without a ``QueryIndex``."""
+
+    @staticmethod
+    def children(value):
+        return _named_children(value)
+
+    @staticmethod
+    def _filter(value, condition):
+        return [child for _, child in _named_children(value) if _matches(child, condition)]
+
+    @staticmethod
+    def _descend(value, step):
+        return _apply(step, _walk(value, _named_children), _NO_INDEX)
+
+
+_NO_INDEX = _NoIndex()
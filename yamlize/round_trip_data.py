@@ -9,35 +9,74 @@ class _AnchorNode(object):
         self.value = value
 
 
+# node attributes that are worth retaining, anything else is recreated by the representer
+_ROUND_TRIP_ATTRS = ('anchor', 'comment', 'flow_style', 'style', 'tag')
+
+# falsy values of these are still meaningful
+_STYLE_ATTRS = ('flow_style', 'style')
+
+# tags in this namespace are implied by the type of the data being represented
+_DEFAULT_TAG_PREFIX = u'tag:yaml.org,2002:'
+
+
+class _MapKey(object):
+    """Position of the keys of a Map, which are unique so they are told apart by value."""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<map key>'
+
+
+MAP_KEY = _MapKey()
+
+
 class RoundTripData(object):
+    """
+    Round trip data (anchor, comments, style) for a ``Yamlizable`` object, and a side table for
+    the data of its scalar children.
+
+    Children are stored by position within the container (an attribute key, a ``Map`` key, or a
+    ``Sequence`` index) and by value, so equal scalars in different positions do not collide.
+    While loading, containers set ``position`` before converting each child; while dumping they pass
+    ``at(position)`` instead, since a shared object may be dumped by several threads at once. Only
+    nodes that actually carry round trip data are stored, and lookups of anything else return a
+    shared, empty instance.
+    """
 
     __slots__ = ('_rtd', '_kids_rtd', '_name_order', '_merge_parents',
-                 '_complete_inheritance')  # couldn't use private variables with six
+                 '_complete_inheritance', 'position')  # couldn't use private variables with six
 
     def __init__(self, node):
-        self._rtd = {}
-        self._kids_rtd = {}
+        self._rtd = None
+        self._kids_rtd = None
         self._name_order = []
-        self._merge_parents = []
+        self._merge_parents = ()
         self._complete_inheritance = False
+        self.position = None
 
         if node is not None:
-            for key in dir(node):
-                if key.startswith('__') or key in {'value', 'id', 'start_mark', 'end_mark'}:
-                    continue
+            for key in _ROUND_TRIP_ATTRS:
+                attr = getattr(node, key, None)
 
-                attr = getattr(node, key)
+                if attr is None or not (attr or key in _STYLE_ATTRS):
+                    # an empty comment or anchor, but block style (flow_style=False) is kept since
+                    # comments after a block mapping key are only dumped for block style
+                    continue
 
-                if callable(attr) or attr is None:
+                if key == 'tag' and attr.startswith(_DEFAULT_TAG_PREFIX):
                     continue
 
+                if self._rtd is None:
+                    self._rtd = {}
+
                 self._rtd[key] = attr
 
     def __str__(self):
         msg = 'RoundTripData:'
         msg += '\n    name_order: {}'.format(', '.join(self._name_order))
         msg += '\n    rtd: {{{}}}'.format(', '.join('{}: {}'.format(k, v)
-                                                    for k, v in self._rtd.items()))
+                                                    for k, v in (self._rtd or {}).items()))
         return msg
 
     def __reduce__(self):
@@ -49,27 +88,77 @@ class RoundTripData(object):
         return (RoundTripData, (None,))
 
     def __bool__(self):
-        return len(self._rtd) > 0
+        return self._rtd is not None
 
     __nonzero__ = __bool__
 
     def apply(self, node):
+        if self._rtd is None:
+            return
+
         for key, val in self._rtd.items():
             if key == 'anchor':
                 val = _AnchorNode(val)
+            elif key == 'include':
+                # where the object was included from, see yamlize.includes
+                continue
             setattr(node, key, val)
 
-    def __get_key(self, key):
-        try:
-            return hash(key)
-        except TypeError:
-            return type(key), id(key)
+    def add_merge_parent(self, link):
+        self._merge_parents += (link,)
 
-    def __setitem__(self, key, rtd):
+    def at(self, position):
+        """
+        returns: the round trip data of the children at ``position``, without changing
+        ``self.position``.
+        """
+        return _Positioned(self, position)
+
+    def set_child(self, position, key, rtd):
         # don't bother storing if there wasn't any data
         if rtd:
-            self._kids_rtd[self.__get_key(key)] = rtd
+            if self._kids_rtd is None:
+                self._kids_rtd = {}
+
+            self._kids_rtd[_child_key(position, key)] = rtd
+
+    def get_child(self, position, key):
+        if self._kids_rtd is None:
+            return _EMPTY
+
+        return self._kids_rtd.get(_child_key(position, key), _EMPTY)
+
+    def __setitem__(self, key, rtd):
+        self.set_child(self.position, key, rtd)
 
     def __getitem__(self, key):
-        return self._kids_rtd.get(self.__get_key(key), RoundTripData(None))
+        return self.get_child(self.position, key)
+
+
+def _child_key(position, key):
+    try:
+        return position, hash(key)
+    except TypeError:
+        return position, type(key), id(key)
+
+
+class _Positioned(object):
+    """
+    The children of a ``RoundTripData`` at a single position, see ``RoundTripData.at``.
+    """
+
+    __slots__ = ('rtd', 'position')
+
+    def __init__(self, rtd, position):
+        self.rtd = rtd
+        self.position = position
+
+    def __setitem__(self, key, rtd):
+        self.rtd.set_child(self.position, key, rtd)
+
+    def __getitem__(self, key):
+        return self.rtd.get_child(self.position, key)
+
 
+# returned for lookups of children without round trip data, it is never modified
+_EMPTY = RoundTripData(None)
@@ -0,0 +1,338 @@
+"""
+Create yamlize classes from a schema document.
+
+A schema is a YAML (or JSON) mapping of class names to class descriptions. ``kind`` is one of
+``object`` (the default), ``map``, ``keyed_list`` or ``sequence``, and types are either ``str``,
+``int``, ``float``, ``bool``, ``any``, one of ``IntList``, ``FloatList`` and ``StrList``, or the
+name of another class in the schema. An attribute is described by its type, or by a mapping of
+``type``, ``key``, ``default``, ``doc`` and ``intern``.
+
+>>> import yamlize
+>>> classes = yamlize.classes_from_schema(u'''
+... Part:
+...   attributes:
+...     name: str
+...     mass: {type: float, default: 0.0}
+... Parts:
+...   kind: keyed_list
+...   key_attr: name
+...   item_type: Part
+... ''')
+>>> parts = classes['Parts'].load(u'wheel: {mass: 2.5}')
+>>> parts['wheel'].mass
+2.5
+"""
+
+import hashlib
+import json
+import keyword
+import math
+import sys
+import threading
+import types
+
+
+KINDS = ('object', 'map', 'keyed_list', 'sequence')
+
+# the fields of each kind of class, after ``kind``
+_FIELDS = {
+    'object': ('attributes', 'slots', 'doc'),
+    'map': ('attributes', 'key_type', 'value_type', 'doc'),
+    'keyed_list': ('attributes', 'key_attr', 'item_type', 'doc'),
+    'sequence': ('item_type', 'doc'),
+}
+
+_BASES = {
+    'object': 'yamlize.Object',
+    'map': 'yamlize.Map',
+    'keyed_list': 'yamlize.KeyedList',
+    'sequence': 'yamlize.Sequence',
+}
+
+_ATTRIBUTE_FIELDS = ('type', 'key', 'default', 'doc', 'intern')
+
+_BUILTIN_TYPES = ('str', 'int', 'float', 'bool')
+
+_YAMLIZE_TYPES = ('IntList', 'FloatList', 'StrList')
+
+# names the generated module uses, and the type names of the schema itself
+_RESERVED_NAMES = frozenset(('yamlize', 'SCHEMA_FINGERPRINT', 'any', *_BUILTIN_TYPES,
+                            *_YAMLIZE_TYPES))
+
+# the generated classes are defined in a module of this name and the schema fingerprint
+_MODULE_PREFIX = 'yamlize_schema_'
+
+# {fingerprint: {class name: class}}
+_cache = {}
+
+_lock = threading.Lock()
+
+
+def _error(message, *args):
+    from .yamlizing_error import YamlizingError
+    return YamlizingError('Invalid schema, ' + message.format(*args))
+
+
+def _read(schema):
+    """returns: (dict schema, str fingerprint)"""
+    if not isinstance(schema, dict):
+        import ruamel.yaml
+        schema = ruamel.yaml.YAML(typ='safe', pure=True).load(schema)
+
+    if not isinstance(schema, dict) or not schema:
+        raise _error('expected a mapping of class names to classes')
+
+    canonical = json.dumps(schema, sort_keys=True, separators=(',', ':'), default=repr)
+    return schema, hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _literal(value):
+    """returns: Python source for a YAML value"""
+    if isinstance(value, float) and not math.isfinite(value):
+        return "float('{}')".format(value)
+    elif isinstance(value, list):
+        return '[{}]'.format(', '.join(_literal(item) for item in value))
+    elif isinstance(value, dict):
+        return '{{{}}}'.format(', '.join('{}: {}'.format(_literal(key), _literal(item))
+                                         for key, item in value.items()))
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        return repr(value)
+
+    raise _error('unsupported value `{!r}`', value)
+
+
+class _SourceWriter(object):
+    """Writes the classes of a schema as Python source, each class after the classes it uses."""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.lines = []
+        self.deferred = []
+        self.written = set()
+        self.in_progress = set()
+
+        for name, description in schema.items():
+            if not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name):
+                raise _error('class name `{}` is not a Python identifier', name)
+
+            if name in _RESERVED_NAMES or name.startswith('__'):
+                raise _error('class name `{}` is reserved', name)
+
+            if not isinstance(description, dict):
+                raise _error('class `{}` is not a mapping', name)
+
+            kind = description.get('kind', 'object')
+
+            if kind not in KINDS:
+                raise _error('class `{}` has unknown kind `{}`, expected one of {}', name, kind,
+                             KINDS)
+
+            for field in description:
+                if field != 'kind' and field not in _FIELDS[kind]:
+                    raise _error('class `{}` has unknown field `{}`', name, field)
+
+    def write(self):
+        for name in self.schema:
+            self.__write_class(name)
+
+    def __type(self, type_name, owner):
+        """
+        returns: source of the type, or None when it is a class of the schema that cannot be
+        written yet.
+        """
+        if type_name in (None, 'any'):
+            return 'yamlize.Dynamic'
+        elif type_name in _BUILTIN_TYPES:
+            return type_name
+        elif type_name in _YAMLIZE_TYPES:
+            return 'yamlize.' + type_name
+        elif type_name not in self.schema:
+            raise _error('class `{}` uses unknown type `{}`', owner, type_name)
+        elif self.__write_class(type_name):
+            return type_name
+
+        return None
+
+    def __write_class(self, name):
+        """returns: True once the class has been written, False if it has to wait"""
+        if name in self.written:
+            return True
+        elif name in self.in_progress:
+            return False
+
+        self.in_progress.add(name)
+
+        try:
+            return self.__write_new_class(name)
+        finally:
+            self.in_progress.discard(name)
+
+    def __write_new_class(self, name):
+        description = self.schema[name]
+        kind = description.get('kind', 'object')
+        body = []
+        late = []
+
+        if kind == 'keyed_list':
+            # key_attr is an attribute of the item class, which must already exist
+            item_type = description.get('item_type')
+            item_description = self.schema.get(item_type)
+            key_attr = description.get('key_attr')
+
+            if not isinstance(item_description, dict) or \
+                    item_description.get('kind', 'object') != 'object':
+                raise _error('keyed_list `{}` needs an object item_type', name)
+
+            if key_attr not in (item_description.get('attributes') or {}):
+                raise _error('keyed_list `{}` key_attr `{}` is not an attribute of `{}`', name,
+                             key_attr, item_type)
+
+            if not self.__write_class(item_type):
+                return False
+
+            body.append('key_attr = {}.{}'.format(item_type, key_attr))
+            body.append('item_type = {}'.format(item_type))
+
+        for field in ('key_type', 'value_type', 'item_type'):
+            if field not in description or kind == 'keyed_list':
+                continue
+
+            type_source = self.__type(description[field], name)
+
+            if type_source is None:
+                late.append('{}.{} = {}'.format(name, field, description[field]))
+            elif description[field] in _BUILTIN_TYPES:
+                body.append('{} = yamlize.Typed({})'.format(field, type_source))
+            else:
+                body.append('{} = {}'.format(field, type_source))
+
+        attributes = description.get('attributes') or {}
+
+        if not isinstance(attributes, dict):
+            raise _error('attributes of `{}` are not a mapping', name)
+
+        for attr_name, attr_description in attributes.items():
+            if not isinstance(attr_name, str) or not attr_name.isidentifier() or \
+                    keyword.iskeyword(attr_name):
+                raise _error('attribute name `{}` of `{}` is not a Python identifier', attr_name,
+                             name)
+
+            arguments = self.__attribute_arguments(name, attr_name, attr_description)
+
+            if arguments is None:
+                arguments = self.__attribute_arguments(name, attr_name, attr_description, True)
+                late.append('{}.{} = yamlize.Attribute(name={!r}, {})'.format(
+                    name, attr_name, attr_name, arguments))
+            else:
+                body.append('{} = yamlize.Attribute({})'.format(attr_name, arguments))
+
+        slots = description.get('slots', False)
+
+        if slots and late:
+            # attributes added after the class is created need their storage declared up front
+            body.insert(0, '__slots__ = {!r}'.format(
+                tuple('_yamlized_' + attr_name for attr_name in attributes)))
+
+        if 'doc' in description:
+            body.insert(0, repr(str(description['doc'])))
+
+        self.lines.extend(['', '', 'class {}({}{}):'.format(
+            name, _BASES[kind], ', slots=True' if slots else '')])
+        self.lines.extend('    ' + line for line in body or ['pass'])
+        self.deferred.extend(late)
+        self.written.add(name)
+        return True
+
+    def __attribute_arguments(self, owner, attr_name, description, late=False):
+        """returns: str arguments of the Attribute, or None when its type cannot be written yet"""
+        if not isinstance(description, dict):
+            description = {'type': description}
+
+        for field in description:
+            if field not in _ATTRIBUTE_FIELDS:
+                raise _error('attribute `{}.{}` has unknown field `{}`', owner, attr_name, field)
+
+        type_name = description.get('type')
+
+        if late:
+            type_source = type_name
+        else:
+            type_source = self.__type(type_name, owner)
+
+            if type_source is None:
+                return None
+
+        arguments = []
+
+        if type_source != 'yamlize.Dynamic':
+            arguments.append('type={}'.format(type_source))
+
+        for field in _ATTRIBUTE_FIELDS[1:]:
+            if field in description:
+                arguments.append('{}={}'.format(field, _literal(description[field])))
+
+        return ', '.join(arguments)
+
+
+def _source(schema, fingerprint):
+    lines = [
+        '"""',
+        'yamlize classes generated by yamlize.schema_source, do not edit.',
+        '"""',
+        '',
+        'import yamlize',
+        '',
+        '',
+        'SCHEMA_FINGERPRINT = {!r}'.format(fingerprint),
+    ]
+    writer = _SourceWriter(schema)
+    writer.write()
+    lines.extend(writer.lines)
+
+    if writer.deferred:
+        # attributes and types that refer to a class defined after them
+        lines.extend(['', ''] + writer.deferred)
+
+    return '\n'.join(lines) + '\n'
+
+
+def schema_source(schema):
+    """
+    Python source of a module defining the classes of ``schema``, which may be saved and imported
+    instead of creating the classes from the schema each time.
+
+    ``schema`` may be a YAML or JSON string or stream, or a ``dict``.
+
+    returns: str
+    """
+    return _source(*_read(schema))
+
+
+def classes_from_schema(schema):
+    """
+    Create the classes of ``schema``, which may be a YAML or JSON string or stream, or a ``dict``.
+
+    Classes are cached by the contents of the schema, so the same schema always returns the same
+    classes. They are defined in a module named after the schema's fingerprint, which is added to
+    ``sys.modules``, so their instances can be pickled. Unpickling them in another process requires
+    creating the classes from the same schema there first.
+
+    returns: dict of ``{class name: class}``, in the order of the schema.
+    """
+    schema, fingerprint = _read(schema)
+    classes = _cache.get(fingerprint)
+
+    if classes is None:
+        with _lock:
+            classes = _cache.get(fingerprint)
+
+            if classes is None:
+                # the same source schema_source returns, so both always define the same classes
+                source = _source(schema, fingerprint)
+                module = types.ModuleType(_MODULE_PREFIX + fingerprint[:32])
+                exec(compile(source, '<yamlize schema>', 'exec'), module.__dict__)
+                sys.modules[module.__name__] = module
+                classes = {name: getattr(module, name) for name in schema}
+                _cache[fingerprint] = classes
+
+    return dict(classes)
@@ -1,7 +1,7 @@
-import ruamel.yaml
-
+from . import hooks
+from . import includes
 from .round_trip_data import RoundTripData
-from .yamlizable import Yamlizable, Dynamic, Typed
+from .yamlizable import Yamlizable, Dynamic, Typed, INVALID, first_visit, _yaml
 from .yamlizing_error import YamlizingError
 
 
@@ -102,7 +102,10 @@ class Sequence(Yamlizable):
 
     @classmethod
     def from_yaml(cls, loader, node, _rtd=None):
-        if not isinstance(node, ruamel.yaml.SequenceNode):
+        if not isinstance(node, _yaml().SequenceNode):
+            if node.tag == includes.INCLUDE_TAG and hasattr(loader, 'yamlize_includes'):
+                return includes.load(cls, loader, node)
+
             raise YamlizingError('Expected a SequenceNode', node)
 
         if node in loader.constructed_objects:
@@ -112,13 +115,54 @@ class Sequence(Yamlizable):
         self.__round_trip_data = RoundTripData(node)
         loader.constructed_objects[node] = self
 
+        # when collecting errors, recoverable errors are recorded and the next item is read
+        errors = getattr(loader, 'yamlize_errors', None)
+
         # node.value list of values
-        for item_node in node.value:
-            value = cls.item_type.from_yaml(loader, item_node, self.__round_trip_data)
+        for index, item_node in enumerate(node.value):
+            self.__round_trip_data.position = index
+
+            try:
+                value = cls.item_type.from_yaml(loader, item_node, self.__round_trip_data)
+            except YamlizingError as ee:
+                if errors is None:
+                    raise
+                errors.append(ee)
+                continue
+
             self.append(value)
 
+        if hooks.construct_active:
+            hooks.constructed(self, node)
+
         return self
 
+    @classmethod
+    def try_from_yaml(cls, loader, node, _rtd=None):
+        if cls.from_yaml.__func__ is not Sequence.from_yaml.__func__:
+            # a custom from_yaml may accept other nodes
+            return Yamlizable.try_from_yaml.__func__(cls, loader, node, _rtd)
+
+        if not isinstance(node, _yaml().SequenceNode) and not (
+                node.tag == includes.INCLUDE_TAG and hasattr(loader, 'yamlize_includes')):
+            return INVALID
+
+        return cls.from_yaml(loader, node, _rtd)
+
+    @classmethod
+    def validate_node(cls, loader, node, errors):
+        if cls.from_yaml.__func__ is not Sequence.from_yaml.__func__:
+            # a custom from_yaml may do anything, so the data must be constructed
+            return Yamlizable.validate_node.__func__(cls, loader, node, errors)
+
+        if not isinstance(node, _yaml().SequenceNode):
+            errors.append(YamlizingError('Expected a SequenceNode', node))
+            return
+
+        if first_visit(loader, node):
+            for item_node in node.value:
+                cls.item_type.validate_node(loader, item_node, errors)
+
     @classmethod
     def to_yaml(cls, dumper, self, _rtd=None):
         # grab the id of the item before we try anything else, that way we can
@@ -135,16 +179,27 @@ class Sequence(Yamlizable):
         if self_id in dumper.represented_objects:
             return dumper.represented_objects[self_id]
 
+        rtd = self.__round_trip_data._rtd
+
+        if rtd is not None and 'include' in rtd and \
+                getattr(dumper, 'yamlize_include_root', None) is not self:
+            node = dumper.represented_objects[self_id] = includes.dump(dumper, self)
+            return node
+
         items = []
-        node = ruamel.yaml.SequenceNode(
-            ruamel.yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, items)
+        yaml = _yaml()
+        node = yaml.SequenceNode(
+            yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, items)
         self.__round_trip_data.apply(node)
         dumper.represented_objects[self_id] = node
 
-        for item in self:
-            item_node = self.item_type.to_yaml(dumper, item, self.__round_trip_data)
+        for index, item in enumerate(self):
+            item_node = self.item_type.to_yaml(dumper, item, self.__round_trip_data.at(index))
             items.append(item_node)
 
+        if hooks.dump_active:
+            hooks.dumped(self, node)
+
         return node
 
 
@@ -0,0 +1,139 @@
+import threading
+
+
+class Session(object):
+    """
+    Reuses a ruamel.yaml loader and dumper across ``load``, ``validate`` and ``dump`` calls, instead
+    of creating new ones for every call.
+
+    Each thread has its own loaders and dumpers, so a session may be shared between threads. A call
+    made while the thread's loader is in use, e.g. a ``load`` from within a ``from_yaml``, uses a
+    second loader, which is then kept for the next nested call. As with ``Yamlizable.load`` and
+    ``Yamlizable.dump``, the ``Loader`` and ``Dumper`` are created with the stream as their only
+    argument.
+
+    >>> import yamlize
+    >>> session = yamlize.Session()
+    >>> session.load(yamlize.IntList, '[1, 2]')
+    [1, 2]
+    >>> session.dump(yamlize.IntList, session.load(yamlize.IntList, '[3, 4]'))
+    '[3, 4]\\n'
+
+    Attributes
+    ----------
+    Loader : type
+        ruamel.yaml loader class, by default ``RoundTripLoader``.
+    Dumper : type
+        ruamel.yaml dumper class, by default ``RoundTripDumper``.
+    """
+
+    __slots__ = ('Loader', 'Dumper', '__local')
+
+    def __init__(self, Loader=None, Dumper=None):
+        import ruamel.yaml
+
+        self.Loader = Loader or ruamel.yaml.RoundTripLoader
+        self.Dumper = Dumper or ruamel.yaml.RoundTripDumper
+        self.__local = threading.local()
+
+    def load(self, cls, stream, **kwargs):
+        """
+        Same as ``cls.load(stream, **kwargs)``.
+        """
+        pool, used, Loader = self.__checkout('loaders', self.Loader, _reset_loader)
+
+        try:
+            return cls.load(stream, Loader=Loader, **kwargs)
+        finally:
+            self.__checkin(pool, used)
+
+    def validate(self, cls, stream):
+        """
+        Same as ``cls.validate(stream)``.
+        """
+        pool, used, Loader = self.__checkout('loaders', self.Loader, _reset_loader)
+
+        try:
+            return cls.validate(stream, Loader=Loader)
+        finally:
+            self.__checkin(pool, used)
+
+    def dump(self, cls, data, stream=None):
+        """
+        Same as ``cls.dump(data, stream)``.
+        """
+        pool, used, Dumper = self.__checkout('dumpers', self.Dumper, _reset_dumper)
+
+        try:
+            return cls.dump(data, stream, Dumper=Dumper)
+        finally:
+            self.__checkin(pool, used)
+
+    def __checkout(self, pool_name, factory, reset):
+        """
+        returns: (pool, used, create), where ``create(stream)`` takes an idle instance from the
+        thread's pool (or creates one) and records it in ``used``.
+        """
+        pool = getattr(self.__local, pool_name, None)
+
+        if pool is None:
+            pool = []
+            setattr(self.__local, pool_name, pool)
+
+        used = []
+
+        def create(stream):
+            if pool:
+                instance = pool.pop()
+                reset(instance, stream)
+            else:
+                instance = factory(stream)
+
+            used.append(instance)
+            return instance
+
+        return pool, used, create
+
+    @staticmethod
+    def __checkin(pool, used):
+        # a loader instrumented with LoadStats has wrapped methods, so it is not reused
+        pool.extend(instance for instance in used if 'yamlize_stats' not in vars(instance))
+
+
+def _reset_loader(loader, stream):
+    """
+    Return ``loader`` to the state of a new loader of ``stream``. Only the resolver's cache of
+    implicit resolvers per YAML version, which does not depend on the document, is kept.
+    """
+    # Yamlizable.load disposes of the parser, but a failed load may leave any component mid-document
+    loader.dispose()
+    loader.reset_reader()
+    loader.reset_scanner()
+    # set by a %YAML directive, and would otherwise apply to the following documents
+    loader.yaml_version = None
+    loader.first_time = False
+    loader.reset_parser()
+    loader.anchors = {}
+    loader.constructed_objects = {}
+    loader.recursive_objects = {}
+    loader.state_generators = []
+    loader.deep_construct = False
+    loader.resolver_exact_paths = []
+    loader.resolver_prefix_paths = []
+
+    for attr_name in [name for name in vars(loader) if name.startswith('yamlize_')]:
+        delattr(loader, attr_name)
+
+    loader.stream = stream
+
+
+def _reset_dumper(dumper, stream):
+    """Return ``dumper`` to the state of a new dumper of ``stream``."""
+    from ruamel.yaml.emitter import Emitter
+    from ruamel.yaml.serializer import Serializer
+
+    Emitter.__init__(dumper, stream, dumper=dumper)
+    Serializer.__init__(dumper, dumper=dumper)
+    dumper.represented_objects = {}
+    dumper.object_keeper = []
+    dumper.alias_key = None
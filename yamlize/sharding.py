@@ -0,0 +1,398 @@
+"""
+Writing and reading a large ``Map`` or ``KeyedList`` as several files, see ``dump_sharded``.
+
+A sharded document is a directory with ``index.yaml`` and a subdirectory with one file per shard.
+Each shard is a document of the same class, holding some of the items, so it can also be loaded on
+its own. The index lists the shard files, and the order of the items as runs of ``shard*count``.
+Each dump writes its shards to a new subdirectory before replacing the index, so an interrupted dump
+leaves the previous index and shards in place.
+
+With ``processes`` above 1, shards are written and read in worker processes forked from the current
+one. Forked workers see the objects to dump without pickling them, and hash strings like this
+process does, so the round trip data of the objects they load is still valid here. The loaded
+objects are pickled back, so their classes must be importable by name: classes defined in functions
+are loaded in this process instead. Forking while other
+threads run can deadlock the workers, so then everything is done in this process too.
+"""
+
+import copyreg
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import zlib
+
+from .attributes import Attribute
+from .maps import Map, KeyedList
+from .objects import Object, _AliasLink
+from .round_trip_data import RoundTripData
+from .sequences import Sequence, StrList
+from .yamlizing_error import YamlizingError
+
+
+INDEX = 'index.yaml'
+
+SHARD_NAME = 'shard-{:04d}.yaml'
+
+# prefix of the subdirectory each dump writes its shards to
+SHARDS_PREFIX = 'shards-'
+
+DEFAULT_SHARDS = 8
+
+
+class _Index(Object):
+    shards = Attribute(type=StrList)
+    order = Attribute(type=str, default='')
+
+
+# work of the forked worker processes, see _map
+_work = None
+
+
+def dump_sharded(obj, directory, shards=DEFAULT_SHARDS, shard_by=None, processes=1):
+    """
+    Write the ``Map`` or ``KeyedList`` ``obj`` as several files in ``directory``, which
+    ``load_sharded`` reads back.
+
+    Items are assigned to one of ``shards`` shards by a hash of their key, or, with ``shard_by``, to
+    a shard per value of the item attribute named ``shard_by``, or per value returned by
+    ``shard_by(key, value)``. Attributes of ``obj`` itself are written to every shard. Anchors are
+    only shared within a shard, so an item referring to an item in another shard gets a copy of it.
+
+    The shards are written by up to ``processes`` worker processes (None for the number of CPUs),
+    or in this process when ``processes`` is 1, processes cannot be forked, or other threads are
+    running.
+
+    returns: list of the paths of the shard files.
+    """
+    if not isinstance(obj, (Map, KeyedList)):
+        raise TypeError('Expected a Map or KeyedList to shard, got: {}'.format(type(obj).__name__))
+
+    if shards < 1:
+        raise ValueError('Expected at least one shard, got: {}'.format(shards))
+
+    shard_indices = {}
+    keys = []
+    order = []
+
+    for key, value in obj.items():
+        if shard_by is None:
+            # stable across processes, unlike hash()
+            label = zlib.crc32(str(key).encode('utf-8')) % shards
+        elif callable(shard_by):
+            label = shard_by(key, value)
+        else:
+            label = getattr(value, shard_by)
+
+        index = shard_indices.setdefault(label, len(shard_indices))
+
+        if index == len(keys):
+            keys.append([])
+
+        keys[index].append(key)
+
+        if order and order[-1][0] == index:
+            order[-1][1] += 1
+        else:
+            order.append([index, 1])
+
+    os.makedirs(directory, exist_ok=True)
+    shards_directory = tempfile.mkdtemp(prefix=SHARDS_PREFIX, dir=directory)
+    names = ['{}/{}'.format(os.path.basename(shards_directory), SHARD_NAME.format(index))
+             for index in range(len(keys) or 1)]
+    paths = [os.path.join(directory, name) for name in names]
+    index_path = os.path.join(directory, INDEX)
+
+    try:
+        _map(_dump_shard, (paths, _split(obj, keys or [[]])), len(paths), processes)
+
+        index = _Index()
+        index.shards = StrList(names)
+        index.order = ' '.join(str(shard) if count == 1 else '{}*{}'.format(shard, count)
+                               for shard, count in order)
+
+        with io.open(os.path.join(shards_directory, INDEX), 'w', encoding='utf-8') as stream:
+            _Index.dump(index, stream)
+    except BaseException:
+        shutil.rmtree(shards_directory, ignore_errors=True)
+        raise
+
+    previous = _previous_shards(directory)
+    # atomic, so readers see either the previous shards or these
+    os.replace(os.path.join(shards_directory, INDEX), index_path)
+
+    for path in previous:
+        _remove_shard(directory, path)
+
+    return paths
+
+
+def load_sharded(cls, directory, processes=1, **kwargs):
+    """
+    Read a ``cls`` instance written by ``dump_sharded`` to ``directory``.
+
+    The shards are loaded by up to ``processes`` worker processes (None for the number of CPUs),
+    which pickle the loaded shards back to this process. They are loaded in this process instead
+    when ``processes`` is 1, processes cannot be forked, other threads are running, or the classes
+    of ``cls`` cannot be pickled, i.e. imported by module and name. Other arguments are passed on to
+    ``cls.load`` for each shard.
+
+    returns: instance of ``cls``, with the items in the order they were dumped.
+    """
+    index_path = os.path.join(directory, INDEX)
+
+    with io.open(index_path, encoding='utf-8') as stream:
+        index = _Index.load(stream)
+
+    paths = [os.path.join(directory, name) for name in index.shards]
+
+    if processes != 1 and not _picklable(cls):
+        processes = 1
+
+    shards = _map(_load_shard, (cls, paths, kwargs), len(paths), processes)
+
+    obj = shards[0]
+    rtd = obj._Object__round_trip_data
+    items = [iter(shard.items()) for shard in shards]
+    data = {}
+
+    try:
+        for run in index.order.split():
+            shard, _, count = run.partition('*')
+
+            for _ in range(int(count or 1)):
+                key, value = next(items[int(shard)])
+                data[key] = value
+    except (ValueError, IndexError, StopIteration):
+        raise YamlizingError('The shards in `{}` do not match the order in its index'
+                             .format(directory))
+
+    if len(data) != sum(len(shard) for shard in shards):
+        raise YamlizingError('The shards in `{}` do not match the order in its index'
+                             .format(directory))
+
+    obj._MapBase__data = data
+
+    for shard in shards[1:]:
+        kids_rtd = shard._Object__round_trip_data._kids_rtd
+
+        if kids_rtd:
+            if rtd._kids_rtd is None:
+                rtd._kids_rtd = {}
+
+            rtd._kids_rtd.update(kids_rtd)
+
+    return obj
+
+
+def _previous_shards(directory):
+    """returns: list of the paths of the shards listed by the index in ``directory``, if any"""
+    try:
+        with io.open(os.path.join(directory, INDEX), encoding='utf-8') as stream:
+            index = _Index.load(stream)
+    except (IOError, OSError, YamlizingError):
+        return []
+
+    return [os.path.join(directory, name) for name in index.shards]
+
+
+def _remove_shard(directory, path):
+    """Remove the shard file at ``path``, and its subdirectory of ``directory`` once it is empty."""
+    try:
+        os.remove(path)
+        parent = os.path.dirname(path)
+
+        if os.path.samefile(os.path.dirname(parent), directory) and not os.listdir(parent):
+            os.rmdir(parent)
+    except (IOError, OSError):
+        # already removed, e.g. by a concurrent dump
+        pass
+
+
+def _split(obj, keys):
+    """returns: list of ``type(obj)`` instances, with the items of each list of ``keys``"""
+    cls = type(obj)
+    state = obj.__getstate__()
+    data = obj._MapBase__data
+    rtd = obj._Object__round_trip_data
+    shards = []
+
+    for shard_keys in keys:
+        if shards:
+            # the comments and anchor of obj are only written once, with the first shard
+            shard_rtd = RoundTripData(None)
+            shard_rtd._kids_rtd = rtd._kids_rtd
+            shard_rtd._name_order = rtd._name_order
+        else:
+            shard_rtd = rtd
+
+        shard = cls.__new__(cls)
+        state['_MapBase__data'] = {key: data[key] for key in shard_keys}
+        state['_Object__round_trip_data'] = shard_rtd
+        shard.__setstate__(state)
+        shards.append(shard)
+
+    return shards
+
+
+def _dump_shard(work, index):
+    paths, shards = work
+    shard = shards[index]
+
+    with io.open(paths[index], 'w', encoding='utf-8') as stream:
+        type(shard).dump(shard, stream)
+
+
+def _load_shard(work, index):
+    cls, paths, kwargs = work
+
+    with io.open(paths[index], encoding='utf-8') as stream:
+        return cls.load(stream, **kwargs)
+
+
+def _picklable(cls):
+    """
+    returns: whether ``cls`` and the ``Object`` and ``Sequence`` classes of its attributes and items
+    can be pickled, which pickles them by module and name.
+    """
+    pending = [cls]
+    seen = set()
+
+    while pending:
+        klass = pending.pop()
+
+        if not isinstance(klass, type) or not issubclass(klass, (Object, Sequence)) or \
+                klass in seen:
+            continue
+
+        seen.add(klass)
+
+        try:
+            pickle.dumps(klass)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return False
+
+        if issubclass(klass, Object):
+            pending.extend(attribute.type for attribute in klass.attributes)
+
+        pending.extend(getattr(klass, name, None) for name in ('item_type', 'key_type',
+                                                               'value_type'))
+
+    return True
+
+
+def _map(function, work, count, processes):
+    """
+    returns: list of ``function(work, index)`` for each index in ``range(count)``, called in forked
+    worker processes when ``count`` and ``processes`` are more than one and no other threads are
+    running.
+    """
+    import multiprocessing
+    import threading
+
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    processes = min(processes, count)
+
+    if processes <= 1 or 'fork' not in multiprocessing.get_all_start_methods() or \
+            threading.active_count() > 1:
+        return [function(work, index) for index in range(count)]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # the workers are forked with the work as it is, rather than a pickled copy
+    with ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context('fork'),
+                             initializer=_set_work, initargs=(work,)) as executor:
+        futures = [executor.submit(_in_worker, function, index) for index in range(count)]
+        return [pickle.loads(future.result()) for future in futures]
+
+
+def _set_work(work):
+    global _work
+    _work = work
+
+
+def _in_worker(function, index):
+    stream = io.BytesIO()
+    _Pickler(stream, pickle.HIGHEST_PROTOCOL).dump(function(_work, index))
+    return stream.getvalue()
+
+
+def _reduce_round_trip_data(rtd):
+    kids_rtd = rtd._kids_rtd
+
+    if kids_rtd is not None:
+        # children stored by id are unhashable values, which have a new id once unpickled
+        kids_rtd = {key: kid for key, kid in kids_rtd.items() if len(key) == 2}
+
+    return _restore_round_trip_data, (rtd._rtd, kids_rtd, rtd._name_order, rtd._merge_parents,
+                                      rtd._complete_inheritance)
+
+
+def _restore_round_trip_data(data, kids_rtd, name_order, merge_parents, complete_inheritance):
+    rtd = RoundTripData(None)
+    rtd._rtd = data
+    rtd._kids_rtd = kids_rtd
+    rtd._name_order = name_order
+    rtd._merge_parents = merge_parents
+    rtd._complete_inheritance = complete_inheritance
+    return rtd
+
+
+def _reduce_alias_link(link):
+    return _restore_alias_link, (link.parent, link.prototype,
+                                 [attribute.name for attribute, _ in link.attributes])
+
+
+def _restore_alias_link(parent, prototype, attr_names):
+    link = _AliasLink(parent, prototype)
+    attributes = type(parent).attributes.by_name
+    link.attributes = [(attributes[name], attributes[name].get_value) for name in attr_names]
+    return link
+
+
+def _reduce_sequence(sequence):
+    # the items are appended once the sequence is created, so they may refer to it
+    return (_new_sequence, (type(sequence), sequence._Sequence__round_trip_data), None,
+            iter(sequence._Sequence__items))
+
+
+def _new_sequence(cls, rtd):
+    sequence = cls.__new__(cls)
+    sequence._Sequence__items = []
+    sequence._Sequence__round_trip_data = rtd
+    return sequence
+
+
+class _DispatchTable(dict):
+    """
+    Reducers by type, which also has ``_reduce_sequence`` for each ``Sequence`` subclass, as
+    picklers look reducers up by exact type.
+    """
+
+    def __missing__(self, cls):
+        if isinstance(cls, type) and issubclass(cls, Sequence):
+            self[cls] = _reduce_sequence
+            return _reduce_sequence
+
+        raise KeyError(cls)
+
+    def get(self, cls, default=None):
+        # the pure Python pickler uses get, which does not call __missing__
+        try:
+            return self[cls]
+        except KeyError:
+            return default
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickles the round trip data and merge links that ``RoundTripData``, ``_AliasLink`` and
+    ``Sequence`` leave out, for objects returned by the workers.
+    """
+
+    dispatch_table = _DispatchTable(copyreg.dispatch_table)
+    dispatch_table[RoundTripData] = _reduce_round_trip_data
+    dispatch_table[_AliasLink] = _reduce_alias_link
@@ -0,0 +1,188 @@
+import unittest
+import asyncio
+import io
+import threading
+
+from yamlize import Object
+from yamlize import Attribute
+from yamlize import KeyedList
+from yamlize import YamlizingError
+from yamlize import hooks
+from yamlize import aio
+
+
+class Server(Object):
+    name = Attribute(type=str)
+    port = Attribute(type=int, default=80)
+
+
+class Servers(KeyedList):
+    key_attr = Server.name
+    item_type = Server
+
+
+SERVERS = u'''# servers
+web: {port: 8080}  # public
+db:
+  port: 5432
+'''
+
+DOCUMENTS = u'''web: {port: 1}
+---
+db: {port: 2}
+---
+cache: {port: 3}
+'''
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def stream_reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class ChunkWriter(object):
+
+    def __init__(self):
+        self.chunks = []
+
+    async def write(self, chunk):
+        self.chunks.append(chunk)
+
+
+class Test_aio(unittest.TestCase):
+
+    def test_aload_str(self):
+        servers = run(Servers.aload(SERVERS))
+        self.assertEqual(8080, servers['web'].port)
+        self.assertEqual(SERVERS, Servers.dump(servers))
+
+    def test_aload_stream_reader(self):
+        async def load():
+            return await Servers.aload(stream_reader(SERVERS.encode('utf-8')), chunk_size=7)
+
+        servers = run(load())
+        self.assertEqual(5432, servers['db'].port)
+        self.assertEqual(SERVERS, Servers.dump(servers))
+
+    def test_aload_async_iterable(self):
+        async def chunks():
+            for line in SERVERS.splitlines(True):
+                yield line
+
+        self.assertEqual(['web', 'db'], list(run(Servers.aload(chunks())).keys()))
+
+    def test_aload_kwargs(self):
+        with self.assertRaises(YamlizingError):
+            run(Servers.aload(u'web: {port: a}\ndb: {port: b}\n', collect_errors=True))
+
+    def test_aload_in_executor(self):
+        threads = []
+        callback = hooks.on_construct(Servers, lambda obj, node: threads.append(
+            threading.current_thread()))
+
+        try:
+            run(Servers.aload(SERVERS))
+        finally:
+            hooks.remove(callback)
+
+        self.assertEqual(1, len(threads))
+        self.assertIsNot(threading.main_thread(), threads[0])
+
+    def test_aload_file(self):
+        threads = []
+
+        class File(io.BytesIO):
+
+            def read(self, size=-1):
+                threads.append(threading.current_thread())
+                return io.BytesIO.read(self, size)
+
+        servers = run(Servers.aload(File(SERVERS.encode('utf-8')), chunk_size=7))
+        self.assertEqual(5432, servers['db'].port)
+        # a blocking read is not run on the event loop
+        self.assertNotIn(threading.main_thread(), threads)
+
+    def test_read_empty_bytes(self):
+        self.assertEqual(b'', run(aio.read(io.BytesIO())))
+
+        async def read_stream_reader():
+            return await aio.read(stream_reader(b''))
+
+        self.assertEqual(b'', run(read_stream_reader()))
+        self.assertEqual(u'', run(aio.read(io.StringIO())))
+
+    def test_adump(self):
+        servers = Servers.load(SERVERS)
+        self.assertEqual(SERVERS, run(Servers.adump(servers)))
+
+    def test_adump_stream(self):
+        servers = Servers.load(SERVERS)
+        writer = ChunkWriter()
+        self.assertIsNone(run(Servers.adump(servers, writer, chunk_size=10, encoding='utf-8')))
+        self.assertTrue(all(len(chunk) <= 10 for chunk in writer.chunks))
+        self.assertEqual(SERVERS.encode('utf-8'), b''.join(writer.chunks))
+
+    def test_load_all(self):
+        documents = list(Servers.load_all(DOCUMENTS))
+        self.assertEqual([['web'], ['db'], ['cache']], [list(servers.keys()) for servers in documents])
+        self.assertEqual([1, 2, 3], [list(servers)[0].port for servers in documents])
+
+    def test_aload_all(self):
+        async def load_all():
+            return [servers async for servers in Servers.aload_all(stream_reader(
+                DOCUMENTS.encode('utf-8')))]
+
+        documents = run(load_all())
+        self.assertEqual([['web'], ['db'], ['cache']], [list(servers.keys()) for servers in documents])
+
+    def test_aload_all_stops_early(self):
+        closed = []
+
+        class TrackedServers(Servers):
+
+            @classmethod
+            def load_all(cls, stream, **kwargs):
+                try:
+                    yield from Servers.load_all.__func__(cls, stream, **kwargs)
+                finally:
+                    closed.append(threading.current_thread())
+
+        async def load_first():
+            documents = TrackedServers.aload_all(DOCUMENTS)
+
+            try:
+                async for servers in documents:
+                    return servers
+            finally:
+                await documents.aclose()
+
+        self.assertEqual(['web'], list(run(load_first()).keys()))
+        self.assertEqual(1, len(closed))
+        self.assertIsNot(threading.main_thread(), closed[0])
+
+    def test_aload_all_error(self):
+        async def load_all():
+            loaded = []
+
+            async for servers in Servers.aload_all(u'web: {port: 1}\n---\ndb: {port: b}\n'):
+                loaded.append(servers)
+
+            return loaded
+
+        with self.assertRaises(YamlizingError):
+            run(load_all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import unittest
+import copy
+
+import yamlize
+from yamlize import Object
+from yamlize import Attribute
+from yamlize import KeyedList
+from yamlize import Map
+from yamlize import Sequence
+from yamlize import StrList
+
+
+class Tool(Object):
+    name = Attribute(type=str)
+    weight = Attribute(type=float)
+    length = Attribute(type=float, default=1.0)
+    tags = Attribute(type=StrList, default=None)
+
+
+class Tools(KeyedList):
+    key_attr = Tool.name
+    item_type = Tool
+
+
+class Toolboxes(Sequence):
+    item_type = Tools
+
+
+class Prices(Map):
+    key_type = yamlize.Typed(str)
+    value_type = yamlize.Typed(float)
+    currency = Attribute(type=str, default='EUR')
+
+
+class Person(Object, slots=True):
+    __slots__ = ('_yamlized_name', '_yamlized_friend')
+    name = Attribute(type=str)
+
+
+Person.friend = Attribute(name='friend', type=Person, default=None)
+
+
+class Test_clone(unittest.TestCase):
+
+    merged = u'''# tools
+hammer: &hammer
+  weight: 2.5   # heavy
+  length: 0.5
+  tags: [steel, 'wood']
+mallet:
+  <<: *hammer
+  weight: 3.5
+'''
+
+    def test_round_trip(self):
+        tools = Tools.load(self.merged)
+        copied = yamlize.clone(tools)
+        self.assertIsNot(tools, copied)
+        self.assertIsNot(tools['hammer'], copied['hammer'])
+        self.assertEqual(self.merged, Tools.dump(copied))
+        self.assertEqual(self.merged, Tools.dump(tools))
+
+    def test_comments_are_not_shared(self):
+        tools = Tools.load(self.merged)
+        copied = yamlize.clone(tools)
+        # dumping marks the comment tokens of the original as written
+        Tools.dump(tools)
+        self.assertEqual(self.merged, Tools.dump(copied))
+
+    def test_independent(self):
+        tools = Tools.load(self.merged)
+        copied = yamlize.clone(tools)
+        copied['hammer'].weight = 9.0
+        copied['hammer'].tags.append('new')
+        del copied['mallet']
+        self.assertEqual(self.merged, Tools.dump(tools))
+        self.assertIn('weight: 9.0', Tools.dump(copied))
+        self.assertNotIn('mallet', Tools.dump(copied))
+
+    def test_merge_parent(self):
+        copied = yamlize.clone(Tools.load(self.merged))
+        copied['hammer'].length = 0.75
+        copied['mallet'].length = 0.75
+        # the mallet still inherits from the copied hammer
+        self.assertIn(u'  <<: *hammer\n  weight: 3.5\n', Tools.dump(copied))
+
+    def test_prototype_merges(self):
+        tools = Tools.load(self.merged, prototype_merges=True)
+        copied = yamlize.clone(tools)
+        copied['hammer'].length = 0.75
+        self.assertEqual(0.75, copied['mallet'].length)
+        self.assertEqual(0.5, tools['mallet'].length)
+        self.assertEqual(self.merged, Tools.dump(tools))
+
+    def test_shared_references(self):
+        boxes = Toolboxes.load(u'''
+- &box
+  hammer: {weight: 2.5}
+- *box
+''')
+        copied = yamlize.clone(boxes)
+        self.assertIs(copied[0], copied[1])
+        self.assertIsNot(boxes[0], copied[0])
+        self.assertEqual(Toolboxes.dump(boxes), Toolboxes.dump(copied))
+
+    def test_immutable_values_are_shared(self):
+        tools = Tools.load(self.merged)
+        copied = yamlize.clone(tools)
+        self.assertIs(tools['hammer'].name, copied['hammer'].name)
+        self.assertIs(tools['hammer'].tags[0], copied['hammer'].tags[0])
+
+    def test_map(self):
+        text = u'currency: USD\napple: 1.5  # each\npear: 2.0\n'
+        prices = Prices.load(text)
+        copied = yamlize.clone(prices)
+        copied['fig'] = 3.0
+        self.assertEqual(text, Prices.dump(prices))
+        self.assertEqual(text + u'fig: 3.0\n', Prices.dump(copied))
+        self.assertEqual('USD', copied.currency)
+
+    def test_recursive_slots(self):
+        text = u'&bob\nname: bob\nfriend: *bob\n'
+        bob = Person.load(text)
+        copied = yamlize.clone(bob)
+        self.assertIs(copied, copied.friend)
+        self.assertEqual(text, Person.dump(copied))
+
+    def test_new_objects(self):
+        tool = Tool()
+        tool.name = 'saw'
+        tool.weight = 1.0
+        copied = yamlize.clone(tool)
+        self.assertEqual(Tool.dump(tool), Tool.dump(copied))
+        self.assertEqual(1.0, copied.length)
+
+    def test_deepcopy_is_unchanged(self):
+        # deepcopy still drops round trip data, clone is the way to keep it
+        copied = copy.deepcopy(Tools.load(self.merged))
+        self.assertNotIn('# heavy', Tools.dump(copied))
+
+
+if __name__ == '__main__':
+    unittest.main()
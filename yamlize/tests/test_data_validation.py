@@ -1,8 +1,11 @@
 import unittest
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 import numpy
 
-from yamlize import Object, YamlizingError, Attribute
+from yamlize import Object, YamlizingError, YamlizingErrorGroup, Attribute, pure_validator
+from yamlize import Sequence
 
 
 class PositivePoint(Object):
@@ -62,6 +65,76 @@ class TestDataValidation(unittest.TestCase):
             PositivePoint2.load(u'{ x: -0.0000001, y: 1.0}') # doctest: +IGNORE_EXCEPTION_DETAIL
 
 
+class SlowPoint(Object):
+
+    validated_on = []
+
+    x = Attribute(type=float)
+
+    @x.validator
+    @pure_validator
+    def x(self, x):
+        SlowPoint.validated_on.append(threading.current_thread())
+        return x >= 0.0
+
+    y = Attribute(type=float, validator=lambda self, y: y >= 0)
+
+
+class SlowPoints(Sequence):
+
+    item_type = SlowPoint
+
+
+class TestDeferredValidation(unittest.TestCase):
+
+    bad_points = u'''
+- {x: -1.0, y: 1.0}
+- {x: 1.0, y: 1.0}
+- {x: 1.0, y: -1.0}
+'''
+
+    def test_reports_all_failures(self):
+        with self.assertRaises(YamlizingError) as ctx:
+            SlowPoints.load(self.bad_points)
+        self.assertNotIsInstance(ctx.exception, YamlizingErrorGroup)
+
+        with self.assertRaises(YamlizingErrorGroup) as ctx:
+            SlowPoints.load(self.bad_points, defer_validation=True)
+        self.assertEqual(2, len(ctx.exception.errors))
+        self.assertIn('line 2', str(ctx.exception.errors[0]))
+        self.assertIn('line 4', str(ctx.exception.errors[1]))
+
+    def test_single_failure_is_not_grouped(self):
+        with self.assertRaises(YamlizingError) as ctx:
+            PositivePoint.load(u'{x: -1.0, y: 1.0}', defer_validation=True)
+        self.assertNotIsInstance(ctx.exception, YamlizingErrorGroup)
+
+    def test_pure_validators_use_executor(self):
+        del SlowPoint.validated_on[:]
+        with ThreadPoolExecutor(2) as executor:
+            points = SlowPoints.load(u'[{x: 1.0, y: 1.0}, {x: 2.0, y: 2.0}]',
+                                     defer_validation=True, executor=executor)
+        self.assertEqual([1.0, 2.0], [p.x for p in points])
+        self.assertEqual(2, len(SlowPoint.validated_on))
+        self.assertNotIn(threading.current_thread(), SlowPoint.validated_on)
+
+    def test_executor_errors(self):
+        with ProcessPoolExecutor(1) as executor:
+            with self.assertRaisesRegex(TypeError, 'ThreadPoolExecutor'):
+                SlowPoints.load(u'[{x: 1.0, y: 1.0}]', defer_validation=True, executor=executor)
+
+            # rejected before the document is read
+            with self.assertRaisesRegex(TypeError, 'ThreadPoolExecutor'):
+                SlowPoints.load(u'[{x: 1.0', defer_validation=True, executor=executor)
+
+        executor = ThreadPoolExecutor(1)
+        executor.shutdown()
+
+        # not reported as an invalid value
+        with self.assertRaises(RuntimeError):
+            SlowPoints.load(u'[{x: 1.0, y: 1.0}]', defer_validation=True, executor=executor)
+
+
 class Person(Object):
 
     first = Attribute(type=str)
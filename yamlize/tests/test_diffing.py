@@ -0,0 +1,172 @@
+import unittest
+
+import yamlize
+from yamlize import Object
+from yamlize import Attribute
+from yamlize import KeyedList
+from yamlize import Map
+from yamlize import Sequence
+from yamlize import FloatList
+from yamlize import YamlizingError
+from yamlize.diffing import Change, ATTRIBUTE, ITEM
+
+
+class Tool(Object):
+    name = Attribute(type=str)
+    weight = Attribute(type=float)
+    length = Attribute(type=float, default=1.0)
+    sizes = Attribute(type=FloatList, default=None)
+    extra = Attribute(default=None)
+
+
+class Tools(KeyedList):
+    key_attr = Tool.name
+    item_type = Tool
+
+
+class Shelf(Map):
+    key_type = yamlize.Typed(str)
+    value_type = Tools
+    label = Attribute(type=str, default='')
+
+
+class Shelves(Sequence):
+    item_type = Shelf
+
+
+class Test_diff(unittest.TestCase):
+
+    old = u'''# shelves
+- label: top
+  hand:
+    # heavy
+    hammer: {weight: 2.5, sizes: [1.0, 2.0]}
+    saw: {weight: 1.0}
+- label: bottom
+  power: {}
+'''
+
+    new = u'''# shelves
+- label: top
+  hand:
+    # heavy
+    hammer: {weight: 2.5, sizes: [1.0, 3.0, 4.0]}
+    file: {weight: 0.1, extra: {grit: 120}}
+  power:
+    drill: {weight: 2.0, length: 0.3}
+'''
+
+    def test_changes(self):
+        changes = yamlize.diff(Shelves.load(self.old), Shelves.load(self.new))
+        paths = [(change.op, yamlize.diffing.format_path(change.path)) for change in changes]
+        self.assertEqual([
+            ('replace', "[0]['hand']['hammer'].sizes[1]"),
+            ('add', "[0]['hand']['hammer'].sizes[2]"),
+            ('remove', "[0]['hand']['saw']"),
+            ('add', "[0]['hand']['file']"),
+            ('add', "[0]['power']"),
+            ('remove', '[1]'),
+        ], paths)
+        self.assertEqual(Change('replace', (
+            (ITEM, 0), (ITEM, 'hand'), (ITEM, 'hammer'), (ATTRIBUTE, 'sizes'), (ITEM, 1)), 2.0, 3.0),
+            changes[0])
+
+    def test_same(self):
+        self.assertEqual([], yamlize.diff(Shelves.load(self.old), Shelves.load(self.old)))
+        shelves = Shelves.load(self.old)
+        self.assertEqual([], yamlize.diff(shelves, yamlize.clone(shelves)))
+
+    def test_defaults(self):
+        tool = Tool.load(u'name: saw\nweight: 1.0\n')
+        explicit = Tool.load(u'name: saw\nweight: 1.0\nlength: 1.0\n')
+        # a value equal to the default is not a change
+        self.assertEqual([], yamlize.diff(tool, explicit))
+
+        changed = Tool.load(u'name: saw\nweight: 1.0\nlength: 2.0\n')
+        self.assertEqual([Change('replace', ((ATTRIBUTE, 'length'),), 1.0, 2.0)],
+                         yamlize.diff(tool, changed))
+
+    def test_unset_with_default(self):
+        tool = Tool.load(u'name: saw\nweight: 1.0\n')
+
+        for text in (u'name: saw\nweight: 1.0\nlength: 2.0\n',
+                     u'name: saw\nweight: 1.0\nlength: 1.0\n'):
+            changed = Tool.load(text)
+            changes = yamlize.diff(changed, tool)
+            self.assertEqual([Change('remove', ((ATTRIBUTE, 'length'),), old=changed.length)],
+                             changes)
+
+            # unset by the patch, rather than set to the default and dumped as such
+            yamlize.patch(changed, changes)
+            self.assertEqual(Tool.dump(tool), Tool.dump(changed))
+
+    def test_unset_required(self):
+        tool = Tool()
+        tool.name = 'saw'
+        other = Tool.load(u'name: saw\nweight: 1.0\n')
+        self.assertEqual([Change('add', ((ATTRIBUTE, 'weight'),), new=1.0)],
+                         yamlize.diff(tool, other))
+        self.assertEqual([Change('remove', ((ATTRIBUTE, 'weight'),), old=1.0)],
+                         yamlize.diff(other, tool))
+        yamlize.patch(other, yamlize.diff(other, tool))
+        self.assertFalse(hasattr(other, '_yamlized_weight'))
+
+    def test_dynamic_values(self):
+        old = Tool.load(u'name: a\nweight: 1\nextra: [1, 2]\n')
+        new = Tool.load(u'name: a\nweight: 1\nextra: [1, 3]\n')
+        changes = yamlize.diff(old, new)
+        self.assertEqual(1, len(changes))
+        self.assertEqual(((ATTRIBUTE, 'extra'),), changes[0].path)
+
+    def test_recursive(self):
+        class Person(Object):
+            name = Attribute(type=str)
+
+        Person.friend = Attribute(name='friend', type=Person, default=None)
+
+        old = Person.load(u'&a\nname: a\nfriend: *a\n')
+        new = Person.load(u'&a\nname: b\nfriend: *a\n')
+        self.assertEqual([Change('replace', ((ATTRIBUTE, 'name'),), 'a', 'b')],
+                         yamlize.diff(old, new))
+
+    def test_different_classes(self):
+        with self.assertRaises(TypeError):
+            yamlize.diff(Tools(), Shelf())
+
+        with self.assertRaises(TypeError):
+            yamlize.diff(1, 1)
+
+
+class Test_patch(unittest.TestCase):
+
+    def test_patch(self):
+        old = Shelves.load(Test_diff.old)
+        new = Shelves.load(Test_diff.new)
+        yamlize.patch(old, yamlize.diff(old, new))
+        self.assertEqual([], yamlize.diff(old, new))
+        # the comments of the patched object are kept
+        self.assertEqual(Shelves.dump(new), Shelves.dump(old))
+
+    def test_reverse(self):
+        old = Shelves.load(Test_diff.old)
+        new = Shelves.load(Test_diff.new)
+        yamlize.patch(new, yamlize.diff(new, old))
+        self.assertEqual(Test_diff.old, Shelves.dump(new))
+
+    def test_validates(self):
+        tool = Tool.load(u'name: saw\nweight: 1.0\n')
+
+        with self.assertRaises(YamlizingError):
+            yamlize.patch(tool, [Change('replace', ((ATTRIBUTE, 'weight'),), 1.0, 'heavy')])
+
+        with self.assertRaises(ValueError):
+            yamlize.patch(tool, [Change('move', ((ATTRIBUTE, 'weight'),))])
+
+        with self.assertRaises(ValueError):
+            yamlize.patch(tool, [Change('replace', (), tool, tool)])
+
+        self.assertEqual(1.0, tool.weight)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+
+from yamlize import hooks
+from yamlize import Object
+from yamlize import Attribute
+from yamlize import Map
+from yamlize import KeyedList
+from yamlize import Sequence
+from yamlize import Typed
+from yamlize import YamlizingError
+
+
+class Sensor(Object):
+    name = Attribute(type=str)
+    unit = Attribute(type=str, default='C')
+
+
+class Sensors(KeyedList):
+    key_attr = Sensor.name
+    item_type = Sensor
+
+
+class Site(Object):
+    site = Attribute(type=str)
+    sensors = Attribute(type=Sensors)
+
+
+class Sites(Sequence):
+    item_type = Site
+
+
+class Labels(Map):
+    key_type = Typed(str)
+    value_type = Typed(str)
+
+
+SITES = u'''
+- site: north
+  sensors:
+    t1: {unit: F}
+    t2: {}
+- site: south
+  sensors:
+    t3: {}
+'''
+
+
+class Test_hooks(unittest.TestCase):
+
+    def tearDown(self):
+        hooks.clear()
+
+    def test_construct(self):
+        events = []
+        hooks.on_construct(Sensor, lambda obj, node: events.append(obj.name))
+        hooks.on_construct(Site, lambda obj, node: events.append(obj.site))
+        hooks.on_construct(Sequence, lambda obj, node: events.append(len(obj)))
+        Sites.load(SITES)
+        # children are complete before their parents
+        self.assertEqual(['t1', 't2', 'north', 't3', 'south', 2], events)
+
+    def test_subclasses_and_maps(self):
+        events = []
+        hooks.on_construct(Object, lambda obj, node: events.append(type(obj).__name__))
+        Labels.load(u'a: b')
+        self.assertEqual(['Labels'], events)
+
+    def test_build_index_during_load(self):
+        by_unit = {}
+        hooks.on_construct(Sensor, lambda obj, node: by_unit.setdefault(obj.unit, []).append(obj))
+        sites = Sites.load(SITES)
+        self.assertEqual(['t2', 't3'], [sensor.name for sensor in by_unit['C']])
+        self.assertIs(sites[0].sensors['t1'], by_unit['F'][0])
+
+    def test_node(self):
+        lines = []
+        hooks.on_construct(Site, lambda obj, node: lines.append(node.start_mark.line))
+        Sites.load(SITES)
+        self.assertEqual([1, 5], lines)
+
+    def test_dump(self):
+        sites = Sites.load(SITES)
+        events = []
+        hooks.on_dump(Object, lambda obj, node: events.append(type(obj).__name__))
+        hooks.on_dump(Sites, lambda obj, node: events.append(len(node.value)))
+        Sites.dump(sites)
+        self.assertEqual(['Sensor', 'Sensor', 'Sensors', 'Site', 'Sensor', 'Sensors', 'Site', 2],
+                         events)
+
+    def test_error(self):
+        errors = []
+        hooks.on_error(errors.append)
+        with self.assertRaises(YamlizingError) as ctx:
+            Sites.load(u'- site: north\n  sensors: {t1: {bonus: 1}}')
+        self.assertIn(ctx.exception, errors)
+
+    def test_remove(self):
+        events = []
+        callback = hooks.on_construct(Sensor, lambda obj, node: events.append(obj))
+        hooks.on_error(callback)
+        self.assertTrue(hooks.construct_active)
+        self.assertTrue(hooks.error_active)
+        hooks.remove(callback)
+        self.assertFalse(hooks.construct_active)
+        self.assertFalse(hooks.error_active)
+        Sites.load(SITES)
+        self.assertEqual([], events)
+
+    def test_registered_after_first_use(self):
+        events = []
+        hooks.on_construct(Site, lambda obj, node: events.append('site'))
+        Sites.load(SITES)
+        hooks.on_construct(Object, lambda obj, node: events.append('object'))
+        Sites.load(SITES)
+        self.assertEqual(['site', 'site'], events[:2])
+        self.assertIn('object', events)
+
+
+if __name__ == '__main__':
+    unittest.main()
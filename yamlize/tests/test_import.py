@@ -0,0 +1,55 @@
+import unittest
+import json
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# imported on first use, importing yamlize must not import them
+LAZY_MODULES = ('ruamel.yaml', 'inspect', 'asyncio', 'yamlize.aio', 'yamlize.load_stats',
+                'yamlize.profiling', 'yamlize.schema', 'yamlize.session',
+                'yamlize.cloning', 'yamlize.diffing', 'yamlize.sharding',
+                'yamlize.querying')
+
+
+def imported_modules(code):
+    """returns: set of modules imported by ``code``, that a new interpreter had not imported"""
+    script = '\n'.join(['import sys', 'before = set(sys.modules)', code,
+                        'print(json.dumps(sorted(set(sys.modules) - before)))'])
+    output = subprocess.check_output([sys.executable, '-c', 'import json\n' + script], cwd=ROOT)
+    return set(json.loads(output.decode()))
+
+
+class Test_import(unittest.TestCase):
+
+    def test_import_budget(self):
+        modules = imported_modules('import yamlize')
+        self.assertEqual([], [name for name in LAZY_MODULES if name in modules])
+
+    def test_lazy_attributes(self):
+        modules = imported_modules('import yamlize; yamlize.Session; yamlize.profile')
+        self.assertIn('yamlize.session', modules)
+        self.assertIn('yamlize.profiling', modules)
+        self.assertNotIn('ruamel.yaml', modules)
+
+    def test_load(self):
+        modules = imported_modules('import yamlize; yamlize.IntList.load("[1]")')
+        self.assertIn('ruamel.yaml', modules)
+        self.assertNotIn('asyncio', modules)
+
+    def test_from_import(self):
+        from yamlize import Session, LoadStats, profile
+        import yamlize
+        self.assertIs(Session, yamlize.Session)
+        self.assertIs(LoadStats, yamlize.LoadStats)
+        self.assertIs(profile, yamlize.profile)
+        self.assertIn('Session', dir(yamlize))
+
+        with self.assertRaises(AttributeError):
+            yamlize.NotAnAttribute
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,222 @@
+import unittest
+import concurrent.futures
+import io
+import os
+import shutil
+import stat
+import tempfile
+
+from yamlize import Attribute
+from yamlize import KeyedList
+from yamlize import Object
+from yamlize import StrList
+from yamlize import YamlizingError
+from yamlize import includes
+
+
+class Part(Object):
+    name = Attribute(type=str)
+    material = Attribute(type=str)
+    mass = Attribute(type=float)
+
+
+class Parts(KeyedList):
+    key_attr = Part.name
+    item_type = Part
+
+
+class Frame(Object):
+    material = Attribute(type=str)
+    mass = Attribute(type=float)
+    parts = Attribute(type=Parts, default=None)
+
+
+class Bike(Object):
+    name = Attribute(type=str)
+    frame = Attribute(type=Frame)
+    wheels = Attribute(type=Parts)
+    extras = Attribute(type=StrList, default=None)
+
+
+FILES = {
+    'bike.yaml': u'''name: bike
+frame: !include parts/frame.yaml
+wheels:
+  front: !include parts/wheel.yaml
+  back: !include parts/wheel.yaml
+extras: !include extras.yaml
+''',
+    'extras.yaml': u'''- bell
+- light
+''',
+    'parts/frame.yaml': u'''# the frame
+material: steel  # heavy
+mass: 10.0
+parts:
+  fork: !include fork.yaml
+''',
+    'parts/fork.yaml': u'''material: carbon
+mass: 0.5
+''',
+    'parts/wheel.yaml': u'''material: rubber
+mass: 1.5
+''',
+}
+
+
+class Test_includes(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory, 'parts'))
+
+        for name, text in FILES.items():
+            self.write(name, text)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def write(self, name, text):
+        with io.open(self.path(name), 'w', encoding='utf-8') as stream:
+            stream.write(text)
+
+    def read(self, name):
+        with io.open(self.path(name), encoding='utf-8') as stream:
+            return stream.read()
+
+    def load(self, **kwargs):
+        with io.open(self.path('bike.yaml'), encoding='utf-8') as stream:
+            return Bike.load(stream, includes=True, **kwargs)
+
+    def test_load(self):
+        bike = self.load()
+        self.assertEqual(10.0, bike.frame.mass)
+        self.assertEqual(0.5, bike.frame.parts['fork'].mass)
+        self.assertEqual('fork', bike.frame.parts['fork'].name)
+        self.assertEqual(1.5, bike.wheels['back'].mass)
+        self.assertEqual(['front', 'back'], list(bike.wheels.keys()))
+        self.assertEqual(['bell', 'light'], list(bike.extras))
+
+    def test_executor(self):
+        with concurrent.futures.ThreadPoolExecutor(4) as executor:
+            bike = self.load(executor=executor)
+
+        self.assertEqual(0.5, bike.frame.parts['fork'].mass)
+        self.assertEqual(FILES['bike.yaml'], Bike.dump(bike))
+
+    def test_dump_unchanged(self):
+        bike = self.load()
+        self.assertEqual(FILES['bike.yaml'], Bike.dump(bike))
+
+        for name, text in FILES.items():
+            self.assertEqual(text, self.read(name))
+
+    def test_dump_writes_changes(self):
+        os.chmod(self.path('parts/wheel.yaml'), 0o640)
+        bike = self.load()
+        bike.wheels['back'].mass = 2.0
+        bike.frame.parts['fork'].material = 'steel'
+        bike.extras.append('basket')
+        self.assertEqual(FILES['bike.yaml'], Bike.dump(bike))
+
+        self.assertEqual(u'material: rubber\nmass: 2.0\n', self.read('parts/wheel.yaml'))
+        self.assertEqual(u'material: steel\nmass: 0.5\n', self.read('parts/fork.yaml'))
+        self.assertEqual(u'- bell\n- light\n- basket\n', self.read('extras.yaml'))
+        # unchanged, so not written
+        self.assertEqual(FILES['parts/frame.yaml'], self.read('parts/frame.yaml'))
+        # replaced through a temporary file, which is gone, keeping the permissions
+        self.assertEqual(['fork.yaml', 'frame.yaml', 'wheel.yaml'],
+                         sorted(os.listdir(self.path('parts'))))
+        self.assertEqual(0o640, stat.S_IMODE(os.stat(self.path('parts/wheel.yaml')).st_mode))
+
+        reloaded = self.load()
+        self.assertEqual(2.0, reloaded.wheels['front'].mass)
+        self.assertEqual('steel', reloaded.frame.parts['fork'].material)
+
+    def test_cache(self):
+        first = self.load()
+        first.frame.mass = 99.0
+        second = self.load()
+        self.assertIsNot(first.frame, second.frame)
+        self.assertEqual(10.0, second.frame.mass)
+        # the comments are not shared either
+        original = includes.included(second.frame).original
+        self.assertEqual(FILES['parts/frame.yaml'], Frame.dump(original))
+
+        self.write('parts/wheel.yaml', u'material: rubber\nmass: 1.75\n')
+        self.assertEqual(1.75, self.load().wheels['front'].mass)
+
+    def test_cache_options(self):
+        self.write('parts.yaml', u'a: &a {material: x, mass: 1.0}\nb: {<<: *a, mass: 2.0}\n')
+        text = u'!include {}'.format(self.path('parts.yaml'))
+
+        merged = Parts.load(text, includes=True, prototype_merges=True)
+        self.assertNotIn('_yamlized_material', vars(merged['b']))
+        copied = Parts.load(text, includes=True)
+        self.assertEqual('x', vars(copied['b'])['_yamlized_material'])
+
+        for _ in range(2):
+            strings = {}
+            Parts.load(text, includes=True, intern=strings)
+            # interned into each load's own dict, rather than copied from the cache
+            self.assertIn('a', strings)
+
+    def test_deferred_validation(self):
+        class Light(Object):
+            mass = Attribute(type=float, validator=lambda self, value: value < 5.0)
+
+        self.write('light.yaml', u'mass: 10.0\n')
+        text = u'!include {}'.format(self.path('light.yaml'))
+
+        for kwargs in ({'defer_validation': True}, {}):
+            # not cached by the first load, whose validators failed afterwards
+            with self.assertRaisesRegex(YamlizingError, 'mass'):
+                Light.load(text, includes=True, **kwargs)
+
+    def test_errors(self):
+        self.write('extras.yaml', u'[bell, {light: 1}]\n')
+
+        with self.assertRaisesRegex(YamlizingError, 'light'):
+            self.load()
+
+        self.write('extras.yaml', u'[bell\n')
+
+        # the marks name the included file
+        with self.assertRaisesRegex(Exception, 'in "{}"'.format(self.path('extras.yaml'))):
+            self.load()
+
+        os.remove(self.path('extras.yaml'))
+
+        with self.assertRaisesRegex(YamlizingError, 'Failed to include `extras.yaml`'):
+            self.load()
+
+    def test_cycle(self):
+        self.write('extras.yaml', u'!include more.yaml\n')
+        self.write('more.yaml', u'!include extras.yaml\n')
+
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            for kwargs in ({}, {'executor': executor}):
+                with self.assertRaisesRegex(YamlizingError, 'Include cycle: .*extras.yaml -> .*'
+                                            'more.yaml -> .*extras.yaml'):
+                    self.load(**kwargs)
+
+        self.write('extras.yaml', u'!include extras.yaml\n')
+
+        with self.assertRaisesRegex(YamlizingError, 'Include cycle'):
+            StrList.load(u'!include {}'.format(self.path('extras.yaml')), includes=True)
+
+    def test_process_executor(self):
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            with self.assertRaisesRegex(TypeError, 'ThreadPoolExecutor'):
+                self.load(executor=executor)
+
+    def test_disabled(self):
+        with self.assertRaises(YamlizingError):
+            Bike.load(FILES['bike.yaml'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -148,6 +148,104 @@ thing2: *thing1
         self.assertEqual(TestMergeAndAnchor.list_from_alias, actual)
 
 
+class TestPrototypeMerges(unittest.TestCase):
+
+    def test_only_overrides_are_stored(self):
+        things = Things.load(TestMergeAndAnchor.multiple_merge, prototype_merges=True)
+        thing3 = things['thing3']
+        self.assertEqual({'_yamlized_name', '_yamlized_float_attr'}, set(vars(thing3)))
+        self.assertEqual((1, 'an actual string', 42.42),
+                         (thing3.int_attr, thing3.str_attr, thing3.float_attr))
+
+    def test_round_trip(self):
+        for text in (TestMergeAndAnchor.multiple_merge,
+                     TestMergeAndAnchor.keyed_list_complete_inheritance):
+            things = Things.load(text, prototype_merges=True)
+            self.assertEqual(text, Things.dump(things).strip())
+
+        pets = AnimalList.load(TestMergeAndAnchor.list_inheritance, prototype_merges=True)
+        self.assertEqual(5, pets[1].age)
+        self.assertEqual(TestMergeAndAnchor.list_inheritance, AnimalList.dump(pets).strip())
+
+    def test_parent_changes_are_inherited(self):
+        things = Things.load(TestMergeAndAnchor.multiple_merge, prototype_merges=True)
+        things['thing1'].int_attr = 7
+        self.assertEqual(7, things['thing3'].int_attr)
+        things['thing2'].float_attr = things['thing1'].float_attr
+        # an override equal to the inherited value is still an override
+        self.assertIn('  str_attr: an actual string\n  float_attr: 99.2\n',
+                      Things.dump(things))
+
+    def test_delete_override(self):
+        things = Things.load(TestMergeAndAnchor.multiple_merge, prototype_merges=True)
+        del things['thing3'].float_attr
+        self.assertEqual(99.2, things['thing3'].float_attr)
+
+    def test_delete_parent(self):
+        things = Things.load(TestMergeAndAnchor.multiple_merge, prototype_merges=True)
+        del things['thing1']
+        yaml = Things.dump(things)
+        self.assertNotIn('thing1', yaml)
+        self.assertIn('<<: *thing2', yaml)
+        # the values thing2 inherited from thing1 are written out
+        self.assertEqual(things['thing2'].int_attr, Things.load(yaml)['thing2'].int_attr)
+        self.assertEqual(42.42, Things.load(yaml)['thing3'].float_attr)
+
+    def test_modified_complete_inheritance(self):
+        things = Things.load(TestMergeAndAnchor.keyed_list_complete_inheritance,
+                             prototype_merges=True)
+        things['thing2'].int_attr = 19
+        actual = Things.dump(things)
+        self.assertIn('<<: *thing1', actual)
+        self.assertIn('int_attr: 19', actual)
+        self.assertEqual(12, things['thing1'].int_attr)
+
+    def test_unlinked_objects_do_not_look_up_parents(self):
+        class Counted(Object):
+            lookups = 0
+            value = Attribute(type=int, default=0)
+
+            def _inherited_value(self, attribute):
+                type(self).lookups += 1
+                return Object._inherited_value(self, attribute)
+
+        class CountedList(Sequence):
+            item_type = Counted
+
+        counted = CountedList.load(u'- &a {}\n- {<<: *a}\n- {}\n', prototype_merges=True)
+        self.assertEqual([0, 0, 0], [item.value for item in counted])
+        # only the item with a prototype merge parent looks for inherited values
+        self.assertEqual(1, Counted.lookups)
+
+    def test_long_chain(self):
+        class Link(Object):
+            value = Attribute(type=int, default=0)
+            label = Attribute(type=str, default='')
+
+        class Chain(Sequence):
+            item_type = Link
+
+        count = 3000
+        text = u'- &t0 {value: 1}\n' + u''.join(
+            u'- &t{} {{<<: *t{}}}\n'.format(index, index - 1) for index in range(1, count))
+        chain = Chain.load(text, prototype_merges=True)
+        # looked up without recursing through every ancestor
+        self.assertEqual(1, chain[-1].value)
+        self.assertEqual('', chain[-1].label)
+
+        chain[count // 2].value = 2
+        self.assertEqual(2, chain[-1].value)
+        self.assertEqual(1, chain[count // 2 - 1].value)
+
+    def test_missing_attributes(self):
+        class BadData(Object):
+            data = Attribute()
+            things = Attribute(type=Things)
+
+        with self.assertRaisesRegex(YamlizingError, 'this will fail'):
+            BadData.load(TestMergeAndAnchor.bad_data_merge, prototype_merges=True)
+
+
 class TestSubclassing(unittest.TestCase):
 
     multiple_merge = '''
@@ -233,6 +331,59 @@ thing3:
 
         self.assertEqual(Shapes.dump(shapes), input_str)
 
+    def test_map_subclass_subclass(self):
+        class Kennel(Map):
+            value_type = Animal
+            owner = Attribute(type=str, default='')
+
+        class BigKennel(Kennel):
+            size = Attribute(type=int, default=1)
+
+        class NamedBigKennel(NamedKennel):
+            size = Attribute(type=int, default=1)
+
+        self.assertEqual(['size', 'owner'], [a.name for a in BigKennel.attributes])
+        self.assertEqual(['owner'], [a.name for a in Kennel.attributes])
+        self.assertEqual(type(Kennel.attributes), type(BigKennel.attributes))
+        self.assertEqual(type(NamedKennel.attributes), type(NamedBigKennel.attributes))
+
+        kennel = BigKennel.load(u'owner: o\nsize: 2\nfido: {name: fido, age: 3}\n')
+        self.assertEqual(('o', 2, 3), (kennel.owner, kennel.size, kennel['fido'].age))
+
+    def test_multiple_inheritance_order(self):
+        class Base(Object):
+            base = Attribute(type=int)
+
+        class Left(Base):
+            left = Attribute(type=int)
+
+        class Right(Base):
+            right = Attribute(type=int)
+
+        class Both(Left, Right):
+            both = Attribute(type=int)
+
+        self.assertEqual(['both', 'left', 'base', 'right'], [a.name for a in Both.attributes])
+        self.assertNotIn('base', vars(Both))
+
+    def test_inherited_attribute_over_class_attribute(self):
+        class Child(Thing):
+            str_attr = 'plain class attribute'
+
+        self.assertIs(Thing.str_attr, Child.str_attr)
+
+    def test_many_subclasses(self):
+        # creating a class does not depend on the number of existing classes
+        classes = []
+
+        for index in range(200):
+            item_type = type(Object)('Item{}'.format(index), (Thing,), {})
+            classes.append(type(KeyedList)('Items{}'.format(index), (KeyedList,), {
+                'key_attr': Thing.name, 'item_type': item_type}))
+
+        self.assertEqual(list(Thing.attributes), list(classes[-1].item_type.attributes))
+        self.assertEqual(1, len(classes[-1].load(u'a: {int_attr: 1, str_attr: s, float_attr: 1.0}\n')))
+
 
 class ReqOptPair(Object):
     name = Attribute(type=str)
@@ -63,6 +63,46 @@ class Test_NamedKennel(unittest.TestCase):
             kennel[5] = poss
 
 
+class Test_mapping_methods(unittest.TestCase):
+
+    def test_map_methods(self):
+        kennel = Kennel.load(kennel_yaml)
+        self.assertEqual(['Lucy', 'Possum'], list(kennel.keys()))
+        self.assertEqual([5, 5], [a.age for a in kennel.values()])
+        self.assertEqual('Lucy', kennel.get('Lucy').name)
+        self.assertIsNone(kennel.get('Maggie'))
+        self.assertEqual(2, len(kennel.items()))
+        lucy = kennel.pop('Lucy')
+        self.assertNotIn('Lucy', kennel)
+        self.assertIs(lucy, kennel.setdefault('Lucy', lucy))
+        kennel.clear()
+        self.assertEqual(0, len(kennel))
+
+    def test_ordered_dict_methods(self):
+        kennel = Kennel.load(kennel_yaml)
+        copied = kennel.copy()
+        self.assertEqual(['Lucy', 'Possum'], list(copied))
+        self.assertIs(kennel['Lucy'], copied['Lucy'])
+        self.assertEqual({'a': 0, 'b': 0}, kennel.fromkeys('ab', 0))
+        kennel.move_to_end('Lucy')
+        self.assertEqual(['Possum', 'Lucy'], list(kennel))
+        kennel.move_to_end('Lucy', last=False)
+        self.assertEqual(['Lucy', 'Possum'], list(kennel))
+        self.assertEqual('Lucy', kennel.popitem(last=False)[0])
+        self.assertEqual('Possum', kennel.popitem()[0])
+
+        with self.assertRaises(KeyError):
+            kennel.move_to_end('Maggie')
+
+    def test_keyed_list_update_checks_keys(self):
+        poss = Animal('Possum', 5)
+        kennel = NamedKennel()
+        kennel.update({'Possum': poss})
+        self.assertIs(poss, kennel['Possum'])
+        with self.assertRaises(KeyError):
+            kennel.update(Lucy=poss)
+
+
 class Test_from_yaml(unittest.TestCase):
 
     def test_bad_type(self):
@@ -91,6 +131,72 @@ class Test_from_yaml(unittest.TestCase):
             NamedKennel.load('{Lucy: }')
 
 
+class Test_validate(unittest.TestCase):
+
+    def test_valid(self):
+        self.assertEqual([], Kennel.validate(kennel_yaml))
+        self.assertEqual([], NamedKennel.validate(named_kennel_yaml))
+
+    def test_invalid(self):
+        # one per missing name
+        self.assertEqual(2, len(Kennel.validate(named_kennel_yaml)))
+        self.assertEqual(1, len(NamedKennel.validate('{Lucy: }')))
+        self.assertEqual(1, len(NamedKennel.validate('{Lucy: {age: old}}')))
+
+
+class Host(Object):
+
+    name = Attribute(type=str)
+
+    region = Attribute(type=str, intern=True)
+
+    zone = Attribute(type=str)
+
+
+class Hosts(KeyedList):
+
+    key_attr = Host.name
+
+    item_type = Host
+
+
+class Inventory(Map):
+
+    key_type = Typed(str)
+
+    value_type = Hosts
+
+
+class Test_intern(unittest.TestCase):
+
+    inventory = '''
+web:
+  web-1: {region: us-east, zone: us-east-a}
+  web-2: {region: us-east, zone: us-east-a}
+db:
+  db-1: {region: us-east, zone: us-east-a}
+'''
+
+    def test_attribute_values(self):
+        inv = Inventory.load(self.inventory)
+        hosts = list(inv['web'].values()) + list(inv['db'].values())
+        self.assertTrue(all(h.region is hosts[0].region for h in hosts))
+        self.assertFalse(hosts[0].zone is hosts[1].zone)
+
+    def test_keys(self):
+        table = {}
+        first = Inventory.load(self.inventory, intern=table)
+        second = Inventory.load(self.inventory, intern=table)
+        self.assertIs(list(first.keys())[0], list(second.keys())[0])
+        self.assertIs(first['db']['db-1'].name, second['db']['db-1'].name)
+        self.assertIs(first['db']['db-1'].name, list(second['db'].keys())[0])
+        self.assertIs(first['db']['db-1'].region, second['web']['web-1'].region)
+        self.assertIn('us-east', table)
+        self.assertNotIn('us-east-a', table)
+
+        self.assertEqual(self.inventory.lstrip(), Inventory.dump(first))
+
+
 class Test_to_yaml(unittest.TestCase):
 
     def setUp(self):
@@ -149,6 +255,21 @@ paws for fun:
         actual = Kennels.dump(kennels)
         self.assertEqual(Test_two_way.nested_named_kennel, actual.strip())
 
+    def test_comments_after_keys(self):
+        class Owner(Object):
+            name = Attribute(type=str)
+            pets = Attribute(type=NamedKennel)
+
+        class PetMap(Map):
+            key_type = Typed(str)
+            value_type = Owner
+
+        for cls, text in ((NamedKennel, 'Lucy:  # c0\n  age: 5\n'),
+                          (Kennel, 'Lucy:  # c0\n  name: Lucy\n  age: 5\n'),
+                          (PetMap, 'G:  # c0\n  name: G\n  pets:  # c1\n    Lucy:  # c2\n'
+                                   '      age: 5\n')):
+            self.assertEqual(text, cls.dump(cls.load(text)))
+
     pet_map1 = """
 G:
   name: G
@@ -0,0 +1,85 @@
+import unittest
+import copy
+
+import yamlize
+from yamlize import Object
+from yamlize import Attribute
+from yamlize import KeyedList
+from yamlize import Sequence
+from yamlize.memory_report import CATEGORIES
+
+
+class Tool(Object):
+    name = Attribute(type=str)
+    weight = Attribute(type=float)
+    length = Attribute(type=float, default=1.0)
+
+
+class Tools(KeyedList):
+    key_attr = Tool.name
+    item_type = Tool
+
+
+class Toolboxes(Sequence):
+    item_type = Tools
+
+
+class Test_memory_report(unittest.TestCase):
+
+    merged = u'''
+hammer: &hammer
+  weight: 2.5   # heavy
+  length: 0.5
+mallet:
+  <<: *hammer
+  weight: 3.5
+'''
+
+    def test_totals(self):
+        report = yamlize.memory_report(Tools.load(self.merged))
+        self.assertEqual(set(CATEGORIES), set(report.by_category))
+        self.assertEqual(report.total, sum(report.by_category.values()))
+        self.assertEqual(report.total, sum(stat['bytes'] for stat in report.by_class.values()))
+        self.assertEqual(2, report.by_class['Tool']['count'])
+        self.assertEqual(1, report.by_class['Tools']['count'])
+
+    def test_categories(self):
+        report = yamlize.memory_report(Tools.load(self.merged))
+        for category in ('containers', 'values', 'round_trip_data', 'kids_rtd', 'merge_links'):
+            self.assertGreater(report.by_category[category], 0, category)
+
+    def test_without_round_trip_data(self):
+        tools = Tools.load(self.merged)
+        report = yamlize.memory_report(copy.deepcopy(tools))
+        self.assertEqual(0, report.by_category['kids_rtd'])
+        self.assertEqual(0, report.by_category['merge_links'])
+        self.assertLess(report.total, yamlize.memory_report(tools).total)
+
+    def test_aliases_are_counted_once(self):
+        boxes = Toolboxes.load(u'''
+- &box
+  hammer: {weight: 2.5}
+  saw: {weight: 1.0}
+- *box
+- *box
+''')
+        self.assertIs(boxes[0], boxes[2])
+        report = yamlize.memory_report(boxes)
+        self.assertEqual(1, report.by_class['Tools']['count'])
+        self.assertEqual(2, report.by_class['Tool']['count'])
+
+        single = yamlize.memory_report(Toolboxes.load(u'''
+- hammer: {weight: 2.5}
+  saw: {weight: 1.0}
+'''))
+        # the aliases only add the anchor and the longer list of the Sequence
+        self.assertLess(report.total, 1.5 * single.total)
+
+    def test_table(self):
+        lines = yamlize.memory_report(Tools.load(self.merged)).table().splitlines()
+        self.assertEqual(['class', 'count', 'bytes'], lines[0].split())
+        self.assertEqual('total', lines[-1].split()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import threading
+
+import yamlize
+from yamlize import Object
+from yamlize import Attribute
+from yamlize import Sequence
+
+
+def positive(self, value):
+    return value > 0
+
+
+class Leg(Object):
+    length = Attribute(type=float, validator=positive)
+
+
+class Legs(Sequence):
+    item_type = Leg
+
+
+class Table(Object):
+    name = Attribute(type=str)
+    legs = Attribute(type=Legs)
+
+
+class Point(Object):
+    """Loaded from a flow sequence, without calling ``Object.from_yaml``."""
+    x = Attribute(type=int)
+    y = Attribute(type=int)
+
+    @classmethod
+    def from_yaml(cls, loader, node, round_trip_data=None):
+        self = cls()
+        self.x, self.y = loader.construct_object(node, deep=True)
+        return self
+
+
+class Points(Sequence):
+    item_type = Point
+
+    @classmethod
+    def from_yaml(cls, loader, node, round_trip_data=None):
+        return Sequence.from_yaml.__func__(cls, loader, node, round_trip_data)
+
+
+_point_from_yaml = Point.__dict__['from_yaml']
+_points_from_yaml = Points.__dict__['from_yaml']
+
+
+TABLE = '''
+name: kitchen
+legs:
+- length: 1.0
+- length: 2.0
+- length: 3.0
+'''
+
+
+class Test_profile(unittest.TestCase):
+
+    def test_counts_classes_and_attributes(self):
+        with yamlize.profile() as p:
+            Table.load(TABLE)
+
+        stats = p.as_dict()
+        self.assertEqual(1, stats['Table']['construct']['calls'])
+        self.assertEqual(1, stats['Legs']['construct']['calls'])
+        self.assertEqual(3, stats['Leg']['construct']['calls'])
+        self.assertEqual(3, stats['Leg.length']['construct']['calls'])
+        self.assertEqual(3, stats['Leg.length']['validate']['calls'])
+        self.assertEqual(1, stats['Table.name']['construct']['calls'])
+        self.assertNotIn('dump', stats['Table'])
+
+    def test_dump(self):
+        table = Table.load(TABLE)
+
+        with yamlize.profile() as p:
+            Table.dump(table)
+
+        stats = p.as_dict()
+        self.assertEqual(1, stats['Table']['dump']['calls'])
+        self.assertEqual(3, stats['Leg.length']['dump']['calls'])
+        self.assertNotIn('construct', stats['Table'])
+
+    def test_nested_time_is_not_double_counted(self):
+        with yamlize.profile() as p:
+            Table.load(TABLE)
+
+        stats = p.as_dict()
+        self.assertGreaterEqual(stats['Table']['construct']['seconds'],
+                                stats['Leg']['construct']['seconds'])
+
+    def test_table(self):
+        with yamlize.profile() as p:
+            Table.load(TABLE)
+
+        lines = p.table().splitlines()
+        self.assertEqual(['name', 'event', 'calls', 'seconds'], lines[0].split())
+        self.assertIn(['Leg', 'construct', '3'], [line.split()[:3] for line in lines])
+
+    def test_threads(self):
+        def load():
+            for _ in range(20):
+                Table.load(TABLE)
+
+        with yamlize.profile() as p:
+            threads = [threading.Thread(target=load) for _ in range(4)]
+
+            for thread in threads:
+                thread.start()
+
+            for thread in threads:
+                thread.join()
+
+        stats = p.as_dict()
+        self.assertEqual(80, stats['Table']['construct']['calls'])
+        self.assertEqual(240, stats['Leg.length']['validate']['calls'])
+        self.assertGreater(stats['Table']['construct']['seconds'], 0.0)
+
+    def test_methods_are_restored(self):
+        from_yaml = Object.__dict__['from_yaml']
+        ensure_type = Attribute.__dict__['ensure_type']
+
+        with yamlize.profile():
+            self.assertIsNot(from_yaml, Object.__dict__['from_yaml'])
+
+        self.assertIs(from_yaml, Object.__dict__['from_yaml'])
+        self.assertIs(ensure_type, Attribute.__dict__['ensure_type'])
+
+    def test_overrides(self):
+        with yamlize.profile() as p:
+            Point.load(u'[1, 2]')
+            Points.load(u'- [1, 2]\n- [3, 4]\n')
+
+        stats = p.as_dict()
+        self.assertEqual(3, stats['Point']['construct']['calls'])
+        # an override that calls the base method is only counted once
+        self.assertEqual(1, stats['Points']['construct']['calls'])
+        self.assertIs(Point.__dict__['from_yaml'], _point_from_yaml)
+        self.assertIs(Points.__dict__['from_yaml'], _points_from_yaml)
+
+    def test_nested_profiles_raise(self):
+        with yamlize.profile():
+            with self.assertRaises(RuntimeError):
+                with yamlize.profile():
+                    pass
+
+        # the outer profile can still be used again afterwards
+        with yamlize.profile() as p:
+            Table.load(TABLE)
+
+        self.assertIn('Table', p.as_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+
+import yamlize
+from yamlize import Attribute
+from yamlize import IntList
+from yamlize import KeyedList
+from yamlize import Object
+from yamlize import Sequence
+from yamlize.querying import compile_query
+
+
+class Port(Object):
+    port = Attribute(type=int)
+    protocol = Attribute(key='proto', type=str, default='tcp')
+    note = Attribute(key='port-note', type=str, default=None)
+
+
+class Ports(Sequence):
+    item_type = Port
+
+
+class Service(Object):
+    name = Attribute(type=str)
+    ports = Attribute(type=Ports, default=None)
+    replicas = Attribute(type=IntList, default=None)
+    owner = Attribute(type=str, default=None)
+    extra = Attribute(default=None)
+
+
+class Services(KeyedList):
+    key_attr = Service.name
+    item_type = Service
+
+
+SERVICES = u'''
+web:
+  owner: web team
+  ports:
+  - &http {port: 80}
+  - {port: 443, port-note: tls}
+  - {port: 53, proto: udp}
+  replicas: [1, 2, 3]
+dns:
+  ports: [*http, {port: 53, proto: udp}]
+  extra: {port: 5353, zones: [a, b]}
+db:
+  owner: db team
+'''
+
+QUERIES = [
+    ('web.owner', ['web team']),
+    ("['web'].ports[-1].port", [53]),
+    ('web.ports[*].protocol', ['tcp', 'tcp', 'udp']),
+    ('web.ports[*].proto', ['tcp', 'tcp', 'udp']),
+    ('[*].owner', ['web team', None, 'db team']),
+    ('*.ports[?protocol == "udp"].port', [53, 53]),
+    ("$[*].ports[?proto != 'udp'].port", [80, 443, 80]),
+    ('web.ports[?port < 443].port', [80, 53]),
+    ('web.replicas[?@ > 1]', [2, 3]),
+    ('[?extra.zones].name', ['dns']),
+    ('[?owner != null].name', ['web', 'db']),
+    ("[?extra.zones[1] == 'b'].name", ['dns']),
+    ("[?extra.port == 5353].name", ['dns']),
+    ('..port', [80, 443, 53, 53, 5353]),
+    ('..proto', ['tcp', 'tcp', 'udp', 'udp']),
+    ('..protocol', ['tcp', 'tcp', 'udp', 'udp']),
+    ('..port-note', [None, 'tls', None, None]),
+    ('..note', [None, 'tls', None, None]),
+    ("..[?port-note == 'tls'].port", [443]),
+    ('..zones', [['a', 'b']]),
+    ('..zones[0]', ['a']),
+    ('dns..[?port == 80].port', [80]),
+    ('db.ports', [None]),
+    ('missing.ports', []),
+    ('web.replicas.0', [1]),
+]
+
+
+class Test_query(unittest.TestCase):
+
+    def setUp(self):
+        self.services = Services.load(SERVICES)
+
+    def test_queries(self):
+        for path, expected in QUERIES:
+            self.assertEqual(expected, yamlize.query(self.services, path), path)
+
+    def test_index(self):
+        index = yamlize.QueryIndex(self.services)
+
+        for path, expected in QUERIES:
+            self.assertEqual(yamlize.query(self.services, path), index.query(path), path)
+
+    def test_aliases(self):
+        ports = yamlize.query(self.services, '..ports[*]')
+        # the anchored port is found through both services, but only walked once
+        self.assertIs(ports[0], ports[3])
+        self.assertEqual([80, 443, 53, 53, 5353], yamlize.query(self.services, '..port'))
+
+    def test_objects(self):
+        web = yamlize.query(self.services, 'web')[0]
+        self.assertIs(self.services['web'], web)
+        self.assertEqual([web], yamlize.query(self.services, "[?ports[1].port == 443]"))
+        # every attribute that has a value, including defaults
+        self.assertEqual(['web', web.ports, web.replicas, 'web team', None],
+                         yamlize.query(web, '*'))
+
+        # attributes that are not set, and have no default, are skipped
+        service = Service()
+        self.assertEqual([], yamlize.query(service, 'name'))
+        self.assertEqual([None, None, None, None], yamlize.query(service, '*'))
+
+    def test_index_snapshot(self):
+        index = yamlize.QueryIndex(self.services)
+        self.services['web'].ports.append(Port.load(u'port: 8080'))
+        self.assertEqual([80, 443, 53], index.query('web.ports[*].port'))
+        self.assertEqual([80, 443, 53, 8080], yamlize.query(self.services, 'web.ports[*].port'))
+        self.assertEqual([8080], yamlize.QueryIndex(self.services).query('..[?port > 5353].port'))
+
+    def test_compiled(self):
+        steps = compile_query('web.ports[?port == 80]')
+        self.assertIs(steps, compile_query('web.ports[?port == 80]'))
+        self.assertEqual(1, len(yamlize.query(self.services, steps)))
+
+    def test_invalid(self):
+        for path in ('web.', 'web[', 'web[?port ==]', 'web..', 'web ports', '[?port == x]',
+                     'web.ports{0}', '[?ports..port]'):
+            with self.assertRaises(ValueError, msg=path):
+                yamlize.query(self.services, path)
+
+
+if __name__ == '__main__':
+    unittest.main()
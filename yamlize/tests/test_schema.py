@@ -0,0 +1,153 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+import importlib
+import pickle
+
+import ruamel.yaml
+
+from yamlize import classes_from_schema
+from yamlize import schema_source
+from yamlize import KeyedList
+from yamlize import Map
+from yamlize import Object
+from yamlize import Sequence
+from yamlize import StrList
+from yamlize import YamlizingError
+
+
+SCHEMA = u'''
+Person:
+  slots: true
+  doc: Someone with friends.
+  attributes:
+    name: str
+    age: {type: int, default: 0}
+    friends: {type: People, default: null}
+    nick: {type: str, key: nick-name, default: null}
+    tags: {type: StrList, default: null}
+People:
+  kind: keyed_list
+  key_attr: name
+  item_type: Person
+Tree:
+  attributes:
+    value: float
+    children: {type: Forest, default: null}
+Forest:
+  kind: sequence
+  item_type: Tree
+Scores:
+  kind: map
+  key_type: str
+  value_type: float
+  attributes:
+    total: {type: float, default: 0.0}
+'''
+
+PEOPLE = u'''bob:
+  age: 3
+  friends:
+    al: {nick-name: x}  # comment
+'''
+
+
+class Test_classes_from_schema(unittest.TestCase):
+
+    def test_kinds(self):
+        classes = classes_from_schema(SCHEMA)
+        self.assertEqual(['Person', 'People', 'Tree', 'Forest', 'Scores'], list(classes))
+        self.assertTrue(issubclass(classes['Person'], Object))
+        self.assertTrue(issubclass(classes['People'], KeyedList))
+        self.assertTrue(issubclass(classes['Forest'], Sequence))
+        self.assertTrue(issubclass(classes['Scores'], Map))
+        self.assertIs(StrList, classes['Person'].tags.type)
+        self.assertEqual('Someone with friends.', classes['Person'].__doc__)
+        self.assertFalse(hasattr(classes['Person'](), '__dict__'))
+
+    def test_recursive_types(self):
+        classes = classes_from_schema(SCHEMA)
+        people = classes['People'].load(PEOPLE)
+        self.assertEqual('x', people['bob'].friends['al'].nick)
+        self.assertEqual(PEOPLE, classes['People'].dump(people))
+
+        forest = classes['Forest'].load(u'- {value: 1, children: [{value: 2}]}')
+        self.assertEqual(2.0, forest[0].children[0].value)
+
+    def test_map(self):
+        scores = classes_from_schema(SCHEMA)['Scores'].load(u'total: 3\na: 1\nb: 2\n')
+        self.assertEqual((3.0, 2.0), (scores.total, scores['b']))
+
+    def test_cache(self):
+        first = classes_from_schema(SCHEMA)
+        # the same schema as a dict, and as JSON with another key order
+        schema = ruamel.yaml.YAML(typ='safe').load(SCHEMA)
+        second = classes_from_schema(schema)
+        third = classes_from_schema(json.dumps(dict(reversed(list(schema.items())))))
+        self.assertIs(first['Person'], second['Person'])
+        self.assertIs(first['Person'], third['Person'])
+
+        schema['Person']['attributes']['age']['default'] = 1
+        self.assertIsNot(first['Person'], classes_from_schema(schema)['Person'])
+
+    def test_errors(self):
+        bad_schemas = [
+            u'[1, 2]',
+            u'Person: {kind: table}',
+            u'Person: {attributes: {name: blob}}',
+            u'Person: {attributes: {name: {type: str, optional: true}}}',
+            u'Person: {attributes: {class: str}}',
+            u'class: {attributes: {name: str}}',
+            u'People: {kind: keyed_list, key_attr: name, item_type: Person}',
+            u'People: {kind: keyed_list, key_attr: nope, item_type: Person}\n'
+            u'Person: {attributes: {name: str}}',
+            u'Person: {colour: red}',
+        ]
+        # names the generated module needs, or that are types of the schema
+        bad_schemas.extend(u'{}: {{attributes: {{name: str}}}}'.format(name) for name in (
+            'yamlize', 'str', 'int', 'float', 'bool', 'SCHEMA_FINGERPRINT', 'any', 'IntList',
+            '__name__'))
+
+        for schema in bad_schemas:
+            with self.assertRaisesRegex(YamlizingError, 'Invalid schema'):
+                classes_from_schema(schema)
+
+    def test_pickle(self):
+        classes = classes_from_schema(SCHEMA)
+        self.assertNotEqual('yamlize.schema', classes['People'].__module__)
+
+        people = classes['People'].load(PEOPLE)
+        copied = pickle.loads(pickle.dumps(people))
+        self.assertIs(classes['People'], type(copied))
+        self.assertEqual(3, copied['bob'].age)
+
+
+class Test_schema_source(unittest.TestCase):
+
+    def test_import(self):
+        source = schema_source(SCHEMA)
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'generated_people.py')
+
+        with open(path, 'w') as stream:
+            stream.write(source)
+
+        sys.path.insert(0, directory)
+
+        try:
+            module = importlib.import_module('generated_people')
+        finally:
+            sys.path.remove(directory)
+            sys.modules.pop('generated_people', None)
+            os.remove(path)
+
+        people = module.People.load(PEOPLE)
+        self.assertEqual(PEOPLE, module.People.dump(people))
+        self.assertEqual(64, len(module.SCHEMA_FINGERPRINT))
+        self.assertEqual(source, schema_source(SCHEMA))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -124,6 +124,16 @@ class Test_two_way(unittest.TestCase):
         with self.assertRaises(TypeError):
             StrList('a b c')
 
+    def test_equal_scalars_keep_their_style(self):
+        styled = "- 'a'\n- \"a\"\n- a  # plain\n"
+        self.assertEqual(styled, StrList.dump(StrList.load(styled)))
+
+    def test_round_trip_data_is_only_stored_when_present(self):
+        plain = StrList.load('[a, b]')._Sequence__round_trip_data
+        self.assertIsNone(plain._kids_rtd)
+        self.assertIs(plain[0], plain['anything'])
+        self.assertFalse(plain['a'])
+
     test_yaml = ('# no friends :(\n'
                  '- name: Lucy # no friends\n'
                  '- &luna\n'
@@ -0,0 +1,185 @@
+import unittest
+import io
+import threading
+
+import ruamel.yaml
+
+from yamlize import Object
+from yamlize import Attribute
+from yamlize import LoadStats
+from yamlize import Sequence
+from yamlize import Session
+from yamlize import YamlizingError
+from yamlize import YamlizingErrorGroup
+
+
+class CountingLoader(ruamel.yaml.RoundTripLoader):
+    created = 0
+
+    def __init__(self, stream):
+        type(self).created += 1
+        ruamel.yaml.RoundTripLoader.__init__(self, stream)
+
+
+class CountingDumper(ruamel.yaml.RoundTripDumper):
+    created = 0
+
+    def __init__(self, stream):
+        type(self).created += 1
+        ruamel.yaml.RoundTripDumper.__init__(self, stream)
+
+
+class Point(Object):
+    x = Attribute(type=int)
+    y = Attribute(type=int, default=0)
+
+
+class Points(Sequence):
+    item_type = Point
+
+
+POINTS = u'''# points
+- {x: 1, y: 2}  # first
+- &origin
+  x: 0
+- *origin
+'''
+
+
+class Flag(Object):
+    v = Attribute()
+
+
+class Test_Session(unittest.TestCase):
+
+    def setUp(self):
+        CountingLoader.created = 0
+        CountingDumper.created = 0
+        self.session = Session(CountingLoader, CountingDumper)
+
+    def test_reuses_loader(self):
+        for _ in range(3):
+            points = self.session.load(Points, POINTS)
+            self.assertEqual([(1, 2), (0, 0), (0, 0)], [(p.x, p.y) for p in points])
+
+        self.assertEqual(0, len(self.session.validate(Points, POINTS)))
+        self.assertEqual(1, CountingLoader.created)
+
+    def test_reuses_dumper(self):
+        for _ in range(3):
+            self.assertEqual(POINTS, self.session.dump(Points, Points.load(POINTS)))
+
+        self.assertEqual(1, CountingDumper.created)
+
+    def test_round_trip(self):
+        # comments and anchors of one document do not leak into the next
+        first = self.session.load(Points, POINTS)
+        second = self.session.load(Points, u'- {x: 5}\n')
+        self.assertEqual(POINTS, self.session.dump(Points, first))
+        self.assertEqual(u'- {x: 5}\n', self.session.dump(Points, second))
+        self.assertEqual(POINTS, self.session.dump(Points, self.session.load(Points, POINTS)))
+
+    def test_yaml_version(self):
+        # the %YAML directive of one document does not apply to the next
+        self.assertIs(True, self.session.load(Flag, u'%YAML 1.1\n---\nv: yes\n').v)
+        self.assertEqual('yes', self.session.load(Flag, u'v: yes\n').v)
+        self.assertEqual(1, CountingLoader.created)
+
+    def test_reset_loader_state(self):
+        from yamlize.session import _reset_loader
+
+        loader = ruamel.yaml.RoundTripLoader(u'%YAML 1.1\n---\n- &a {x: yes}\n- *a\n- !!str b\n')
+        loader.get_single_node()
+        _reset_loader(loader, u'- 1\n')
+        fresh = ruamel.yaml.RoundTripLoader(u'- 1\n')
+
+        for name, value in vars(fresh).items():
+            if value is fresh or name in ('state', '_version_implicit_resolver'):
+                continue
+
+            self.assertEqual(repr(value), repr(vars(loader)[name]), name)
+
+    def test_dump_to_stream(self):
+        points = self.session.load(Points, POINTS)
+        stream = io.StringIO()
+        self.assertIsNone(self.session.dump(Points, points, stream))
+        self.assertEqual(POINTS, stream.getvalue())
+
+    def test_failed_load(self):
+        with self.assertRaises(ruamel.yaml.YAMLError):
+            self.session.load(Points, u'- {x: 1}\n- {x: [1, \n')
+
+        with self.assertRaises(YamlizingError):
+            self.session.load(Points, u'- {x: a}\n')
+
+        self.assertEqual(1, len(self.session.load(Points, u'- {x: 1}\n')))
+        self.assertEqual(1, CountingLoader.created)
+
+    def test_load_options(self):
+        with self.assertRaises(YamlizingErrorGroup):
+            self.session.load(Points, u'- {x: a}\n- {x: b}\n', collect_errors=True)
+
+        # options of a previous load are not left on the loader
+        with self.assertRaises(YamlizingError) as ctx:
+            self.session.load(Points, u'- {x: a}\n- {x: b}\n')
+
+        self.assertNotIsInstance(ctx.exception, YamlizingErrorGroup)
+
+    def test_stats_loader_not_reused(self):
+        stats = LoadStats()
+        self.session.load(Points, POINTS, stats=stats)
+        self.session.load(Points, POINTS)
+        self.session.load(Points, POINTS)
+        self.assertEqual(2, CountingLoader.created)
+        self.assertGreater(stats.counts['tokens'], 0)
+
+    def test_nested_load(self):
+        session = self.session
+
+        class Nested(Object):
+            text = Attribute(type=str)
+
+            @classmethod
+            def from_yaml(cls, loader, node, round_trip_data=None):
+                self = super(Nested, cls).from_yaml(loader, node, round_trip_data)
+                self.points = session.load(Points, self.text)
+                return self
+
+        nested = session.load(Nested, u'text: "- {x: 3}"\n')
+        self.assertEqual(3, nested.points[0].x)
+        self.assertEqual(2, CountingLoader.created)
+        session.load(Nested, u'text: "- {x: 4}"\n')
+        self.assertEqual(2, CountingLoader.created)
+
+    def test_threads(self):
+        loaders = set()
+        barrier = threading.Barrier(4)
+
+        class RecordingLoader(ruamel.yaml.RoundTripLoader):
+            def __init__(self, stream):
+                loaders.add(id(self))
+                ruamel.yaml.RoundTripLoader.__init__(self, stream)
+
+        session = Session(RecordingLoader)
+        results = []
+
+        def work():
+            barrier.wait()
+
+            for _ in range(5):
+                results.append(session.load(Points, POINTS)[0].y)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([2] * 20, results)
+        self.assertEqual(4, len(loaders))
+
+
+if __name__ == '__main__':
+    unittest.main()
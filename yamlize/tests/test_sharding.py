@@ -0,0 +1,191 @@
+import unittest
+import io
+import os
+import pickle
+import shutil
+import tempfile
+from unittest import mock
+
+import yamlize
+from yamlize import Attribute
+from yamlize import KeyedList
+from yamlize import Map
+from yamlize import Object
+from yamlize import StrList
+from yamlize import Typed
+from yamlize import YamlizingError
+from yamlize import sharding
+
+
+class Item(Object):
+    name = Attribute(type=str)
+    site = Attribute(type=str)
+    count = Attribute(type=int, default=1)
+    tags = Attribute(type=StrList, default=None)
+
+
+class Inventory(KeyedList):
+    key_attr = Item.name
+    item_type = Item
+
+
+class Counts(Map):
+    key_type = Typed(str)
+    value_type = Typed(int)
+    label = Attribute(type=str, default='')
+
+
+INVENTORY = u'''# inventory
+bolt: {site: north, count: 100}  # small
+nut:
+  site: south
+  count: 200
+  tags: [m8, steel]
+washer: {site: north}
+base: &base
+  site: east
+  count: 3
+copy:
+  <<: *base
+  count: 4
+'''
+
+COUNTS = u'''# counts
+label: stock
+a: 1  # one
+b: 2
+c: 3
+'''
+
+
+class Test_sharding(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def round_trip(self, obj, processes=1, **kwargs):
+        yamlize.dump_sharded(obj, self.directory, processes=processes, **kwargs)
+        return yamlize.load_sharded(type(obj), self.directory, processes=processes)
+
+    def load_shard(self, path):
+        with open(path) as stream:
+            return Inventory.load(stream)
+
+    def test_round_trip(self):
+        counts = self.round_trip(Counts.load(COUNTS), shards=2)
+        self.assertEqual(COUNTS, Counts.dump(counts))
+        self.assertEqual('stock', counts.label)
+
+    def test_processes(self):
+        inventory = Inventory.load(INVENTORY)
+        loaded = self.round_trip(inventory, processes=2, shard_by='site')
+        self.assertEqual(['bolt', 'nut', 'washer', 'base', 'copy'], list(loaded.keys()))
+        self.assertEqual(INVENTORY, Inventory.dump(loaded))
+
+    def test_prototype_merges(self):
+        inventory = Inventory.load(INVENTORY, prototype_merges=True)
+        yamlize.dump_sharded(inventory, self.directory, shard_by='site', processes=2)
+        loaded = yamlize.load_sharded(Inventory, self.directory, processes=2,
+                                      prototype_merges=True)
+        self.assertEqual('east', loaded['copy'].site)
+        self.assertEqual(Inventory.dump(inventory), Inventory.dump(loaded))
+
+    def test_shard_by(self):
+        inventory = Inventory.load(INVENTORY)
+        paths = yamlize.dump_sharded(inventory, self.directory, shard_by='site', processes=1)
+        self.assertEqual(3, len(paths))
+        self.assertEqual(['bolt', 'washer'], list(self.load_shard(paths[0]).keys()))
+
+        paths = yamlize.dump_sharded(inventory, self.directory, processes=1,
+                                     shard_by=lambda key, item: key == 'copy')
+        self.assertEqual(2, len(paths))
+
+        # a merge parent in another shard is written out in full
+        copy = self.load_shard(paths[1])['copy']
+        self.assertEqual(('east', 4), (copy.site, copy.count))
+
+    def test_unpicklable_classes(self):
+        class LocalItem(Object):
+            name = Attribute(type=str)
+            site = Attribute(type=str)
+
+        class LocalInventory(KeyedList):
+            key_attr = LocalItem.name
+            item_type = LocalItem
+
+        schema = yamlize.classes_from_schema(u'''
+Item:
+  attributes: {name: str, site: str}
+Inventory:
+  kind: keyed_list
+  key_attr: name
+  item_type: Item
+''')
+
+        self.assertTrue(sharding._picklable(Inventory))
+        self.assertFalse(sharding._picklable(LocalInventory))
+        # schema classes are defined in a module the forked workers inherit
+        self.assertTrue(sharding._picklable(schema['Inventory']))
+
+        # local classes are loaded in this process, as the workers cannot send the objects back
+        for cls in (LocalInventory, schema['Inventory']):
+            inventory = cls.load(u'bolt: {site: north}\nnut: {site: south}\n')
+            loaded = self.round_trip(inventory, processes=2, shard_by='site')
+            self.assertEqual(cls.dump(inventory), cls.dump(loaded))
+            self.assertIsInstance(loaded['nut'], cls.item_type)
+
+    def test_replace(self):
+        first = yamlize.dump_sharded(Inventory.load(INVENTORY), self.directory, shards=2)
+        second = yamlize.dump_sharded(Inventory.load(INVENTORY), self.directory, shard_by='site')
+        # the previous shards are removed once the index lists the new ones
+        self.assertEqual([], [path for path in first if os.path.exists(path)])
+        self.assertEqual(2, len(os.listdir(self.directory)))
+
+        def interrupted(work, index):
+            raise KeyboardInterrupt
+
+        with mock.patch.object(sharding, '_dump_shard', interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                yamlize.dump_sharded(Counts.load(COUNTS), self.directory)
+
+        # the previous index and shards are left as they were
+        self.assertTrue(all(os.path.exists(path) for path in second))
+        self.assertEqual(INVENTORY, Inventory.dump(yamlize.load_sharded(Inventory, self.directory)))
+        self.assertEqual(2, len(os.listdir(self.directory)))
+
+    def test_pickler(self):
+        inventory = Inventory.load(INVENTORY)
+        stream = io.BytesIO()
+        sharding._Pickler(stream, pickle.HIGHEST_PROTOCOL).dump(inventory)
+        loaded = pickle.loads(stream.getvalue())
+        # comments and flow style of the Sequence subclass are kept
+        self.assertIsInstance(loaded['nut'].tags, StrList)
+        self.assertEqual(INVENTORY, Inventory.dump(loaded))
+
+    def test_empty(self):
+        counts = self.round_trip(Counts())
+        self.assertEqual(0, len(counts))
+
+    def test_errors(self):
+        with self.assertRaises(TypeError):
+            yamlize.dump_sharded(yamlize.IntList([1]), self.directory)
+
+        paths = yamlize.dump_sharded(Counts.load(COUNTS), self.directory, processes=1,
+                                     shard_by=lambda key, value: value % 2)
+        os.remove(paths[1])
+
+        with self.assertRaises((IOError, OSError)):
+            yamlize.load_sharded(Counts, self.directory)
+
+        with open(paths[1], 'w') as stream:
+            stream.write(u'{}')
+
+        with self.assertRaisesRegex(YamlizingError, 'do not match'):
+            yamlize.load_sharded(Counts, self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
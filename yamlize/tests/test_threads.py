@@ -0,0 +1,111 @@
+import unittest
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from yamlize import Object
+from yamlize import Attribute
+from yamlize import KeyedList
+from yamlize import Sequence
+from yamlize import Typed
+
+
+class Quote(Object):
+    name = Attribute(type=str)
+    single = Attribute(type=str)
+    double = Attribute(type=str)
+    plain = Attribute(type=str)
+    count = Attribute(type=int, default=0)
+
+
+class Quotes(KeyedList):
+    key_attr = Quote.name
+    item_type = Quote
+
+
+class QuoteLists(Sequence):
+    item_type = Quotes
+
+
+# the same value in different styles, so a mixed up position changes the output
+QUOTES = u''.join(u"q{0}: {{single: 'v', double: \"v\", plain: v, count: {0}}}\n".format(ii)
+                  for ii in range(20))
+
+MERGED = u'''
+- base: &base {single: 'v', double: "v", plain: v}
+  merged:
+    <<: *base
+    count: 3
+- first: {single: a, double: b, plain: c}
+'''
+
+THREADS = 8
+
+ITERATIONS = 32
+
+
+class Test_threads(unittest.TestCase):
+
+    def setUp(self):
+        # switch threads as often as possible, to expose races
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-5)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_concurrently(self, func):
+        barrier = threading.Barrier(THREADS)
+
+        def run(index):
+            if index < THREADS:
+                barrier.wait()
+            return func(index)
+
+        with ThreadPoolExecutor(THREADS) as executor:
+            return list(executor.map(run, range(ITERATIONS)))
+
+    def test_load_and_dump(self):
+        for cls, document in ((Quotes, QUOTES), (QuoteLists, MERGED)):
+            results = self.run_concurrently(lambda _: cls.dump(cls.load(document)))
+            self.assertEqual([cls.dump(cls.load(document))] * ITERATIONS, results)
+
+    def test_dump_shared_object(self):
+        quotes = Quotes.load(QUOTES)
+        expected = Quotes.dump(quotes)
+        self.assertEqual(QUOTES, expected)
+        results = self.run_concurrently(lambda _: Quotes.dump(quotes))
+        self.assertEqual([expected] * ITERATIONS, results)
+
+    def test_typed_is_unique(self):
+        class Fresh(object):
+            pass
+
+        results = self.run_concurrently(lambda _: Typed(Fresh))
+        self.assertEqual(1, len(set(results)))
+        self.assertIs(Typed(Fresh), results[0])
+
+    def test_attributes_added_while_loading(self):
+        class Growing(Object):
+            name = Attribute(type=str)
+
+        class Growings(Sequence):
+            item_type = Growing
+
+        document = u'[' + u', '.join([u'{name: a}'] * 100) + u']'
+
+        def load_or_grow(index):
+            if index % 8 == 0:
+                name = 'extra{}'.format(index)
+                setattr(Growing, name, Attribute(name=name, default=None))
+                return None
+
+            return len(Growings.load(document))
+
+        results = self.run_concurrently(load_or_grow)
+        self.assertEqual({None, 100}, set(results))
+        self.assertEqual(1 + ITERATIONS // 8, len(Growing.attributes.order))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,8 +5,14 @@ import copy
 import sys
 import io
 
+from yamlize import Map
 from yamlize import Object
 from yamlize import YamlizingError
+from yamlize import YamlizingErrorGroup
+from yamlize import Sequence
+from yamlize import Typed
+from yamlize import INVALID
+from yamlize import LoadStats
 from yamlize import Attribute
 from yamlize.objects import Object
 
@@ -118,6 +124,327 @@ class Test_from_yaml(unittest.TestCase):
         self.assertIsNone(dn2.my_bool)
 
 
+class SlottedAnimal(Object, slots=True):
+
+    name = Attribute(type=str)
+
+    age = Attribute(type=int, default=None)
+
+
+class SlottedDog(SlottedAnimal, slots=True):
+
+    breed = Attribute(type=str, default='mutt')
+
+
+class Test_slots(unittest.TestCase):
+
+    def test_no_instance_dict(self):
+        self.assertEqual(('_yamlized_name', '_yamlized_age'), SlottedAnimal.__slots__)
+        self.assertEqual(('_yamlized_breed',), SlottedDog.__slots__)
+        dog = SlottedDog.load('name: Lucy\nbreed: lab')
+        self.assertFalse(hasattr(dog, '__dict__'))
+        self.assertEqual(('Lucy', None, 'lab'), (dog.name, dog.age, dog.breed))
+        self.assertEqual('name: Lucy\nbreed: lab\n', SlottedDog.dump(dog))
+
+    def test_pickle_and_copy(self):
+        dog = SlottedDog.load('name: Lucy')
+        for dog2 in (pickle.loads(pickle.dumps(dog)), copy.copy(dog), copy.deepcopy(dog)):
+            self.assertEqual('Lucy', dog2.name)
+            self.assertEqual('mutt', dog2.breed)
+            self.assertTrue(SlottedDog.breed.has_default(dog2))
+
+    def test_cannot_add_attribute_later(self):
+        with self.assertRaises(TypeError):
+            SlottedAnimal.friend = Attribute(name='friend', default=None)
+
+
+class CountedAnimal(Animal):
+
+    created = 0
+
+    def __new__(cls, *args, **kwargs):
+        CountedAnimal.created += 1
+        return Animal.__new__(cls)
+
+
+class Test_validate(unittest.TestCase):
+
+    def test_valid(self):
+        self.assertEqual([], Animal.validate('name: Possum\nage: 5'))
+        self.assertEqual([], AnimalWithFriend.validate(Test_two_way.test_yaml))
+        self.assertEqual([], TypeCheck.validate('one: 1\narray: [a, bc]'))
+
+    def test_reports_every_error(self):
+        errors = Animal.validate('name: Possum\nbonus: fail\nname: again')
+        self.assertEqual(3, len(errors))
+        self.assertTrue(all(isinstance(e, YamlizingError) for e in errors))
+        self.assertIn('bonus', str(errors[0]))
+        self.assertIn('duplicate', str(errors[1]))
+        self.assertIn("['age']", str(errors[2]))
+
+        errors = TypeCheck.validate('one: 1.5\narray: 99')
+        self.assertEqual(2, len(errors))
+        self.assertIn('line 1', str(errors[0]))
+        self.assertIn('line 2', str(errors[1]))
+
+    def test_default_none(self):
+        self.assertEqual([], AnimalWithFriend.validate('name: Possum\nfriend:'))
+
+    def test_syntax_error(self):
+        errors = Animal.validate('name: [Possum')
+        self.assertEqual(1, len(errors))
+
+    def test_does_not_construct(self):
+        CountedAnimal.created = 0
+        CountedAnimal.load('name: Possum\nage: 5')
+        self.assertEqual(1, CountedAnimal.created)
+        self.assertEqual([], CountedAnimal.validate('name: Possum\nage: 5'))
+        self.assertEqual(1, CountedAnimal.created)
+
+
+class Animals(Sequence):
+
+    item_type = Animal
+
+
+class Test_collect_errors(unittest.TestCase):
+
+    broken = u'''
+- {name: a, age: 1}
+- {name: b, age: 1, bonus: 2}
+- {age: 3}
+- [not, a, map]
+- {name: e, age: 1, name: f}
+'''
+
+    def test_first_error_by_default(self):
+        with self.assertRaises(YamlizingError) as ctx:
+            Animals.load(self.broken)
+        self.assertNotIsInstance(ctx.exception, YamlizingErrorGroup)
+
+    def test_all_errors(self):
+        with self.assertRaises(YamlizingErrorGroup) as ctx:
+            Animals.load(self.broken, collect_errors=True)
+        errors = ctx.exception.errors
+        self.assertEqual(4, len(errors))
+        for line, error in zip((3, 4, 5, 6), errors):
+            self.assertIn('line {}'.format(line), str(error))
+
+    def test_failed_attribute_is_not_missing(self):
+        with self.assertRaises(YamlizingError) as ctx:
+            TypeCheck.load('one: 1.5\narray: []', collect_errors=True)
+        self.assertNotIsInstance(ctx.exception, YamlizingErrorGroup)
+        self.assertIn('Coerced', str(ctx.exception))
+
+    def test_complex_keys(self):
+        class Key(Object):
+            a = Attribute(type=int)
+
+        class Counts(Map):
+            key_type = Key
+            value_type = Typed(int)
+
+        with self.assertRaises(YamlizingErrorGroup) as ctx:
+            Counts.load(u'? {a: 1}\n: x\n? {a: 2}\n: y\n', collect_errors=True)
+        self.assertEqual(2, len(ctx.exception.errors))
+
+        # an unhashable key is reported as an unexpected key, rather than a TypeError
+        with self.assertRaisesRegex(YamlizingError, 'found key'):
+            Animal.load(u'? [a]\n: 1\nname: a\nage: 1\n', collect_errors=True)
+
+    def test_with_deferred_validation(self):
+        class Positive(Object):
+            value = Attribute(type=int, validator=lambda self, value: value > 0)
+
+        class Positives(Sequence):
+            item_type = Positive
+
+        with self.assertRaises(YamlizingErrorGroup) as ctx:
+            Positives.load('[{value: -1}, {value: a}, {value: 1}, {}]',
+                           collect_errors=True, defer_validation=True)
+        self.assertEqual(3, len(ctx.exception.errors))
+
+    def test_valid(self):
+        self.assertEqual(2, len(Animals.load('[{name: a, age: 1}, {name: b, age: 2}]',
+                                             collect_errors=True)))
+
+
+class CustomError(YamlizingError):
+    pass
+
+
+class ArgumentsError(YamlizingError):
+
+    def __init__(self, name, count):
+        YamlizingError.__init__(self, '{} x{}'.format(name, count))
+        self.args = (name, count)
+        self.count = count
+
+
+class Test_coercion(unittest.TestCase):
+
+    def test_strong_coerce(self):
+        IntType = Typed(int)
+        self.assertEqual(81, IntType.coerce(81.0))
+        self.assertIs(INVALID, IntType.coerce(12.1))
+        self.assertIs(INVALID, IntType.coerce(None))
+        self.assertIn('not equal', str(IntType.coerce_error(12.1)))
+        self.assertIn('Failed to coerce', str(IntType.coerce_error(None)))
+
+    def test_attribute_coerce(self):
+        self.assertIs(INVALID, TypeCheck.one.coerce('a'))
+        self.assertIsNone(AnimalWithFriend.friend.coerce(None))
+        with self.assertRaisesRegex(YamlizingError, 'Failed to coerce'):
+            TypeCheck.one.ensure_type('a')
+
+    def test_try_from_yaml(self):
+        import ruamel.yaml
+        loader = ruamel.yaml.RoundTripLoader('[1, null, {name: a}]')
+        one, null, mapping = loader.get_single_node().value
+        self.assertIs(INVALID, Typed(str).try_from_yaml(loader, null, None))
+        self.assertIs(INVALID, AnimalWithFriend.try_from_yaml(loader, null, None))
+        self.assertIs(INVALID, Animals.try_from_yaml(loader, mapping, None))
+        self.assertIsInstance(AnimalWithFriend.try_from_yaml(loader, mapping, None),
+                              AnimalWithFriend)
+
+        class Scalar(Object):
+            value = Attribute(type=int)
+
+            @classmethod
+            def from_yaml(cls, loader, node, round_trip_data=None):
+                if not node.value.isdigit():
+                    raise YamlizingError('Expected digits', node)
+
+                self = cls()
+                self.value = int(node.value)
+                return self
+
+        # a custom from_yaml decides which nodes it accepts
+        self.assertEqual(1, Scalar.try_from_yaml(loader, one, None).value)
+        self.assertIs(INVALID, Scalar.try_from_yaml(loader, null, None))
+
+        def digits(loader, node, round_trip_data):
+            if not node.value.isdigit():
+                raise YamlizingError('Expected digits', node)
+
+            return int(node.value)
+
+        class Digit(int):
+            pass
+
+        # Typed caches by type, a fresh type keeps this from_yaml
+        Digits = Typed(Digit, from_yaml=digits)
+        self.assertIs(INVALID, Digits.try_from_yaml(loader, null, None))
+
+        class Optional(Object):
+            x = Attribute(type=Digits, default=None)
+
+        self.assertIsNone(Optional.load(u'x:\n').x)
+        self.assertEqual(3, Optional.load(u'x: 3\n').x)
+
+    def test_error_message_is_lazy(self):
+        class Node(object):
+            formatted = 0
+
+            @property
+            def start_mark(self):
+                Node.formatted += 1
+                return 'here'
+
+            end_mark = 'there'
+
+        error = YamlizingError('bad', Node())
+        self.assertEqual(0, Node.formatted)
+        self.assertEqual('bad\nstart: here\nend: there', str(error))
+        self.assertEqual(1, Node.formatted)
+        copied = pickle.loads(pickle.dumps(error))
+        self.assertEqual(('bad',), copied.args)
+        self.assertIsNone(copied.node)
+        self.assertEqual('bad', str(copied))
+
+    def test_pickle_error_types(self):
+        for error in (CustomError('bad'), ArgumentsError('bad', 3),
+                      YamlizingErrorGroup([YamlizingError('a'), CustomError('b')])):
+            copied = pickle.loads(pickle.dumps(error))
+            self.assertIs(type(error), type(copied))
+            self.assertEqual(str(error), str(copied))
+            self.assertEqual(error.args, copied.args)
+
+
+class Test_load_stats(unittest.TestCase):
+
+    merged = u'''
+- &a {name: a, age: 1}
+- &b {<<: *a, name: b}
+- {<<: *b, name: c}
+'''
+
+    def test_phases_and_counts(self):
+        class Positive(Object):
+            value = Attribute(type=int, validator=lambda self, value: value > 0)
+
+        stats = LoadStats()
+        Positive.load('value: 1', stats=stats)
+        self.assertEqual(1, stats.counts['validators'])
+        self.assertEqual(1, stats.counts['objects'])
+        self.assertEqual(len('value: 1'), stats.bytes)
+        self.assertEqual({'scalar': 2, 'sequence': 0, 'mapping': 1, 'alias': 0}, stats.nodes)
+        self.assertGreater(stats.counts['tokens'], 0)
+        self.assertGreater(stats.counts['events'], 0)
+        for phase in ('scan', 'parse', 'compose', 'construct', 'defaults', 'validate'):
+            self.assertGreater(stats.seconds[phase], 0.0, phase)
+        self.assertEqual(0.0, stats.seconds['merge'])
+        self.assertAlmostEqual(stats.total_seconds, sum(stats.as_dict()['seconds'].values()))
+
+    def test_merges(self):
+        stats = LoadStats()
+        animals = Animals.load(self.merged, stats=stats)
+        self.assertEqual(1, animals[2].age)
+        self.assertEqual(2, stats.counts['merges'])
+        self.assertEqual(2, stats.nodes['alias'])
+        self.assertEqual(2, stats.merge_depth)
+        self.assertGreater(stats.seconds['merge'], 0.0)
+
+    def test_hook(self):
+        recorded = []
+        Animals.load(self.merged, stats=recorded.append)
+        self.assertEqual(1, len(recorded))
+        self.assertIsInstance(recorded[0], LoadStats)
+        self.assertEqual(3, recorded[0].counts['objects'])
+
+        # the hook is called for failed loads too
+        with self.assertRaises(YamlizingError):
+            Animals.load(u'- {name: a}', stats=recorded.append)
+        self.assertEqual(2, len(recorded))
+
+        def failing_hook(load_stats):
+            raise ValueError('hook')
+
+        # the error of a failed load is not replaced by that of the hook
+        with self.assertRaisesRegex(YamlizingError, 'age'):
+            Animals.load(u'- {name: a}', stats=failing_hook)
+
+        with self.assertRaisesRegex(ValueError, 'hook'):
+            Animals.load(self.merged, stats=failing_hook)
+
+    def test_stream(self):
+        stats = LoadStats()
+        Animals.load(io.BytesIO(self.merged.encode('utf-8')), stats=stats)
+        self.assertEqual(len(self.merged), stats.bytes)
+
+    def test_deferred_validators(self):
+        class Positive(Object):
+            value = Attribute(type=int, validator=lambda self, value: value > 0)
+
+        class Positives(Sequence):
+            item_type = Positive
+
+        stats = LoadStats()
+        Positives.load('[{value: 1}, {value: 2}]', defer_validation=True, stats=stats)
+        self.assertEqual(2, stats.counts['validators'])
+        self.assertGreater(stats.seconds['validate'], 0.0)
+
+
 class Test_to_yaml(unittest.TestCase):
 
     def test_bad_type(self):
@@ -1,9 +1,56 @@
-import ruamel.yaml
-import inspect
 import io
+import sys
+import threading
 
 from yamlize.round_trip_data import RoundTripData
-from yamlize.yamlizing_error import YamlizingError
+from yamlize.yamlizing_error import YamlizingError, raise_errors
+
+
+# the ruamel.yaml module, set by _yaml on first use
+_ruamel_yaml = None
+
+
+def _yaml():
+    """
+    returns: the ``ruamel.yaml`` module, which ``import yamlize`` leaves out. It is imported on
+    first use and then kept here, since an import statement is slow to run for every node.
+    """
+    global _ruamel_yaml
+
+    if _ruamel_yaml is None:
+        import ruamel.yaml
+        _ruamel_yaml = ruamel.yaml
+
+    return _ruamel_yaml
+
+
+class INVALID:
+    """
+    Returned by the ``try_from_yaml`` and ``coerce`` methods when data cannot be converted, so the
+    caller can decide whether it is an error without an exception being raised.
+    """
+
+    def __new__(cls):
+        raise NotImplementedError
+
+    def __init__(self):
+        raise NotImplementedError
+
+
+def first_visit(loader, node):
+    """
+    Returns True the first time a node is seen by ``Yamlizable.validate_node``, so aliases and
+    recursive documents are only checked once.
+    """
+    visited = getattr(loader, 'yamlize_validated_nodes', None)
+
+    if visited is None:
+        visited = loader.yamlize_validated_nodes = set()
+    elif node in visited:
+        return False
+
+    visited.add(node)
+    return True
 
 
 class Yamlizable(object):
@@ -32,7 +79,8 @@ class Yamlizable(object):
                     while attr_name.startswith("__"):
                         attr_name = attr_name[1:]
 
-                if attr_name in state:
+                if attr_name in state or not hasattr(self, attr_name):
+                    # unassigned slots are left out, e.g. attributes with defaults
                     continue
 
                 state[attr_name] = getattr(self, attr_name)
@@ -44,23 +92,121 @@ class Yamlizable(object):
             setattr(self, k, v)
 
     @classmethod
-    def load(cls, stream, Loader=ruamel.yaml.RoundTripLoader):
+    def load(cls, stream, Loader=None, defer_validation=False, executor=None,
+             collect_errors=False, intern=False, stats=None, prototype_merges=False,
+             includes=False):
+        from yamlize.attributes import check_executor, run_deferred_validators
+        from yamlize.load_stats import LoadStats
+
+        # checked before anything is constructed
+        check_executor(executor)
+
         # can't use ruamel.yaml.load because I need a Resolver/loader for
         # resolving non-string types
-        loader = Loader(stream)
+        loader = (Loader or _yaml().RoundTripLoader)(stream)
+        errors = []
+        load_stats = None
+
+        if stats is not None:
+            # either a LoadStats to fill in, or a hook called with one
+            load_stats = stats if isinstance(stats, LoadStats) else LoadStats()
+            load_stats.attach(loader, stream)
+
+        if defer_validation:
+            loader.yamlize_deferred_validators = []
+
+        if collect_errors:
+            loader.yamlize_errors = errors
+
+        if prototype_merges:
+            loader.yamlize_prototype_merges = True
+
+        if includes:
+            from yamlize import includes as includes_module
+            includes_module.enable(loader, stream, executor)
+
+        if intern is True:
+            loader.yamlize_intern = sys.intern
+        elif isinstance(intern, dict):
+            # a dict shared by the strings of this load, or of several loads
+            loader.yamlize_intern = lambda string: intern.setdefault(string, string)
+
         try:
             node = loader.get_single_node()
-            return cls.from_yaml(loader, node, None)
+
+            if includes:
+                includes_module.prefetch(loader, node)
+
+            if load_stats is not None:
+                load_stats.finish(loader, node)
+
+            try:
+                if load_stats is None:
+                    data = cls.from_yaml(loader, node, None)
+                else:
+                    data = load_stats.timed('construct', cls.from_yaml, loader, node, None)
+            except YamlizingError as ee:
+                if not collect_errors:
+                    raise
+                errors.append(ee)
+
+            if defer_validation:
+                pending = loader.yamlize_deferred_validators
+
+                if load_stats is None:
+                    errors.extend(run_deferred_validators(pending, executor))
+                else:
+                    load_stats.counts['validators'] += len(pending)
+                    errors.extend(load_stats.timed('validate', run_deferred_validators, pending,
+                                                   executor))
+
+            raise_errors(errors)
+
+            if includes:
+                # only once the deferred validators have passed
+                includes_module.commit(loader)
+        except BaseException:
+            loader.dispose()
+
+            if load_stats is not None and load_stats is not stats:
+                try:
+                    stats(load_stats)
+                except Exception:
+                    # the error of the load is more useful than that of the hook
+                    pass
+
+            raise
+
+        loader.dispose()
+
+        if load_stats is not None and load_stats is not stats:
+            stats(load_stats)
+
+        return data
+
+    @classmethod
+    def load_all(cls, stream, Loader=None):
+        """
+        Load each document of a multi-document stream.
+
+        returns: generator of instances of this class, one per document, loaded as the generator is
+        iterated.
+        """
+        loader = (Loader or _yaml().RoundTripLoader)(stream)
+
+        try:
+            while loader.check_node():
+                yield cls.from_yaml(loader, loader.get_node(), None)
         finally:
             loader.dispose()
 
     @classmethod
-    def dump(cls, data, stream=None, Dumper=ruamel.yaml.RoundTripDumper):
+    def dump(cls, data, stream=None, Dumper=None):
         # can't use ruamel.yaml.load because I need a Resolver/loader for
         # resolving non-string types
         convert_to_yaml = stream is None
         stream = stream or io.StringIO()
-        dumper = Dumper(stream)
+        dumper = (Dumper or _yaml().RoundTripDumper)(stream)
 
         try:
             dumper._serializer.open()
@@ -79,10 +225,87 @@ class Yamlizable(object):
 
         return None
 
+    @classmethod
+    def validate(cls, stream, Loader=None):
+        """
+        Check a document against this class without constructing it.
+
+        returns: list of errors, empty if the document is valid.
+        """
+        yaml = _yaml()
+
+        loader = (Loader or yaml.RoundTripLoader)(stream)
+        errors = []
+
+        try:
+            node = loader.get_single_node()
+            cls.validate_node(loader, node, errors)
+        except yaml.error.MarkedYAMLError as ee:
+            errors.append(ee)
+        finally:
+            loader.dispose()
+
+        return errors
+
+    @classmethod
+    def aload(cls, stream, loop_executor=None, chunk_size=None, **kwargs):
+        """
+        Coroutine version of ``load``. ``stream`` is read in chunks of ``chunk_size`` (default
+        ``yamlize.aio.CHUNK_SIZE``) on the event loop, except for blocking ``read`` methods such as
+        files', which run in ``loop_executor``. The document is then loaded with
+        ``load(document, **kwargs)`` in ``loop_executor`` (the event loop's default executor when
+        None).
+        """
+        from yamlize.aio import aload
+        return aload(cls, stream, loop_executor, chunk_size, **kwargs)
+
+    @classmethod
+    def adump(cls, data, stream=None, loop_executor=None, chunk_size=None, encoding=None,
+              Dumper=None):
+        """
+        Coroutine version of ``dump``. The document is created in ``loop_executor``, then written
+        to ``stream`` in chunks of ``chunk_size`` on the event loop; ``stream.write`` may be a
+        coroutine. Pass an ``encoding`` for streams that are written bytes, such as
+        ``asyncio.StreamWriter``.
+
+        returns: None if ``stream`` was provided, otherwise string
+        """
+        from yamlize.aio import adump
+        return adump(cls, data, stream, loop_executor, chunk_size, encoding, Dumper=Dumper)
+
+    @classmethod
+    def aload_all(cls, stream, loop_executor=None, chunk_size=None, Loader=None):
+        """
+        Async iterator version of ``load_all``, each document is loaded in ``loop_executor``. When
+        stopping early, ``aclose()`` the iterator so the loader is released.
+        """
+        from yamlize.aio import aload_all
+        return aload_all(cls, stream, loop_executor, chunk_size, Loader=Loader)
+
+    @classmethod
+    def validate_node(cls, loader, node, errors):
+        # without a schema to check against, fall back to constructing the data
+        try:
+            cls.from_yaml(loader, node, RoundTripData(None))
+        except YamlizingError as ee:
+            errors.append(ee)
+
     @classmethod
     def from_yaml(cls, loader, node, round_trip_data):
         raise NotImplementedError
 
+    @classmethod
+    def try_from_yaml(cls, loader, node, round_trip_data):
+        """
+        Same as ``from_yaml``, but returns ``INVALID`` when the node cannot be converted.
+
+        Subclasses override this to detect the common failures without raising.
+        """
+        try:
+            return cls.from_yaml(loader, node, round_trip_data)
+        except YamlizingError:
+            return INVALID
+
     @classmethod
     def to_yaml(cls, dumper, self, round_trip_data):
         raise NotImplementedError
@@ -92,22 +315,32 @@ class Typed(type):
 
     __types = {}
 
+    # only held while creating a class, so two threads cannot create different classes for a type
+    __lock = threading.Lock()
+
     def __new__(mcls, type_, from_yaml=None, to_yaml=None, compare_after_cast=True):
         if issubclass(type_, Yamlizable):
             return type_
 
-        if type_ not in mcls.__types:
-            mcls.__types[type_] = type(
-                "Yamlizable" + type_.__name__,
-                (Strong,),
-                {
-                    "_Strong__type": type_,
-                    "_Strong__from_yaml": staticmethod(from_yaml),
-                    "_Strong__to_yaml": staticmethod(to_yaml),
-                    "_Strong__compare_after_cast": compare_after_cast,
-                },
-            )
-        return mcls.__types[type_]
+        strong = mcls.__types.get(type_)
+
+        if strong is not None:
+            return strong
+
+        with mcls.__lock:
+            if type_ not in mcls.__types:
+                mcls.__types[type_] = type(
+                    "Yamlizable" + type_.__name__,
+                    (Strong,),
+                    {
+                        "_Strong__type": type_,
+                        "_Strong__from_yaml": staticmethod(from_yaml),
+                        "_Strong__to_yaml": staticmethod(to_yaml),
+                        "_Strong__compare_after_cast": compare_after_cast,
+                    },
+                )
+
+            return mcls.__types[type_]
 
 
 class Strong(Yamlizable):
@@ -141,33 +374,90 @@ class Strong(Yamlizable):
         return cls.__type(obj)
 
     @classmethod
-    def from_yaml(cls, loader, node, round_trip_data):
+    def coerce(cls, data):
+        """
+        returns: data converted to the type, or ``INVALID``.
+        """
+        if isinstance(data, cls.__type):
+            return data
+
+        try:
+            new_value = cls.__type(data)  # to coerce to correct type
+        except Exception:
+            return INVALID
+
+        # common case for Attribute(type=str, default=None) ... str(None) != 'None'
+        if cls.__compare_after_cast and new_value != data:
+            return INVALID
+
+        return new_value
+
+    @classmethod
+    def coerce_error(cls, data, node=None):
+        """
+        returns: the ``YamlizingError`` explaining why ``coerce`` returned ``INVALID``.
+        """
+        try:
+            new_value = cls.__type(data)
+        except Exception:
+            return YamlizingError(
+                "Failed to coerce data `{}` to type `{}`".format(data, cls.__type), node
+            )
+
+        return YamlizingError(
+            "Coerced `{}` to `{}`, but the new value `{}` is not equal to old `{}`."
+            .format(type(data), type(new_value), new_value, data),
+            node,
+        )
+
+    @classmethod
+    def __construct(cls, loader, node, round_trip_data):
         if cls.__from_yaml is not None:
-            data = cls.__from_yaml.__call__(loader, node, round_trip_data)
-        else:
-            data = loader.construct_object(node, deep=True)
+            return cls.__from_yaml.__call__(loader, node, round_trip_data)
 
-        if not isinstance(data, cls.__type):
-            try:
-                new_value = cls.__type(data)  # to coerce to correct type
-            except Exception:
-                raise YamlizingError(
-                    "Failed to coerce data `{}` to type `{}`".format(data, cls.__type)
-                )
+        return loader.construct_object(node, deep=True)
 
-            if cls.__compare_after_cast:
-                if new_value != data:
-                    # common case for Attribute(type=str, default=None) ... str(None) != 'None'
-                    raise YamlizingError(
-                        "Coerced `{}` to `{}`, but the new value `{}` is not equal to old `{}`."
-                        .format(type(data), type(new_value), new_value, data),
-                        node,
-                    )
+    @classmethod
+    def from_yaml(cls, loader, node, round_trip_data):
+        data = cls.__construct(loader, node, round_trip_data)
+        value = cls.coerce(data)
 
-            data = new_value
+        if value is INVALID:
+            raise cls.coerce_error(data, node)
 
-        round_trip_data[data] = RoundTripData(node)
-        return data
+        round_trip_data[value] = RoundTripData(node)
+        return value
+
+    @classmethod
+    def try_from_yaml(cls, loader, node, round_trip_data):
+        try:
+            data = cls.__construct(loader, node, round_trip_data)
+        except YamlizingError:
+            # raised by a custom from_yaml
+            return INVALID
+
+        value = cls.coerce(data)
+
+        if value is not INVALID:
+            round_trip_data[value] = RoundTripData(node)
+
+        return value
+
+    @classmethod
+    def validate_node(cls, loader, node, errors):
+        if cls.__type is object and cls.__from_yaml is None:
+            # Dynamic accepts anything, no need to construct it
+            return
+
+        try:
+            data = cls.__construct(loader, node, RoundTripData(None))
+
+            if cls.coerce(data) is INVALID:
+                errors.append(cls.coerce_error(data, node))
+        except YamlizingError as ee:
+            errors.append(ee)
+        except Exception as ee:
+            errors.append(YamlizingError('Failed to read `{}`, got: {}'.format(cls, ee), node))
 
     @classmethod
     def to_yaml(cls, dumper, data, round_trip_data):
@@ -1,10 +1,67 @@
 
+from . import hooks
+
+
 class YamlizingError(Exception):
+    """
+    Error while converting between YAML and Python objects.
+
+    The node marks are only formatted when the error is shown, since rendering them is expensive
+    and many errors are caught and discarded.
+
+    Attributes
+    ----------
+    node : ruamel.yaml.Node or None
+        the node that could not be converted.
+    """
 
     def __init__(self, msg, node=None):
-        if node is not None:
-            Exception.__init__(
-                self, '{}\nstart: {}\nend: {}'.format(
-                    msg, node.start_mark, node.end_mark))
-        else:
-            Exception.__init__(self, msg)
+        Exception.__init__(self, msg)
+        self.node = node
+
+        if hooks.error_active:
+            hooks.error_created(self)
+
+    def __str__(self):
+        msg = Exception.__str__(self)
+
+        if self.node is not None:
+            msg = '{}\nstart: {}\nend: {}'.format(msg, self.node.start_mark, self.node.end_mark)
+
+        return msg
+
+    def __reduce__(self):
+        # nodes are not necessarily pickleable, so the copy has no node, and no marks
+        return (type(self), self.args)
+
+
+class YamlizingErrorGroup(YamlizingError):
+    """
+    Raised when a load finds more than one problem, so that all of them can be reported at once.
+
+    Attributes
+    ----------
+    errors : list of Exception
+        the individual errors, in the order they were found.
+    """
+
+    def __init__(self, errors):
+        YamlizingError.__init__(self, 'Found {} errors'.format(len(errors)))
+        self.errors = list(errors)
+
+    def __str__(self):
+        return '{}:\n\n{}'.format(Exception.__str__(self),
+                                  '\n\n'.join(str(error) for error in self.errors))
+
+    def __reduce__(self):
+        return (type(self), (self.errors,))
+
+
+def raise_errors(errors):
+    """
+    Raise the only error in ``errors``, or a ``YamlizingErrorGroup`` when there are several.
+    """
+    if len(errors) == 1:
+        raise errors[0]
+    elif errors:
+        raise YamlizingErrorGroup(errors)